@@ -1,18 +1,64 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import AccessMixin
+from django.core.cache import cache
+from django.db import transaction
 from django.shortcuts import redirect
 
+from apps.common.caching import shared_timeout
+
 ROLE_ADMIN = "Administrador"
 ROLE_MANAGER = "Encargada"
 ROLE_SELLER = "Vendedora"
 
+ROLE_CACHE_TIMEOUT = 300
+ROLE_CACHE_VERSION_KEY = "accounts:roles:version"
+
+
+def _role_cache_key(user_id):
+    version = cache.get_or_set(ROLE_CACHE_VERSION_KEY, 1, None)
+    return f"accounts:roles:{version}:{user_id}"
+
+
+def user_role_names(user):
+    """
+    Group names of the user, memoized on the user instance for the current
+    request and shared across requests through the cache.
+    """
+    roles = getattr(user, "_role_names", None)
+    if roles is not None:
+        return roles
+
+    key = _role_cache_key(user.pk)
+    roles = cache.get(key)
+    if roles is None:
+        roles = frozenset(user.groups.values_list("name", flat=True))
+        cache.set(key, roles, shared_timeout(ROLE_CACHE_TIMEOUT))
+    user._role_names = roles
+    return roles
+
+
+def invalidate_user_roles(*user_ids):
+    # After commit, so no request can cache the pre-commit groups again.
+    transaction.on_commit(lambda: cache.delete_many([_role_cache_key(user_id) for user_id in user_ids]))
+
+
+def _bump_role_version():
+    try:
+        cache.incr(ROLE_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(ROLE_CACHE_VERSION_KEY, 1, None)
+
+
+def invalidate_all_roles():
+    transaction.on_commit(_bump_role_version)
+
 
 def user_has_any_role(user, roles):
     if not user or not user.is_authenticated:
         return False
     if user.is_superuser:
         return True
-    return user.groups.filter(name__in=roles).exists()
+    return not user_role_names(user).isdisjoint(roles)
 
 
 class RoleRequiredMixin(AccessMixin):
@@ -1,9 +1,15 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save, pre_save
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from apps.common.tracking import changed_fields, snapshot_fields
+
 from .models import UserCredentialPolicy
+from .permissions import invalidate_all_roles, invalidate_user_roles
+
+USER_TRACKED_FIELDS = ("password",)
 
 
 @receiver(post_save, sender=get_user_model())
@@ -12,16 +18,44 @@ def ensure_user_credential_policy(sender, instance, created, **kwargs):
         UserCredentialPolicy.objects.get_or_create(user=instance)
 
 
+@receiver(post_init, sender=get_user_model())
+def snapshot_password(sender, instance, **kwargs):
+    snapshot_fields(instance, USER_TRACKED_FIELDS)
+
+
+@receiver(post_save, sender=get_user_model())
+def refresh_password_snapshot(sender, instance, update_fields, **kwargs):
+    snapshot_fields(instance, USER_TRACKED_FIELDS, update_fields)
+
+
 @receiver(pre_save, sender=get_user_model())
 def track_password_rotation(sender, instance, **kwargs):
-    if not instance.pk:
-        return
-
-    previous = sender.objects.filter(pk=instance.pk).only("password").first()
-    if not previous or previous.password == instance.password:
+    if "password" not in changed_fields(instance, USER_TRACKED_FIELDS):
         return
 
     policy, _ = UserCredentialPolicy.objects.get_or_create(user=instance)
     policy.password_changed_at = timezone.now()
     policy.require_password_change = False
     policy.save(update_fields=["password_changed_at", "require_password_change", "updated_at"])
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def reset_cached_roles(sender, instance, action, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    if isinstance(instance, Group):
+        if pk_set is None:
+            invalidate_all_roles()
+        else:
+            invalidate_user_roles(*pk_set)
+        return
+
+    instance.__dict__.pop("_role_names", None)
+    invalidate_user_roles(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def reset_roles_on_group_change(sender, **kwargs):
+    invalidate_all_roles()
@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.permissions import ROLE_MANAGER, ROLE_SELLER, user_has_any_role
+from apps.customers.models import Customer
+from apps.orders.models import Order
+from apps.payments.models import CashSession, Payment
+
+
+def role_queries(ctx):
+    return [query for query in ctx.captured_queries if '"auth_group"."name"' in query["sql"]]
+
+
+class RoleCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user(username="seller_roles", password="StrongPass123!")
+        self.seller.groups.add(Group.objects.get(name=ROLE_SELLER))
+
+    def test_payments_api_resolves_roles_once_per_cache_ttl(self):
+        session = CashSession.objects.create(user=self.seller, shift=CashSession.Shift.MORNING)
+        order = Order.objects.create(customer=Customer.objects.create(first_name="Rosa", phone="5520006000"))
+        payment = Payment.objects.create(order=order, cash_session=session, captured_by=self.seller, amount=Decimal("10.00"))
+        self.seller.user_permissions.add(*Permission.objects.filter(codename__in=["view_cashsession", "view_cashmovement"]))
+        self.client.force_login(self.seller)
+        urls = [
+            "/api/payments/",
+            f"/api/payments/{payment.pk}/",
+            "/api/payments/sessions/",
+            f"/api/payments/sessions/{session.pk}/",
+            "/api/payments/movements/",
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            for url in urls:
+                self.assertEqual(self.client.get(url).status_code, 200)
+        # Without the cache these five requests ran twelve role lookups.
+        self.assertEqual(len(role_queries(ctx)), 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            for url in urls:
+                self.client.get(url)
+        self.assertEqual(role_queries(ctx), [])
+
+    def test_membership_changes_invalidate_cached_roles(self):
+        manager_group = Group.objects.get(name=ROLE_MANAGER)
+        self.assertFalse(user_has_any_role(self.seller, [ROLE_MANAGER]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seller.groups.add(manager_group)
+        self.assertTrue(user_has_any_role(self.seller, [ROLE_MANAGER]))
+        self.assertTrue(user_has_any_role(User.objects.get(pk=self.seller.pk), [ROLE_MANAGER]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            manager_group.user_set.clear()
+        self.assertFalse(user_has_any_role(User.objects.get(pk=self.seller.pk), [ROLE_MANAGER]))
+
+        seller_group = Group.objects.get(name=ROLE_SELLER)
+        seller_group.name = "Vendedora temporal"
+        with self.captureOnCommitCallbacks(execute=True):
+            seller_group.save()
+        self.assertFalse(user_has_any_role(User.objects.get(pk=self.seller.pk), [ROLE_SELLER]))
+
+    def test_roles_are_invalidated_only_after_commit(self):
+        self.assertTrue(user_has_any_role(self.seller, [ROLE_SELLER]))
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Group.objects.get(name=ROLE_SELLER).user_set.clear()
+        # Invalidated on commit, so a concurrent request cannot re-cache the old groups.
+        self.assertTrue(user_has_any_role(User.objects.get(pk=self.seller.pk), [ROLE_SELLER]))
+
+        for callback in callbacks:
+            callback()
+        self.assertFalse(user_has_any_role(User.objects.get(pk=self.seller.pk), [ROLE_SELLER]))
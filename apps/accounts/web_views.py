@@ -2,14 +2,17 @@ from datetime import timedelta
 from decimal import Decimal
 
 from django.contrib.auth.views import LoginView, LogoutView
-from django.db.models import Count, Q, Sum
+from django.db.models import Q, Sum
 from django.shortcuts import redirect
 from django.utils import timezone
 from django.views.generic import TemplateView, View
 
 from apps.common.models import OperationalAlert
-from apps.orders.models import Order, OrderItem
+from apps.common.utils import local_date_range
+from apps.orders.models import Order
 from apps.payments.models import CashSession, Payment
+from apps.payments.selectors import open_cash_session
+from apps.reports.selectors import sales_by_method, sales_by_seller, sales_total, service_sales
 
 from .permissions import ROLE_ADMIN, ROLE_MANAGER, ROLE_SELLER, RoleRequiredMixin, user_has_any_role
 
@@ -50,42 +53,12 @@ class ManagerDashboardView(RoleRequiredMixin, TemplateView):
         date_from = self._parse_date(self.request.GET.get("date_from", ""), today)
         date_to = self._parse_date(self.request.GET.get("date_to", ""), today)
 
-        payments = Payment.objects.filter(
-            status=Payment.Status.APPLIED,
-            paid_at__date__gte=date_from,
-            paid_at__date__lte=date_to,
-        )
-
-        total_income = payments.aggregate(total=Sum("amount"))["total"] or 0
-        by_seller = (
-            payments.values(
-                "captured_by_id",
-                "captured_by__username",
-                "captured_by__first_name",
-                "captured_by__last_name",
-            )
-            .annotate(total=Sum("amount"), payments_count=Count("id"))
-            .order_by("-total")
-        )
-
-        payment_methods = (
-            payments.values("method")
-            .annotate(total=Sum("amount"), count=Count("id"))
-            .order_by("-total")
-        )
-
-        items = (
-            OrderItem.objects.select_related("service", "order")
-            .exclude(order__status=Order.Status.CANCELLED)
-            .filter(order__received_at__date__gte=date_from, order__received_at__date__lte=date_to)
-        )
-        top_services = (
-            items.values("service__name", "service__category")
-            .annotate(total=Sum("total"), qty=Sum("quantity"))
-            .order_by("-total")[:10]
-        )
+        total_income = sales_total(date_from, date_to)
+        by_seller = sales_by_seller(date_from, date_to)
+        payment_methods = sales_by_method(date_from, date_to)
+        top_services = service_sales(date_from, date_to)[:10]
 
-        orders_total = Order.objects.filter(received_at__date__gte=date_from, received_at__date__lte=date_to).count()
+        orders_total = Order.objects.filter(**local_date_range("received_at", date_from, date_to)).count()
         orders_pending = (
             Order.objects.exclude(status__in=[Order.Status.CANCELLED, Order.Status.DELIVERED]).filter(balance__gt=0).count()
         )
@@ -259,15 +232,15 @@ class POSDashboardView(RoleRequiredMixin, TemplateView):
         my_payments_today = Payment.objects.filter(
             captured_by=user,
             status=Payment.Status.APPLIED,
-            paid_at__date=today,
+            **local_date_range("paid_at", today),
         )
         my_total_today = my_payments_today.aggregate(total=Sum("amount"))["total"] or 0
         my_count_today = my_payments_today.count()
-        open_session = CashSession.objects.filter(user=user, closed_at__isnull=True).order_by("-opened_at").first()
+        open_session = open_cash_session(user)
 
         recent_orders = (
             Order.objects.select_related("customer")
-            .filter(Q(payments__captured_by=user) | Q(created_at__date=today))
+            .filter(Q(payments__captured_by=user) | Q(**local_date_range("created_at", today)))
             .distinct()
             .order_by("-updated_at")[:15]
         )
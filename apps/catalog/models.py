@@ -6,9 +6,10 @@ from django.db import models
 from django.utils import timezone
 
 from apps.common.models import TimeStampedModel
+from apps.common.tracking import TrackedFieldsMixin
 
 
-class Service(TimeStampedModel):
+class Service(TrackedFieldsMixin, TimeStampedModel):
     class Category(models.TextChoices):
         LAUNDRY = "laundry", "Lavanderia"
         WASH = "wash", "Lavado"
@@ -40,6 +41,8 @@ class Service(TimeStampedModel):
     )
     is_active = models.BooleanField(default=True)
 
+    tracked_fields = ("unit_price",)
+
     class Meta:
         ordering = ["name"]
 
@@ -47,21 +50,9 @@ class Service(TimeStampedModel):
         return f"{self.name} ({self.code})"
 
     def effective_unit_price(self):
-        active_promotions = self.promotions.filter(
-            is_active=True,
-            starts_at__lte=timezone.now(),
-            ends_at__gte=timezone.now(),
-        )
-        best_price = Decimal(self.unit_price)
-        best_promo = None
-
-        for promo in active_promotions:
-            candidate = promo.discounted_price(best_price)
-            if candidate < best_price:
-                best_price = candidate
-                best_promo = promo
-
-        return best_price.quantize(Decimal("0.01")), best_promo
+        from .pricing import effective_price
+
+        return effective_price(self)
 
 
 class ServicePriceHistory(models.Model):
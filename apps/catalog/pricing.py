@@ -0,0 +1,85 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.caching import shared_timeout
+
+from .models import ServicePromotion
+
+PRICE_INDEX_CACHE_KEY = "catalog:price-index"
+PRICE_INDEX_MAX_AGE = timedelta(hours=1)
+CENT = Decimal("0.01")
+
+
+def apply_promotions(base_price, promotions):
+    """
+    Same stacking rule as ``Service.effective_unit_price``: promotions are
+    applied in order to the running best price and kept only if they lower it.
+    """
+    best_price = Decimal(base_price)
+    best_promo = None
+    for promo in promotions:
+        candidate = promo.discounted_price(best_price)
+        if candidate < best_price:
+            best_price = candidate
+            best_promo = promo
+    return best_price.quantize(CENT), best_promo
+
+
+class PriceIndex:
+    """
+    Current promotions grouped per service, valid until the next promotion
+    starts or ends. Prices are resolved against the caller's ``unit_price`` so
+    a stale service instance never mixes with a fresh base price.
+    """
+
+    def __init__(self, promotions_by_service, valid_until):
+        self.promotions_by_service = promotions_by_service
+        self.valid_until = valid_until
+
+    @classmethod
+    def build(cls, now=None):
+        now = now or timezone.now()
+        valid_until = now + PRICE_INDEX_MAX_AGE
+        promotions_by_service = {}
+
+        upcoming = ServicePromotion.objects.filter(is_active=True, ends_at__gte=now).order_by(
+            "service_id", "-starts_at", "-created_at"
+        )
+        for promo in upcoming:
+            if promo.starts_at > now:
+                valid_until = min(valid_until, promo.starts_at)
+                continue
+            valid_until = min(valid_until, promo.ends_at + timedelta(microseconds=1))
+            promotions_by_service.setdefault(promo.service_id, []).append(promo)
+
+        return cls(promotions_by_service, valid_until)
+
+    def is_valid(self, now=None):
+        return (now or timezone.now()) < self.valid_until
+
+    def price_for(self, service):
+        return apply_promotions(service.unit_price, self.promotions_by_service.get(service.pk, ()))
+
+
+def get_price_index():
+    index = cache.get(PRICE_INDEX_CACHE_KEY)
+    now = timezone.now()
+    if index is None or not index.is_valid(now):
+        index = PriceIndex.build(now)
+        timeout = max(int((index.valid_until - now).total_seconds()), 1)
+        cache.set(PRICE_INDEX_CACHE_KEY, index, shared_timeout(timeout))
+    return index
+
+
+def effective_price(service):
+    return get_price_index().price_for(service)
+
+
+def invalidate_price_index():
+    cache.delete(PRICE_INDEX_CACHE_KEY)
+    # Other processes may rebuild from pre-commit data in the meantime.
+    transaction.on_commit(lambda: cache.delete(PRICE_INDEX_CACHE_KEY))
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .models import Service, ServicePriceHistory, ServicePromotion
+from .pricing import get_price_index
 
 
 class ServiceSerializer(serializers.ModelSerializer):
@@ -27,12 +28,17 @@ class ServiceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
 
+    def _price(self, obj):
+        if "price_index" not in self.context:
+            self.context["price_index"] = get_price_index()
+        return self.context["price_index"].price_for(obj)
+
     def get_effective_unit_price(self, obj):
-        effective, _ = obj.effective_unit_price()
+        effective, _ = self._price(obj)
         return str(effective)
 
     def get_active_promotion(self, obj):
-        _, promo = obj.effective_unit_price()
+        _, promo = self._price(obj)
         if promo is None:
             return None
         return {
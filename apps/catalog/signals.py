@@ -1,18 +1,16 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from apps.common.context import get_current_request
 
-from .models import Service, ServicePriceHistory
+from .models import Service, ServicePriceHistory, ServicePromotion
+from .pricing import invalidate_price_index
 
 
 @receiver(pre_save, sender=Service)
 def create_price_history(sender, instance: Service, **kwargs):
-    if not instance.pk:
-        return
-
-    previous = sender.objects.filter(pk=instance.pk).only("unit_price").first()
-    if not previous or previous.unit_price == instance.unit_price:
+    change = instance.changed_fields().get("unit_price")
+    if change is None:
         return
 
     request = get_current_request()
@@ -22,7 +20,14 @@ def create_price_history(sender, instance: Service, **kwargs):
 
     ServicePriceHistory.objects.create(
         service=instance,
-        previous_price=previous.unit_price,
+        previous_price=change[0],
         new_price=instance.unit_price,
         changed_by=actor,
     )
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=ServicePromotion)
+@receiver(post_delete, sender=ServicePromotion)
+def reset_price_index(sender, **kwargs):
+    invalidate_price_index()
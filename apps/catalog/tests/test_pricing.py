@@ -0,0 +1,102 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.catalog.models import Service, ServicePromotion
+from apps.catalog.pricing import PriceIndex, get_price_index
+
+
+class PriceIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+        self.service = Service.objects.create(
+            code="PRC-01",
+            name="Lavado promo",
+            category=Service.Category.WASH,
+            pricing_mode=Service.PricingMode.KILO,
+            unit_price=Decimal("100.00"),
+            default_iva_rate=Decimal("16.00"),
+        )
+
+    def _promo(self, service=None, **kwargs):
+        values = {
+            "service": service or self.service,
+            "name": "Promo",
+            "discount_type": ServicePromotion.DiscountType.PERCENT,
+            "discount_value": Decimal("10.00"),
+            "starts_at": self.now - timedelta(hours=1),
+            "ends_at": self.now + timedelta(hours=5),
+        }
+        values.update(kwargs)
+        return ServicePromotion.objects.create(**values)
+
+    def test_stacking_matches_promotion_order(self):
+        self._promo(name="Fijo", discount_type=ServicePromotion.DiscountType.FIXED, discount_value=Decimal("5.00"))
+        self._promo(name="Porcentaje", starts_at=self.now - timedelta(minutes=30))
+
+        price, promo = self.service.effective_unit_price()
+
+        # The most recent promotion is applied first, then the fixed discount.
+        self.assertEqual(price, Decimal("85.00"))
+        self.assertEqual(promo.name, "Fijo")
+
+    def test_index_is_valid_until_next_boundary(self):
+        upcoming = self._promo(starts_at=self.now + timedelta(minutes=30), ends_at=self.now + timedelta(hours=3))
+        self._promo(ends_at=self.now + timedelta(hours=4))
+
+        index = PriceIndex.build(self.now)
+
+        self.assertEqual(index.valid_until, upcoming.starts_at)
+        self.assertEqual(index.price_for(self.service)[0], Decimal("90.00"))
+        self.assertFalse(index.is_valid(upcoming.starts_at))
+
+    def test_promotion_and_service_saves_invalidate_index(self):
+        self.assertEqual(self.service.effective_unit_price()[0], Decimal("100.00"))
+
+        promo = self._promo()
+        self.assertEqual(self.service.effective_unit_price()[0], Decimal("90.00"))
+
+        promo.is_active = False
+        promo.save()
+        self.assertEqual(self.service.effective_unit_price()[0], Decimal("100.00"))
+
+        cached = get_price_index()
+        self.service.save()
+        self.assertIsNot(get_price_index(), cached)
+
+    def test_catalog_list_prices_all_services_with_one_promotions_query(self):
+        for index in range(8):
+            service = Service.objects.create(
+                code=f"PRC-L{index}",
+                name=f"Servicio lista {index}",
+                pricing_mode=Service.PricingMode.PIEZA,
+                unit_price=Decimal("20.00"),
+            )
+            self._promo(service=service)
+
+        user = User.objects.create_user(username="seller_pricing", password="StrongPass123!")
+        user.groups.add(Group.objects.get(name="Vendedora"))
+        self.client.force_login(user)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/catalog/services/")
+
+        self.assertEqual(response.status_code, 200)
+        promotion_queries = [query for query in ctx.captured_queries if "catalog_servicepromotion" in query["sql"]]
+        self.assertEqual(len(promotion_queries), 1)
+        prices = {row["code"]: row["effective_unit_price"] for row in response.json()}
+        self.assertEqual(prices["PRC-L0"], "18.00")
+        self.assertEqual(prices["PRC-01"], "100.00")
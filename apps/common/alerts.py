@@ -1,49 +1,209 @@
 from __future__ import annotations
 
+import atexit
 import hashlib
 import logging
+import time
+from collections import OrderedDict
+from threading import Lock
 
+from django.conf import settings
+from django.db.models import F
 from django.utils import timezone
 
 from .models import OperationalAlert
 
 logger = logging.getLogger("security")
+# Fingerprints include request paths, so the known-alert map is an LRU.
+ALERT_MEMORY_SIZE = 1024
 
 
 def _fingerprint(event_type: str, source: str, message: str) -> str:
     return hashlib.sha256(f"{event_type}|{source}|{message}".encode("utf-8")).hexdigest()
 
 
+class _PendingAlert:
+    __slots__ = ("event_type", "source", "severity", "message", "metadata", "count", "last_seen_at")
+
+    def __init__(self, event_type, source, severity, message):
+        self.event_type = event_type
+        self.source = source
+        self.severity = severity
+        self.message = message
+        self.metadata = {}
+        self.count = 0
+        self.last_seen_at = None
+
+    def merge(self, other):
+        self.metadata = {**other.metadata, **self.metadata}
+        self.count += other.count
+        self.last_seen_at = max(self.last_seen_at, other.last_seen_at)
+
+
+class AlertAggregator:
+    """
+    Coalesces repeated occurrences of the same alert in process memory. The
+    first occurrence of a fingerprint is written right away; later ones only
+    bump an in-memory counter that is flushed with a single
+    ``F("occurrence_count") + n`` UPDATE once ``ALERT_FLUSH_COUNT`` occurrences
+    pile up or ``ALERT_FLUSH_SECONDS`` have passed since the last flush (the
+    monitoring middleware checks that on every request).
+
+    Known fingerprints are kept in an LRU of ``max_alerts``; an evicted one is
+    looked up again by fingerprint. A fingerprint whose write failed is kept
+    as known too, so during an outage its occurrences wait for the next flush
+    instead of retrying the database each time.
+    """
+
+    def __init__(self, max_alerts=ALERT_MEMORY_SIZE):
+        self.max_alerts = max_alerts
+        self._lock = Lock()
+        self._pending = {}
+        self._alerts = OrderedDict()
+        self._last_flush = time.monotonic()
+
+    def record(self, *, event_type, source, severity, message, metadata=None, now=None):
+        fingerprint = _fingerprint(event_type, source, message)
+        with self._lock:
+            entry = self._pending.get(fingerprint)
+            if entry is None:
+                entry = self._pending[fingerprint] = _PendingAlert(event_type, source, severity, message)
+            entry.count += 1
+            entry.last_seen_at = now or timezone.now()
+            if metadata:
+                entry.metadata.update(metadata)
+
+            if fingerprint in self._alerts:
+                self._alerts.move_to_end(fingerprint)
+            if fingerprint not in self._alerts or entry.count >= _flush_count():
+                del self._pending[fingerprint]
+                batch = {fingerprint: entry}
+            elif self._flush_is_due() or len(self._pending) > self.max_alerts:
+                batch = self._take_all()
+            else:
+                return None
+        return self._write(batch).get(fingerprint)
+
+    def flush(self, *, force=True):
+        with self._lock:
+            if not self._pending or not (force or self._flush_is_due()):
+                return {}
+            batch = self._take_all()
+        return self._write(batch)
+
+    def _flush_is_due(self):
+        return time.monotonic() - self._last_flush >= _flush_seconds()
+
+    def _take_all(self):
+        batch, self._pending = self._pending, {}
+        self._last_flush = time.monotonic()
+        return batch
+
+    def _write(self, batch):
+        written = {}
+        for fingerprint, entry in list(batch.items()):
+            try:
+                written[fingerprint] = self._write_entry(fingerprint, entry)
+            except Exception:
+                # Keep the counts for the next flush instead of retrying now.
+                with self._lock:
+                    for pending_fingerprint, pending in batch.items():
+                        if pending_fingerprint in written:
+                            continue
+                        if pending_fingerprint not in self._alerts:
+                            self._remember(pending_fingerprint, None)
+                        current = self._pending.get(pending_fingerprint)
+                        if current is None:
+                            self._pending[pending_fingerprint] = pending
+                        else:
+                            current.merge(pending)
+                    self._last_flush = time.monotonic()
+                raise
+        return written
+
+    def _write_entry(self, fingerprint, entry):
+        known = self._alerts.get(fingerprint)
+        if known is not None:
+            alert_id, metadata = known
+            metadata = {**metadata, **entry.metadata}
+            updated = OperationalAlert.objects.filter(pk=alert_id, resolved_at__isnull=True).update(
+                occurrence_count=F("occurrence_count") + entry.count,
+                last_seen_at=entry.last_seen_at,
+                metadata=metadata,
+            )
+            if updated:
+                with self._lock:
+                    self._remember(fingerprint, (alert_id, metadata))
+                return alert_id
+
+        alert = (
+            OperationalAlert.objects.filter(fingerprint=fingerprint, resolved_at__isnull=True)
+            .order_by("-last_seen_at")
+            .first()
+        )
+        if alert:
+            alert.metadata = {**alert.metadata, **entry.metadata}
+            OperationalAlert.objects.filter(pk=alert.pk).update(
+                occurrence_count=F("occurrence_count") + entry.count,
+                last_seen_at=entry.last_seen_at,
+                metadata=alert.metadata,
+            )
+        else:
+            alert = OperationalAlert.objects.create(
+                event_type=entry.event_type,
+                source=entry.source,
+                severity=entry.severity,
+                message=entry.message,
+                metadata=entry.metadata,
+                fingerprint=fingerprint,
+                occurrence_count=entry.count,
+                first_seen_at=entry.last_seen_at,
+                last_seen_at=entry.last_seen_at,
+            )
+        with self._lock:
+            self._remember(fingerprint, (alert.pk, alert.metadata))
+        return alert.pk
+
+    def _remember(self, fingerprint, known):
+        """Stores ``(alert_id, metadata)``, or ``None`` after a failed write; caller holds the lock."""
+        self._alerts[fingerprint] = known
+        self._alerts.move_to_end(fingerprint)
+        while len(self._alerts) > self.max_alerts:
+            self._alerts.popitem(last=False)
+
+
+def _flush_count():
+    return int(getattr(settings, "ALERT_FLUSH_COUNT", 500))
+
+
+def _flush_seconds():
+    return float(getattr(settings, "ALERT_FLUSH_SECONDS", 10))
+
+
+_aggregator = AlertAggregator()
+
+
 def raise_operational_alert(*, event_type: str, source: str, severity: str, message: str, metadata: dict | None = None):
-    fingerprint = _fingerprint(event_type, source, message)
-    now = timezone.now()
+    """
+    Records one occurrence. Returns the id of the alert row when the
+    occurrence was written, or None while it is being coalesced in memory.
+    """
+    return _aggregator.record(event_type=event_type, source=source, severity=severity, message=message, metadata=metadata)
 
-    alert = (
-        OperationalAlert.objects.filter(fingerprint=fingerprint, resolved_at__isnull=True)
-        .order_by("-last_seen_at")
-        .first()
-    )
 
-    if alert:
-        alert.last_seen_at = now
-        alert.occurrence_count += 1
-        if metadata:
-            merged = alert.metadata.copy()
-            merged.update(metadata)
-            alert.metadata = merged
-        alert.save(update_fields=["last_seen_at", "occurrence_count", "metadata"])
-        return alert
-
-    return OperationalAlert.objects.create(
-        event_type=event_type,
-        source=source,
-        severity=severity,
-        message=message,
-        metadata=metadata or {},
-        fingerprint=fingerprint,
-        first_seen_at=now,
-        last_seen_at=now,
-    )
+def flush_operational_alerts(*, force=True):
+    """Writes the coalesced counters; with ``force=False`` only once they are due."""
+    return _aggregator.flush(force=force)
+
+
+def _flush_at_exit():
+    try:
+        flush_operational_alerts()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
 
 
 def emit_db_down_alert(exc: Exception):
@@ -6,4 +6,4 @@ class CommonConfig(AppConfig):
     name = "apps.common"
 
     def ready(self):
-        from . import signals  # noqa: F401
+        from . import checks, signals  # noqa: F401
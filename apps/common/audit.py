@@ -35,6 +35,20 @@ def _normalize_json(value: Any):
 
 
 def log_audit_event(action: str, obj, *, changes: dict[str, tuple[Any, Any]] | None = None, metadata: dict | None = None):
+    data = _normalize_json(metadata.copy()) if metadata else {}
+    if changes:
+        data["changes"] = _serialize_changes(changes)
+    _record(action, type(obj), str(obj.pk), data)
+
+
+def log_bulk_audit_event(action: str, model, pks, *, metadata: dict | None = None):
+    """One entry for a set-based change; the affected ids go in ``metadata["ids"]``."""
+    data = _normalize_json(metadata.copy()) if metadata else {}
+    data["ids"] = sorted(pks)
+    _record(action, model, "bulk", data)
+
+
+def _record(action: str, model, target_pk: str, data: dict):
     request = get_current_request()
     user = None
     ip_address = ""
@@ -43,15 +57,13 @@ def log_audit_event(action: str, obj, *, changes: dict[str, tuple[Any, Any]] | N
         xff = request.META.get("HTTP_X_FORWARDED_FOR")
         ip_address = xff.split(",")[0].strip() if xff else request.META.get("REMOTE_ADDR", "")
 
-    data = _normalize_json(metadata.copy()) if metadata else {}
-    if changes:
-        data["changes"] = _serialize_changes(changes)
-
+    # Inserted in the caller's transaction: the row commits or rolls back with
+    # the change it describes, and a failed insert fails the change.
     AuditLog.objects.create(
         actor=user,
         action=action,
-        target_model=f"{obj._meta.app_label}.{obj.__class__.__name__}",
-        target_pk=str(obj.pk),
+        target_model=f"{model._meta.app_label}.{model.__name__}",
+        target_pk=target_pk,
         ip_address=ip_address,
         metadata=data,
     )
@@ -0,0 +1,18 @@
+from django.conf import settings
+
+LOCMEM_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+
+def uses_local_cache(alias="default"):
+    """True when ``alias`` is the per-process LocMemCache, not shared between workers."""
+    return settings.CACHES[alias]["BACKEND"] == LOCMEM_BACKEND
+
+
+def shared_timeout(seconds):
+    """
+    ``seconds`` on a shared cache. On LocMemCache an invalidation only reaches
+    the worker that made it, so entries are capped at ``LOCAL_CACHE_MAX_SECONDS``.
+    """
+    if uses_local_cache():
+        return min(seconds, settings.LOCAL_CACHE_MAX_SECONDS)
+    return seconds
@@ -0,0 +1,17 @@
+from django.core.checks import Tags, Warning, register
+
+from .caching import uses_local_cache
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if not uses_local_cache():
+        return []
+    return [
+        Warning(
+            "El cache por defecto es LocMemCache: cada worker de Gunicorn tiene su propia copia y "
+            "las invalidaciones (precios, roles, cierre diario) no llegan a los demas workers.",
+            hint="Define CACHE_BACKEND y CACHE_LOCATION con un cache compartido (Redis).",
+            id="common.W001",
+        )
+    ]
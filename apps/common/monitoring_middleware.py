@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from .alerts import raise_operational_alert
+from django.db import transaction
+
+from .alerts import flush_operational_alerts, raise_operational_alert
 from .models import OperationalAlert
 
 
 class ServerErrorAlertMiddleware:
     """
-    Emits an operational alert for API/web responses returning HTTP 500.
+    Emits an operational alert for API/web responses returning HTTP 500, and
+    writes coalesced alert counters once they are due.
     """
 
     def __init__(self, get_response):
@@ -28,4 +31,14 @@ class ServerErrorAlertMiddleware:
                 # Never fail request handling due to alert persistence errors.
                 pass
 
+        # Runs at once in autocommit; inside a transaction only after it commits,
+        # so counter writes never join (or roll back with) the request's work.
+        transaction.on_commit(_flush_due_alerts)
         return response
+
+
+def _flush_due_alerts():
+    try:
+        flush_operational_alerts(force=False)
+    except Exception:
+        pass
@@ -0,0 +1,86 @@
+import re
+import unicodedata
+
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+_NON_WORD = re.compile(r"[^\w-]+")
+_NON_DIGIT = re.compile(r"\D+")
+PHONE_QUERY_MIN_DIGITS = 7
+
+
+def normalize_text(value):
+    """Lowercase, accent-folded text with collapsed whitespace."""
+    folded = unicodedata.normalize("NFKD", str(value or ""))
+    folded = "".join(char for char in folded if not unicodedata.combining(char)).lower()
+    return " ".join(_NON_WORD.sub(" ", folded).split())
+
+
+def phone_digits(value):
+    return _NON_DIGIT.sub("", str(value or ""))
+
+
+def build_document(*parts):
+    return " ".join(part for part in parts if part)
+
+
+def search_terms(query):
+    """
+    Tokens every document must contain. A query that is essentially a phone
+    number (digits plus separators) becomes a single digits token.
+    """
+    digits = phone_digits(query)
+    if len(digits) >= PHONE_QUERY_MIN_DIGITS and not re.search(r"[^\d\s()+.-]", query):
+        return [digits]
+    return normalize_text(query).split()
+
+
+def document_filter(query, field="search_document"):
+    terms = search_terms(query)
+    condition = Q()
+    for term in terms:
+        condition &= Q(**{f"{field}__contains": term})
+    return condition, terms
+
+
+class DocumentSearchFilter(BaseFilterBackend):
+    """
+    Replacement for DRF's ``SearchFilter`` on querysets exposing ``search()``.
+    List it after ``OrderingFilter``: without an explicit ``ordering`` param
+    results are sorted by relevance first.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        queryset = queryset.search(query)
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        return queryset.order_by("search_rank", *queryset.query.order_by)
+
+
+def trigram_index(name, field="search_document"):
+    """
+    pg_trgm GIN index so ``LIKE '%term%'`` over the search document is
+    index-backed. Created by ``AddPostgresIndex``: other databases keep
+    scanning the single normalized column.
+    """
+    return GinIndex(fields=[field], name=name, opclasses=["gin_trgm_ops"])
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """``AddIndex`` whose index is only built on PostgreSQL; elsewhere only the migration state changes."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
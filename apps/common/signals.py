@@ -17,58 +17,34 @@ from .models import OperationalAlert
 
 @receiver(pre_save, sender=Service)
 def audit_service_price_change(sender, instance: Service, **kwargs):
-    if not instance.pk:
-        return
-    previous = sender.objects.filter(pk=instance.pk).only("unit_price").first()
-    if not previous:
-        return
-    if previous.unit_price != instance.unit_price:
+    changes = instance.changed_fields()
+    if "unit_price" in changes:
         log_audit_event(
             "service.price_changed",
             instance,
-            changes={"unit_price": (previous.unit_price, instance.unit_price)},
+            changes={"unit_price": changes["unit_price"]},
             metadata={"service_code": instance.code, "service_name": instance.name},
         )
 
 
 @receiver(pre_save, sender=Order)
 def audit_order_cancellation(sender, instance: Order, **kwargs):
-    if not instance.pk:
-        return
-    previous = sender.objects.filter(pk=instance.pk).only("status").first()
-    if not previous:
-        return
-    if previous.status != Order.Status.CANCELLED and instance.status == Order.Status.CANCELLED:
+    status = instance.changed_fields().get("status")
+    if status and instance.status == Order.Status.CANCELLED:
         log_audit_event(
             "order.cancelled",
             instance,
-            changes={"status": (previous.status, instance.status)},
+            changes={"status": status},
             metadata={"folio": instance.folio},
         )
 
 
-@receiver(pre_save, sender=Payment)
-def audit_payment_updates(sender, instance: Payment, **kwargs):
-    if not instance.pk:
-        return
-
-    previous = (
-        sender.objects.filter(pk=instance.pk)
-        .only("amount", "method", "status", "reference", "cash_session_id")
-        .first()
-    )
-    if not previous:
-        return
+PAYMENT_AUDITED_FIELDS = ("amount", "method", "status", "reference", "cash_session_id")
 
-    tracked_fields = {
-        "amount": (previous.amount, instance.amount),
-        "method": (previous.method, instance.method),
-        "status": (previous.status, instance.status),
-        "reference": (previous.reference, instance.reference),
-        "cash_session_id": (previous.cash_session_id, instance.cash_session_id),
-    }
-    changes = {field: values for field, values in tracked_fields.items() if values[0] != values[1]}
 
+@receiver(pre_save, sender=Payment)
+def audit_payment_updates(sender, instance: Payment, **kwargs):
+    changes = {name: values for name, values in instance.changed_fields().items() if name in PAYMENT_AUDITED_FIELDS}
     if not changes:
         return
 
@@ -89,13 +65,10 @@ def audit_payment_updates(sender, instance: Payment, **kwargs):
 
 @receiver(pre_save, sender=CashSession)
 def audit_cash_session_close(sender, instance: CashSession, **kwargs):
-    if not instance.pk:
-        return
-    previous = sender.objects.filter(pk=instance.pk).only("closed_at", "closing_amount").first()
-    if not previous:
-        return
+    changes = instance.changed_fields()
+    previous_closed_at = changes.get("closed_at", (instance.closed_at,))[0]
 
-    if previous.closed_at is None and instance.closed_at is not None:
+    if previous_closed_at is None and instance.closed_at is not None:
         diff = None
         expected_cash = None
         try:
@@ -109,8 +82,8 @@ def audit_cash_session_close(sender, instance: CashSession, **kwargs):
             "cash_session.closed",
             instance,
             changes={
-                "closed_at": (previous.closed_at, instance.closed_at),
-                "closing_amount": (previous.closing_amount, instance.closing_amount),
+                "closed_at": (previous_closed_at, instance.closed_at),
+                "closing_amount": changes.get("closing_amount", (instance.closing_amount, instance.closing_amount)),
             },
             metadata={"expected_cash": expected_cash, "difference": diff, "session_user_id": instance.user_id},
         )
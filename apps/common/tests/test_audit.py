@@ -1,10 +1,14 @@
+from datetime import timedelta
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import DatabaseError, transaction
+from django.test import RequestFactory, TestCase
 from django.utils import timezone
 
 from apps.catalog.models import Service
+from apps.common.context import clear_current_request, set_current_request
 from apps.common.models import AuditLog
 from apps.customers.models import Customer
 from apps.orders.models import Order, OrderItem
@@ -65,6 +69,21 @@ class AuditSignalsTests(TestCase):
         self.assertTrue(AuditLog.objects.filter(action="payment.edited", target_pk=str(payment.pk)).exists())
         self.assertTrue(AuditLog.objects.filter(action="payment.voided", target_pk=str(payment.pk)).exists())
 
+    def test_payment_edit_audits_only_money_fields(self):
+        order = self._build_order()
+        payment = Payment.objects.create(order=order, amount=Decimal("20.00"), method=Payment.Method.CASH)
+
+        payment.paid_at = timezone.now() - timedelta(hours=1)
+        payment.captured_by = self.user
+        payment.save()
+        self.assertFalse(AuditLog.objects.filter(action="payment.edited", target_pk=str(payment.pk)).exists())
+
+        payment.amount = Decimal("22.00")
+        payment.paid_at = timezone.now()
+        payment.save()
+        log = AuditLog.objects.get(action="payment.edited", target_pk=str(payment.pk))
+        self.assertEqual(set(log.metadata["changes"]), {"amount"})
+
     def test_logs_cash_session_close(self):
         session = CashSession.objects.create(
             user=self.user,
@@ -77,3 +96,55 @@ class AuditSignalsTests(TestCase):
         session.save(update_fields=["closing_amount", "closed_at", "updated_at"])
 
         self.assertTrue(AuditLog.objects.filter(action="cash_session.closed", target_pk=str(session.pk)).exists())
+
+
+class AuditTransactionTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="audited", password="StrongPass123!")
+        self.service = Service.objects.create(
+            code="AUD-TRX",
+            name="Planchado",
+            category=Service.Category.IRONING,
+            pricing_mode=Service.PricingMode.PIEZA,
+            unit_price=Decimal("12.00"),
+        )
+        request = RequestFactory().post("/api/payments/")
+        request.user = self.user
+        set_current_request(request)
+        self.addCleanup(clear_current_request)
+
+    def test_events_are_written_in_the_change_transaction(self):
+        order = Order.objects.create(customer=Customer.objects.create(first_name="Ana", phone="5511113333"))
+        payment = Payment.objects.create(order=order, amount=Decimal("10.00"))
+        payment.amount = Decimal("12.00")
+        payment.save()
+        self.service.unit_price = Decimal("14.00")
+        self.service.save()
+
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list("action", flat=True)),
+            ["payment.created", "payment.edited", "service.price_changed"],
+        )
+        self.assertEqual(set(AuditLog.objects.values_list("actor", flat=True)), {self.user.pk})
+
+    def test_rolled_back_savepoint_discards_only_its_events(self):
+        self.service.unit_price = Decimal("15.00")
+        self.service.save()
+        try:
+            with transaction.atomic():
+                self.service.unit_price = Decimal("99.00")
+                self.service.save()
+                raise ValueError
+        except ValueError:
+            pass
+
+        log = AuditLog.objects.get(action="service.price_changed")
+        self.assertEqual(log.metadata["changes"]["unit_price"]["after"], "15.00")
+
+    def test_failed_audit_insert_rolls_back_the_change(self):
+        self.service.unit_price = Decimal("16.00")
+        with patch.object(AuditLog.objects, "create", side_effect=DatabaseError("audit")):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                self.service.save()
+
+        self.assertEqual(Service.objects.get(pk=self.service.pk).unit_price, Decimal("12.00"))
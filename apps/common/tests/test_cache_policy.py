@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase, override_settings
+
+from apps.common.caching import shared_timeout
+from apps.common.checks import check_shared_cache
+
+REDIS_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://127.0.0.1:6379/1",
+    }
+}
+
+
+class SharedCachePolicyTests(SimpleTestCase):
+    @override_settings(LOCAL_CACHE_MAX_SECONDS=30)
+    def test_local_cache_warns_and_caps_timeouts(self):
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ["common.W001"])
+        self.assertEqual(shared_timeout(3600), 30)
+        self.assertEqual(shared_timeout(10), 10)
+
+    @override_settings(CACHES=REDIS_CACHES, LOCAL_CACHE_MAX_SECONDS=30)
+    def test_shared_cache_keeps_full_timeouts(self):
+        self.assertEqual(check_shared_cache(None), [])
+        self.assertEqual(shared_timeout(3600), 3600)
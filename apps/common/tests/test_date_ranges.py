@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.common.utils import local_date_range
+from apps.customers.models import Customer
+from apps.inventory.models import InventoryMovement
+from apps.orders.models import Order
+from apps.payments.models import CashMovement, CashSession, Payment
+
+
+def index_name(model, fields):
+    return next(index.name for index in model._meta.indexes if index.fields == fields)
+
+
+class LocalDateRangeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="ranges", password="StrongPass123!")
+        customer = Customer.objects.create(first_name="Rango", phone="5520007000")
+        cls.day = date(2026, 3, 10)
+        tz = timezone.get_current_timezone()
+        for offset in range(-30, 30):
+            moment = timezone.make_aware(datetime(2026, 3, 10, 12), tz) + timedelta(hours=offset * 7)
+            order = Order.objects.create(customer=customer, received_at=moment)
+            Payment.objects.create(order=order, captured_by=cls.user, amount=Decimal("10.00"), paid_at=moment)
+
+    def test_range_is_half_open_in_local_time(self):
+        tz = timezone.get_current_timezone()
+        last_moment = timezone.make_aware(datetime(2026, 3, 10, 23, 59, 59), tz)
+        next_day = timezone.make_aware(datetime(2026, 3, 11), tz)
+        order = Order.objects.first()
+        Payment.objects.create(order=order, amount=Decimal("1.00"), paid_at=last_moment)
+        Payment.objects.create(order=order, amount=Decimal("2.00"), paid_at=next_day)
+
+        in_range = Payment.objects.filter(**local_date_range("paid_at", self.day))
+
+        self.assertEqual(in_range.count(), Payment.objects.filter(paid_at__date=self.day).count())
+        self.assertTrue(in_range.filter(amount=Decimal("1.00")).exists())
+        self.assertFalse(in_range.filter(amount=Decimal("2.00")).exists())
+
+    def test_report_filters_use_matching_indexes(self):
+        day_range = (self.day, self.day + timedelta(days=2))
+        cases = [
+            (
+                Payment.objects.filter(status=Payment.Status.APPLIED, **local_date_range("paid_at", *day_range)),
+                index_name(Payment, ["status", "paid_at"]),
+            ),
+            (
+                Payment.objects.filter(captured_by=self.user, status=Payment.Status.APPLIED, **local_date_range("paid_at", self.day)),
+                index_name(Payment, ["captured_by", "status", "paid_at"]),
+            ),
+            (Order.objects.filter(**local_date_range("received_at", *day_range)), index_name(Order, ["received_at"])),
+            (CashSession.objects.filter(**local_date_range("opened_at", self.day)), index_name(CashSession, ["opened_at"])),
+            (CashMovement.objects.filter(**local_date_range("occurred_at", self.day)), index_name(CashMovement, ["occurred_at"])),
+            (
+                InventoryMovement.objects.filter(
+                    movement_type=InventoryMovement.MovementType.CONSUMPTION, **local_date_range("occurred_at", *day_range)
+                ),
+                index_name(InventoryMovement, ["movement_type", "occurred_at"]),
+            ),
+        ]
+        for queryset, index in cases:
+            with self.subTest(index=index):
+                self.assertIn(index, queryset.order_by().explain())
+
+        # The __date cast hides the column from the index.
+        cast_plan = Order.objects.filter(received_at__date=self.day).order_by().explain()
+        self.assertNotIn(index_name(Order, ["received_at"]), cast_plan)
@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import UserCredentialPolicy
+from apps.catalog.models import Service, ServicePriceHistory
+from apps.common.models import AuditLog
+from apps.payments.models import CashSession
+
+
+def selects_from(ctx, table):
+    return [query for query in ctx.captured_queries if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]]
+
+
+class FieldTrackingTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="tracker", password="StrongPass123!")
+        Service.objects.create(
+            code="TRK-01",
+            name="Lavado rastreado",
+            category=Service.Category.WASH,
+            pricing_mode=Service.PricingMode.KILO,
+            unit_price=Decimal("25.00"),
+        )
+
+    def test_untouched_tracked_fields_save_with_a_single_update(self):
+        service = Service.objects.get(code="TRK-01")
+        service.name = "Lavado renombrado"
+
+        with CaptureQueriesContext(connection) as ctx:
+            service.save()
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertTrue(ctx.captured_queries[0]["sql"].startswith("UPDATE"))
+        self.assertEqual(service.changed_fields(), {})
+
+    def test_price_change_is_diffed_without_rereading_the_row(self):
+        service = Service.objects.get(code="TRK-01")
+        service.unit_price = Decimal("30.00")
+        self.assertEqual(service.changed_fields(), {"unit_price": (Decimal("25.00"), Decimal("30.00"))})
+
+        with CaptureQueriesContext(connection) as ctx:
+            service.save()
+
+        self.assertEqual(selects_from(ctx, "catalog_service"), [])
+        self.assertEqual(ServicePriceHistory.objects.get(service=service).previous_price, Decimal("25.00"))
+        self.assertTrue(AuditLog.objects.filter(action="service.price_changed").exists())
+
+    def test_deferred_tracked_field_is_loaded_once(self):
+        service = Service.objects.only("id", "code", "name").get(code="TRK-01")
+        service.unit_price = Decimal("20.00")
+
+        with CaptureQueriesContext(connection) as ctx:
+            service.save()
+
+        self.assertEqual(len(selects_from(ctx, "catalog_service")), 1)
+        self.assertEqual(ServicePriceHistory.objects.get(service=service).previous_price, Decimal("25.00"))
+
+    def test_cash_session_close_and_password_rotation_skip_previous_row_reads(self):
+        session = CashSession.objects.get(pk=CashSession.objects.create(user=self.user).pk)
+        session.closed_at = timezone.now()
+        session.closing_amount = Decimal("0.00")
+        with CaptureQueriesContext(connection) as ctx:
+            session.save()
+        self.assertEqual(selects_from(ctx, "payments_cashsession"), [])
+        self.assertTrue(AuditLog.objects.filter(action="cash_session.closed").exists())
+
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.set_password("OtherPass456!")
+        with CaptureQueriesContext(connection) as ctx:
+            user.save()
+        self.assertEqual(selects_from(ctx, "auth_user"), [])
+        self.assertFalse(UserCredentialPolicy.objects.get(user=user).require_password_change)
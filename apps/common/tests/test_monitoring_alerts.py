@@ -2,9 +2,12 @@ from decimal import Decimal
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
+from apps.common.alerts import AlertAggregator, raise_operational_alert
 from apps.common.models import OperationalAlert
 from apps.payments.models import CashSession
 
@@ -41,3 +44,97 @@ class MonitoringAlertsTests(TestCase):
 
         self.assertEqual(response.status_code, 503)
         emit_mock.assert_called_once()
+
+
+@override_settings(ALERT_FLUSH_COUNT=1000, ALERT_FLUSH_SECONDS=60)
+class AlertAggregatorTests(TestCase):
+    def _record(self, aggregator, source="/api/orders/", **metadata):
+        return aggregator.record(
+            event_type="http.server_error",
+            source=source,
+            severity=OperationalAlert.Severity.CRITICAL,
+            message="Se detecto error 500 en la aplicacion.",
+            metadata=metadata,
+        )
+
+    def test_error_storm_produces_bounded_writes(self):
+        aggregator = AlertAggregator()
+
+        with CaptureQueriesContext(connection) as ctx:
+            for index in range(10_000):
+                self._record(aggregator, attempt=index)
+            aggregator.flush()
+
+        # First sighting (lookup + insert), one UPDATE per 1000 occurrences.
+        self.assertLessEqual(len(ctx.captured_queries), 12)
+        alert = OperationalAlert.objects.get()
+        self.assertEqual(alert.occurrence_count, 10_000)
+        self.assertEqual(alert.metadata["attempt"], 9_999)
+
+    def test_time_threshold_flushes_every_pending_counter(self):
+        aggregator = AlertAggregator()
+        self._record(aggregator, source="/a/")
+        self._record(aggregator, source="/b/")
+        self._record(aggregator, source="/a/")
+        self.assertEqual(aggregator.flush(force=False), {})
+
+        # One UPDATE per pending fingerprint once the interval has elapsed.
+        with patch("apps.common.alerts.time.monotonic", return_value=10**9):
+            with self.assertNumQueries(2):
+                self._record(aggregator, source="/b/")
+
+        counts = dict(OperationalAlert.objects.values_list("source", "occurrence_count"))
+        self.assertEqual(counts, {"/a/": 2, "/b/": 2})
+
+    def test_resolved_alert_is_reopened_with_pending_count(self):
+        aggregator = AlertAggregator()
+        alert_id = self._record(aggregator)
+        self._record(aggregator)
+        self._record(aggregator)
+        OperationalAlert.objects.filter(pk=alert_id).update(resolved_at=timezone.now())
+
+        new_id = aggregator.flush()[next(iter(aggregator._alerts))]
+
+        self.assertNotEqual(new_id, alert_id)
+        self.assertEqual(OperationalAlert.objects.get(pk=new_id).occurrence_count, 2)
+
+    def test_known_alerts_are_bounded(self):
+        aggregator = AlertAggregator(max_alerts=2)
+        for index in range(5):
+            self._record(aggregator, source=f"/api/orders/{index}/")
+
+        self.assertEqual(len(aggregator._alerts), 2)
+        self.assertEqual(OperationalAlert.objects.count(), 5)
+
+    def test_failed_first_write_backs_off_until_the_next_flush(self):
+        aggregator = AlertAggregator()
+        with patch.object(OperationalAlert.objects, "create", side_effect=DatabaseError("down")):
+            with self.assertRaises(DatabaseError):
+                self._record(aggregator)
+
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                self._record(aggregator)
+
+        aggregator.flush()
+        self.assertEqual(OperationalAlert.objects.get().occurrence_count, 6)
+
+    def test_requests_flush_due_counters(self):
+        alert_id = raise_operational_alert(
+            event_type="http.server_error",
+            source="/api/flush/",
+            severity=OperationalAlert.Severity.CRITICAL,
+            message="Se detecto error 500 en la aplicacion.",
+        )
+        raise_operational_alert(
+            event_type="http.server_error",
+            source="/api/flush/",
+            severity=OperationalAlert.Severity.CRITICAL,
+            message="Se detecto error 500 en la aplicacion.",
+        )
+        self.assertEqual(OperationalAlert.objects.get(pk=alert_id).occurrence_count, 1)
+
+        with patch("apps.common.alerts.time.monotonic", return_value=10**9), self.captureOnCommitCallbacks(execute=True):
+            Client().get("/login/")
+
+        self.assertEqual(OperationalAlert.objects.get(pk=alert_id).occurrence_count, 2)
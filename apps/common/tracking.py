@@ -0,0 +1,89 @@
+from django.db import transaction
+
+TRACKED_VALUES_ATTR = "_tracked_values"
+
+
+def _attnames(model, fields):
+    return tuple(model._meta.get_field(name).attname for name in fields)
+
+
+def snapshot_fields(instance, fields, only=None):
+    """
+    Remembers the current value of ``fields`` (attnames) as the persisted one.
+    Deferred fields are skipped and loaded on first use by ``changed_fields``.
+    """
+    values = instance.__dict__.setdefault(TRACKED_VALUES_ATTR, {})
+    if only is not None:
+        only = set(_attnames(type(instance), only))
+    for name in fields:
+        if name in instance.__dict__ and (only is None or name in only):
+            values[name] = instance.__dict__[name]
+
+
+def changed_fields(instance, fields):
+    """
+    Returns ``{attname: (persisted, current)}`` for the tracked fields that
+    differ from the database. Only fields never loaded on this instance cost
+    a query, and they are remembered afterwards.
+    """
+    if instance._state.adding or instance.pk is None:
+        return {}
+
+    persisted = instance.__dict__.setdefault(TRACKED_VALUES_ATTR, {})
+    missing = [name for name in fields if name not in persisted]
+    if missing:
+        row = (
+            type(instance)._base_manager.using(instance._state.db or "default")
+            .filter(pk=instance.pk)
+            .values(*missing)
+            .first()
+        )
+        if row is None:
+            return {}
+        persisted.update(row)
+
+    changes = {}
+    for name in fields:
+        current = getattr(instance, name)
+        if persisted[name] != current:
+            changes[name] = (persisted[name], current)
+    return changes
+
+
+class TrackedFieldsMixin:
+    """
+    Keeps the loaded values of ``tracked_fields`` so save hooks can diff an
+    instance against its row without reading it again.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def _tracked_attnames(cls):
+        return _attnames(cls, cls.tracked_fields)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        snapshot_fields(instance, cls._tracked_attnames())
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        snapshot_fields(self, self._tracked_attnames(), fields)
+
+    def save(self, *args, **kwargs):
+        # pre_save/post_save hooks that write (audit rows) share the save's transaction.
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+        snapshot_fields(self, self._tracked_attnames(), kwargs.get("update_fields"))
+
+    def changed_fields(self):
+        return changed_fields(self, self._tracked_attnames())
+
+    def persisted_values(self):
+        """``{attname: value}`` of the tracked fields as stored in the database."""
+        changes = self.changed_fields()
+        values = {name: getattr(self, name) for name in self._tracked_attnames()}
+        values.update({name: persisted for name, (persisted, _) in changes.items()})
+        return values
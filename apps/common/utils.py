@@ -0,0 +1,20 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+
+def local_day_bounds(date_from, date_to=None):
+    """Half-open ``[start, end)`` datetimes covering whole local days."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(date_from, time.min), tz)
+    end = timezone.make_aware(datetime.combine((date_to or date_from) + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def local_date_range(field, date_from, date_to=None):
+    """
+    Filter kwargs selecting ``field`` within whole local days. Unlike
+    ``field__date`` lookups this compares the raw column, so its index applies.
+    """
+    start, end = local_day_bounds(date_from, date_to)
+    return {f"{field}__gte": start, f"{field}__lt": end}
@@ -2,7 +2,7 @@ from django.db import connection
 from django.http import JsonResponse
 from django.views import View
 
-from .alerts import emit_db_down_alert
+from .alerts import emit_db_down_alert, flush_operational_alerts
 
 
 class HealthCheckView(View):
@@ -11,7 +11,13 @@ class HealthCheckView(View):
             with connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
                 cursor.fetchone()
-            return JsonResponse({"status": "ok", "database": "ok"}, status=200)
         except Exception as exc:
             emit_db_down_alert(exc)
             return JsonResponse({"status": "error", "database": "unavailable"}, status=503)
+
+        # The database answered: a good moment to persist coalesced alert counters.
+        try:
+            flush_operational_alerts(force=False)
+        except Exception:
+            pass
+        return JsonResponse({"status": "ok", "database": "ok"}, status=200)
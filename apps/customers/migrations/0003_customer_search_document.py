@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:43
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from apps.common.search import AddPostgresIndex, build_document, normalize_text, phone_digits
+
+
+def fill_search_documents(apps, schema_editor):
+    Customer = apps.get_model("customers", "Customer")
+    customers = list(Customer.objects.only("first_name", "last_name", "phone", "rfc"))
+    for customer in customers:
+        customer.search_document = build_document(
+            normalize_text(f"{customer.first_name} {customer.last_name}"),
+            phone_digits(customer.phone),
+            normalize_text(customer.rfc),
+        )
+    Customer.objects.bulk_update(customers, ["search_document"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_remove_customer_email_alter_customer_phone_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+        # Skipped when pg_trgm is already installed; otherwise needs CREATE on the
+        # database (pg_trgm is a trusted extension), not superuser. No-op off PostgreSQL.
+        TrigramExtension(),
+        AddPostgresIndex(
+            model_name='customer',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_document'], name='customers_search_trgm', opclasses=['gin_trgm_ops']
+            ),
+        ),
+    ]
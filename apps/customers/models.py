@@ -1,6 +1,25 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.functions import Concat, Lower
 
 from apps.common.models import TimeStampedModel
+from apps.common.search import build_document, document_filter, normalize_text, phone_digits, trigram_index
+
+
+class CustomerQuerySet(models.QuerySet):
+    def search(self, query):
+        condition, terms = document_filter(query)
+        if not terms:
+            return self.none()
+        return self.filter(condition).annotate(
+            search_rank=Case(
+                When(phone=phone_digits(query), then=Value(0)),
+                When(search_document__startswith=terms[0], then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField(),
+            )
+        )
 
 
 class Customer(TimeStampedModel):
@@ -10,6 +29,9 @@ class Customer(TimeStampedModel):
     rfc = models.CharField(max_length=13, blank=True)
     notes = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
+    search_document = models.TextField(blank=True, default="", editable=False)
+
+    objects = CustomerQuerySet.as_manager()
 
     class Meta:
         ordering = ["first_name", "last_name"]
@@ -19,7 +41,26 @@ class Customer(TimeStampedModel):
                 name="uniq_customer_full_name",
             ),
         ]
+        indexes = [trigram_index("customers_search_trgm")]
 
     def __str__(self) -> str:
         full_name = f"{self.first_name} {self.last_name}".strip()
         return f"{full_name} ({self.phone})"
+
+    def build_search_document(self):
+        return build_document(normalize_text(f"{self.first_name} {self.last_name}"), phone_digits(self.phone), normalize_text(self.rfc))
+
+    def save(self, *args, **kwargs):
+        document = self.build_search_document()
+        changed = document != self.search_document
+        self.search_document = document
+        update_fields = kwargs.get("update_fields")
+        if changed and update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "search_document"}
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+
+        if changed and not adding:
+            # Orders embed the customer's document next to their folio.
+            Order = apps.get_model("orders", "Order")
+            Order.objects.filter(customer=self).update(search_document=Concat(Lower("folio"), Value(f" {document}")))
@@ -1,6 +1,7 @@
 from rest_framework import filters, viewsets
 
 from apps.accounts.api_permissions import StrictDjangoModelPermissions
+from apps.common.search import DocumentSearchFilter
 
 from .models import Customer
 from .serializers import CustomerSerializer
@@ -10,7 +11,6 @@ class CustomerViewSet(viewsets.ModelViewSet):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
     permission_classes = [StrictDjangoModelPermissions]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["first_name", "last_name", "phone", "rfc"]
+    filter_backends = [filters.OrderingFilter, DocumentSearchFilter]
     ordering_fields = ["first_name", "created_at"]
     ordering = ["first_name", "last_name"]
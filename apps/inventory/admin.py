@@ -8,6 +8,8 @@ class SupplyAdmin(admin.ModelAdmin):
     list_display = ("code", "name", "unit", "current_stock", "min_stock", "is_active")
     list_filter = ("unit", "is_active")
     search_fields = ("code", "name")
+    # Stock only changes through inventory movements.
+    readonly_fields = ("current_stock",)
 
 
 @admin.register(InventoryMovement)
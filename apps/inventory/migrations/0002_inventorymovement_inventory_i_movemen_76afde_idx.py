@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventorymovement',
+            index=models.Index(fields=['movement_type', 'occurred_at'], name='inventory_i_movemen_76afde_idx'),
+        ),
+    ]
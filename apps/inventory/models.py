@@ -1,7 +1,6 @@
 from decimal import Decimal
 
 from django.conf import settings
-from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
 
@@ -29,6 +28,16 @@ class Supply(TimeStampedModel):
     def __str__(self) -> str:
         return f"{self.name} ({self.code})"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # Stock only changes through movements (F() updates); a stale instance must not overwrite it.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "current_stock"
+            ]
+        super().save(*args, **kwargs)
+
 
 class InventoryMovement(TimeStampedModel):
     class MovementType(models.TextChoices):
@@ -55,6 +64,7 @@ class InventoryMovement(TimeStampedModel):
 
     class Meta:
         ordering = ["-occurred_at", "-created_at"]
+        indexes = [models.Index(fields=["movement_type", "occurred_at"])]
 
     def __str__(self) -> str:
         return f"{self.supply.name} - {self.get_movement_type_display()} - {self.quantity}"
@@ -65,51 +75,38 @@ class InventoryMovement(TimeStampedModel):
         return Decimal(self.quantity) * Decimal("-1")
 
     def save(self, *args, **kwargs):
+        from .services import apply_stock_delta
+
         with transaction.atomic():
+            previous = None
             if self.pk:
-                previous = InventoryMovement.objects.select_for_update().get(pk=self.pk)
-                previous_supply = previous.supply
-                old_delta = previous.signed_quantity()
+                previous = InventoryMovement.objects.select_for_update().filter(pk=self.pk).first()
+
+            supply = self.supply if InventoryMovement.supply.is_cached(self) else None
+            if previous is not None and previous.supply_id != self.supply_id:
+                apply_stock_delta(
+                    previous.supply_id,
+                    -previous.signed_quantity(),
+                    message="No se puede actualizar: stock negativo en insumo previo.",
+                )
+                apply_stock_delta(self.supply_id, self.signed_quantity(), supply=supply)
             else:
-                previous = None
-                previous_supply = None
-                old_delta = Decimal("0.00")
-
-            new_delta = self.signed_quantity()
-
-            if previous and previous_supply is not None:
-                if previous_supply.id != self.supply_id:
-                    previous_supply.current_stock = Decimal(previous_supply.current_stock) - old_delta
-                    if previous_supply.current_stock < 0:
-                        raise ValidationError("No se puede actualizar: stock negativo en insumo previo.")
-                    previous_supply.save(update_fields=["current_stock", "updated_at"])
-
-                    self.supply.current_stock = Decimal(self.supply.current_stock) + new_delta
-                    if self.supply.current_stock < 0:
-                        raise ValidationError("Stock insuficiente para este movimiento.")
-                    self.supply.save(update_fields=["current_stock", "updated_at"])
-                else:
-                    diff = new_delta - old_delta
-                    self.supply.current_stock = Decimal(self.supply.current_stock) + diff
-                    if self.supply.current_stock < 0:
-                        raise ValidationError("Stock insuficiente para este movimiento.")
-                    self.supply.save(update_fields=["current_stock", "updated_at"])
-            else:
-                self.supply.current_stock = Decimal(self.supply.current_stock) + new_delta
-                if self.supply.current_stock < 0:
-                    raise ValidationError("Stock insuficiente para este movimiento.")
-                self.supply.save(update_fields=["current_stock", "updated_at"])
+                old_delta = previous.signed_quantity() if previous is not None else Decimal("0.00")
+                apply_stock_delta(self.supply_id, self.signed_quantity() - old_delta, supply=supply)
 
             super().save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):
+        from .services import apply_stock_delta
+
         with transaction.atomic():
-            delta = self.signed_quantity()
-            self.supply.current_stock = Decimal(self.supply.current_stock) - delta
-            if self.supply.current_stock < 0:
-                raise ValidationError("No se puede eliminar el movimiento: dejaria stock negativo.")
-            self.supply.save(update_fields=["current_stock", "updated_at"])
-            super().delete(*args, **kwargs)
+            apply_stock_delta(
+                self.supply_id,
+                -self.signed_quantity(),
+                supply=self.supply if InventoryMovement.supply.is_cached(self) else None,
+                message="No se puede eliminar el movimiento: dejaria stock negativo.",
+            )
+            return super().delete(*args, **kwargs)
 
 
 class Expense(TimeStampedModel):
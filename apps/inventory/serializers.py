@@ -1,10 +1,24 @@
+from decimal import Decimal
+
+from django.db import transaction
 from rest_framework import serializers
 
 from .models import Expense, InventoryMovement, Supply
+from .services import post_movements
+
+OPENING_STOCK_CONCEPT = "Inventario inicial"
 
 
 class SupplySerializer(serializers.ModelSerializer):
+    """
+    ``current_stock`` is read-only: it changes through movements. A new supply
+    may take ``opening_stock``, posted as an entry movement.
+    """
+
     low_stock = serializers.SerializerMethodField()
+    opening_stock = serializers.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal("0"), write_only=True, required=False
+    )
 
     class Meta:
         model = Supply
@@ -15,17 +29,42 @@ class SupplySerializer(serializers.ModelSerializer):
             "unit",
             "min_stock",
             "current_stock",
+            "opening_stock",
             "low_stock",
             "is_active",
             "notes",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "low_stock", "created_at", "updated_at"]
+        read_only_fields = ["id", "current_stock", "low_stock", "created_at", "updated_at"]
 
     def get_low_stock(self, obj):
         return obj.current_stock <= obj.min_stock
 
+    def validate_opening_stock(self, value):
+        if self.instance is not None:
+            raise serializers.ValidationError("Solo al crear el insumo; despues registra un movimiento de ajuste.")
+        return value
+
+    def create(self, validated_data):
+        opening_stock = validated_data.pop("opening_stock", None)
+        with transaction.atomic():
+            supply = super().create(validated_data)
+            if opening_stock:
+                request = self.context.get("request")
+                post_movements(
+                    [
+                        InventoryMovement(
+                            supply=supply,
+                            movement_type=InventoryMovement.MovementType.ENTRY,
+                            quantity=opening_stock,
+                            concept=OPENING_STOCK_CONCEPT,
+                            created_by=request.user if request else None,
+                        )
+                    ]
+                )
+        return supply
+
 
 class InventoryMovementSerializer(serializers.ModelSerializer):
     supply_name = serializers.CharField(source="supply.name", read_only=True)
@@ -0,0 +1,66 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import InventoryMovement, Supply
+
+ZERO = Decimal("0.00")
+INSUFFICIENT_STOCK = "Stock insuficiente para este movimiento."
+
+
+def apply_stock_delta(supply_id, delta, *, supply=None, message=INSUFFICIENT_STOCK):
+    """
+    Adds ``delta`` to the stock of a supply with one conditional UPDATE
+    (``current_stock + delta >= 0``), so concurrent movements never overwrite
+    each other. Raises ``ValidationError`` when the stock would go negative.
+    """
+    delta = Decimal(delta)
+    if not delta:
+        return
+    updated = Supply.objects.filter(pk=supply_id, current_stock__gte=-delta).update(
+        current_stock=F("current_stock") + delta,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        raise ValidationError(message)
+    if supply is not None and supply.pk == supply_id:
+        supply.refresh_from_db(fields=["current_stock"])
+
+
+def apply_stock_deltas(deltas, *, supplies=(), message=INSUFFICIENT_STOCK):
+    """
+    Applies ``{supply_id: delta}`` in one transaction, in supply id order so
+    concurrent postings lock rows in the same order. Nothing is applied if
+    any supply would go negative.
+    """
+    loaded = {supply.pk: supply for supply in supplies}
+    with transaction.atomic():
+        for supply_id in sorted(deltas):
+            try:
+                apply_stock_delta(supply_id, deltas[supply_id], supply=loaded.get(supply_id), message=message)
+            except ValidationError:
+                name = loaded[supply_id].name if supply_id in loaded else supply_id
+                raise ValidationError(f"{message} Insumo: {name}.") from None
+
+
+def post_movements(movements):
+    """
+    Posts many new inventory movements at once: one conditional UPDATE per
+    supply for the net quantity and one INSERT for all movements.
+    """
+    movements = list(movements)
+    deltas = defaultdict(lambda: ZERO)
+    for movement in movements:
+        movement.full_clean(exclude=["supply"])
+        deltas[movement.supply_id] += movement.signed_quantity()
+
+    with transaction.atomic():
+        apply_stock_deltas(
+            deltas,
+            supplies=[movement.supply for movement in movements if InventoryMovement.supply.is_cached(movement)],
+        )
+        return InventoryMovement.objects.bulk_create(movements)
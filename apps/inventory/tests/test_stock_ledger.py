@@ -0,0 +1,200 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from threading import Lock
+from unittest import skipIf
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.inventory.models import InventoryMovement, Supply
+from apps.inventory.services import post_movements
+
+
+def consumption(supply, quantity="1.00"):
+    return InventoryMovement(
+        supply=supply,
+        movement_type=InventoryMovement.MovementType.CONSUMPTION,
+        quantity=Decimal(quantity),
+        concept="Carga",
+    )
+
+
+class StockLedgerTests(TestCase):
+    def setUp(self):
+        self.soap = Supply.objects.create(code="JAB", name="Jabon", unit=Supply.Unit.LITER, current_stock=Decimal("10.00"))
+        self.softener = Supply.objects.create(
+            code="SUA", name="Suavizante", unit=Supply.Unit.LITER, current_stock=Decimal("5.00")
+        )
+
+    def stock(self, supply):
+        return Supply.objects.get(pk=supply.pk).current_stock
+
+    def test_stale_supply_instance_does_not_overwrite_stock(self):
+        stale = Supply.objects.get(pk=self.soap.pk)
+        consumption(self.soap, "3.00").save()
+
+        consumption(stale, "2.00").save()
+
+        self.assertEqual(self.stock(self.soap), Decimal("5.00"))
+
+    def test_saving_a_stale_supply_keeps_the_stock(self):
+        stale = Supply.objects.get(pk=self.soap.pk)
+        consumption(self.soap, "3.00").save()
+
+        stale.min_stock = Decimal("2.00")
+        stale.save()
+
+        self.assertEqual(self.stock(self.soap), Decimal("7.00"))
+        self.assertEqual(Supply.objects.get(pk=self.soap.pk).min_stock, Decimal("2.00"))
+
+    def test_movement_reloads_the_stock_of_its_supply(self):
+        stale = Supply.objects.get(pk=self.soap.pk)
+        consumption(self.soap, "3.00").save()
+
+        consumption(stale, "2.00").save()
+
+        self.assertEqual(stale.current_stock, Decimal("5.00"))
+
+    def test_api_does_not_write_the_stock(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser(username="admin_stock", password="StrongPass123!"))
+
+        response = client.patch(f"/api/inventory/supplies/{self.soap.pk}/", {"current_stock": "99.00", "notes": "Bodega"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stock(self.soap), Decimal("10.00"))
+
+        response = client.patch(f"/api/inventory/supplies/{self.soap.pk}/", {"opening_stock": "99.00"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.stock(self.soap), Decimal("10.00"))
+
+    def test_api_opening_stock_is_posted_as_an_entry(self):
+        admin = User.objects.create_superuser(username="admin_open", password="StrongPass123!")
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        response = client.post(
+            "/api/inventory/supplies/",
+            {"code": "CLO", "name": "Cloro", "unit": Supply.Unit.LITER, "opening_stock": "12.50"},
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["current_stock"], "12.50")
+        movement = InventoryMovement.objects.get(supply_id=response.data["id"])
+        self.assertEqual(
+            (movement.movement_type, movement.quantity, movement.created_by),
+            (InventoryMovement.MovementType.ENTRY, Decimal("12.50"), admin),
+        )
+
+    def test_admin_shows_the_stock_read_only(self):
+        self.client.force_login(User.objects.create_superuser(username="admin_form", password="StrongPass123!"))
+
+        response = self.client.get(f"/admin/inventory/supply/{self.soap.pk}/change/")
+
+        self.assertNotContains(response, 'name="current_stock"')
+        self.assertContains(response, "10.00")
+
+    def test_movement_that_would_go_negative_is_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "Stock insuficiente"):
+            consumption(self.softener, "6.00").save()
+
+        self.assertEqual(self.stock(self.softener), Decimal("5.00"))
+        self.assertFalse(InventoryMovement.objects.exists())
+
+    def test_edits_and_deletes_move_the_difference(self):
+        movement = consumption(self.soap, "4.00")
+        movement.save()
+        movement.quantity = Decimal("1.00")
+        movement.save()
+        self.assertEqual(self.stock(self.soap), Decimal("9.00"))
+
+        movement.supply = self.softener
+        movement.save()
+        self.assertEqual((self.stock(self.soap), self.stock(self.softener)), (Decimal("10.00"), Decimal("4.00")))
+
+        movement.delete()
+        self.assertEqual(self.stock(self.softener), Decimal("5.00"))
+
+    def test_bulk_posting_updates_each_supply_once(self):
+        movements = [consumption(self.soap) for _ in range(6)] + [consumption(self.softener, "2.00")]
+        movements.append(
+            InventoryMovement(
+                supply=self.soap, movement_type=InventoryMovement.MovementType.ENTRY, quantity=Decimal("4.00"), concept="Compra"
+            )
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            post_movements(movements)
+
+        updates = [query for query in ctx.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(InventoryMovement.objects.count(), 8)
+        self.assertEqual((self.stock(self.soap), self.stock(self.softener)), (Decimal("8.00"), Decimal("3.00")))
+
+    def test_bulk_posting_is_all_or_nothing(self):
+        with self.assertRaisesMessage(ValidationError, "Suavizante"):
+            post_movements([consumption(self.soap, "2.00"), consumption(self.softener, "9.00")])
+
+        self.assertEqual((self.stock(self.soap), self.stock(self.softener)), (Decimal("10.00"), Decimal("5.00")))
+        self.assertFalse(InventoryMovement.objects.exists())
+
+
+class StockLedgerConcurrencyTests(TransactionTestCase):
+    """Each station keeps its own, soon stale, copy of the supply."""
+
+    def setUp(self):
+        self.supply = Supply.objects.create(code="JAB", name="Jabon", unit=Supply.Unit.LITER, current_stock=Decimal("100.00"))
+
+    def _run_stations(self, work, stations=8):
+        copies = [Supply.objects.get(pk=self.supply.pk) for _ in range(stations)]
+
+        def run(supply):
+            try:
+                return work(supply)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=stations) as pool:
+            return [value for batch in pool.map(run, copies) for value in batch]
+
+    def _post(self, supply, write_lock=None):
+        try:
+            if write_lock is None:
+                consumption(supply).save()
+            else:
+                # SQLite's shared-cache test database rejects concurrent writers.
+                with write_lock:
+                    consumption(supply).save()
+        except ValidationError:
+            return False
+        return True
+
+    def test_concurrent_consumptions_lose_no_updates(self):
+        write_lock = Lock() if connection.vendor == "sqlite" else None
+
+        results = self._run_stations(lambda supply: [self._post(supply, write_lock) for _ in range(15)])
+
+        posted = results.count(True)
+        self.assertEqual(posted, 100)
+        self.assertEqual(InventoryMovement.objects.count(), 100)
+        self.assertEqual(Supply.objects.get(pk=self.supply.pk).current_stock, Decimal("0.00"))
+
+    @skipIf(connection.vendor == "sqlite", "SQLite serializes writers; run against PostgreSQL.")
+    def test_concurrent_bulk_postings_never_go_negative(self):
+        def work(supply):
+            posted = []
+            for _ in range(10):
+                try:
+                    post_movements([consumption(supply), consumption(supply)])
+                    posted.append(2)
+                except ValidationError:
+                    posted.append(0)
+            return posted
+
+        posted = sum(self._run_stations(work))
+
+        self.assertEqual(posted, 100)
+        self.assertEqual(Supply.objects.get(pk=self.supply.pk).current_stock, Decimal("0.00"))
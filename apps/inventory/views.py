@@ -7,6 +7,7 @@ from django.views import View
 
 from apps.accounts.api_permissions import StrictDjangoModelPermissions
 from apps.accounts.permissions import ROLE_ADMIN, ROLE_MANAGER, ROLE_SELLER, RoleRequiredMixin
+from apps.common.utils import local_date_range
 
 from .models import Expense, InventoryMovement, Supply
 from .serializers import ExpenseSerializer, InventoryMovementSerializer, SupplySerializer
@@ -111,8 +112,7 @@ class InventoryDashboardView(RoleRequiredMixin, View):
         consumption = (
             InventoryMovement.objects.filter(
                 movement_type__in=[InventoryMovement.MovementType.CONSUMPTION, InventoryMovement.MovementType.LOSS],
-                occurred_at__date__gte=date_from,
-                occurred_at__date__lte=date_to,
+                **local_date_range("occurred_at", date_from, date_to),
             )
             .values("supply__name")
             .annotate(total_qty=Sum("quantity"), moves=Count("id"))
@@ -1,16 +1,131 @@
-from io import BytesIO
+import hashlib
+from functools import lru_cache
 
-try:
-    import barcode
-    from barcode.writer import SVGWriter
-except Exception:  # pragma: no cover
-    barcode = None
-    SVGWriter = None
+from django.core.cache import cache
+from django.utils.html import escape
 
+BARCODE_CACHE_VERSION = 1
+BARCODE_LRU_SIZE = 512
+BARCODE_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+MODULE_MM = 0.2
+QUIET_ZONE = 10
+BAR_HEIGHT = 75
+TEXT_HEIGHT = 22
 
+# Bar/space widths for Code 128 symbol values 0-105, then the stop pattern
+# with its termination bar.
+CODE128_WIDTHS = (
+    "212222", "222122", "222221", "121223", "121322", "131222", "122213", "122312",
+    "132212", "221213", "221312", "231212", "112232", "122132", "122231", "113222",
+    "123122", "123221", "223211", "221132", "221231", "213212", "223112", "312131",
+    "311222", "321122", "321221", "312212", "322112", "322211", "212123", "212321",
+    "232121", "111323", "131123", "131321", "112313", "132113", "132311", "211313",
+    "231113", "231311", "112133", "112331", "132131", "113123", "113321", "133121",
+    "313121", "211331", "231131", "213113", "213311", "213131", "311123", "311321",
+    "331121", "312113", "312311", "332111", "314111", "221411", "431111", "111224",
+    "111422", "121124", "121421", "141122", "141221", "112214", "112412", "122114",
+    "122411", "142112", "142211", "241211", "221114", "413111", "241112", "134111",
+    "111242", "121142", "121241", "114212", "124112", "124211", "411212", "421112",
+    "421211", "212141", "214121", "412121", "111143", "111341", "131141", "114113",
+    "114311", "411113", "411311", "113141", "114131", "311141", "411131", "211412",
+    "211214", "211232",
+)
+CODE128_STOP = "2331112"
+CODE_B, CODE_C = 100, 99
+START_B, START_C = 104, 105
+
+
+def _digit_run(value, start):
+    end = start
+    while end < len(value) and value[end].isdigit():
+        end += 1
+    return end - start
+
+
+def code128_values(value: str) -> list[int]:
+    """
+    Symbol values (start code through checksum) for printable ASCII text.
+    Digit runs long enough to save space are packed in pairs with code set C.
+    """
+    if not value or any(not " " <= char <= "~" for char in value):
+        raise ValueError("Code 128 B/C solo admite ASCII imprimible.")
+
+    values = []
+    charset = None
+    position = 0
+    while position < len(value):
+        run = _digit_run(value, position)
+        at_edge = position == 0 or position + run == len(value)
+        if run >= (4 if at_edge else 6):
+            if run % 2 and position:
+                if charset != "B":
+                    values.append(START_B if charset is None else CODE_B)
+                    charset = "B"
+                values.append(ord(value[position]) - 32)
+                position += 1
+                run -= 1
+            if charset != "C":
+                values.append(START_C if charset is None else CODE_C)
+                charset = "C"
+            for offset in range(position, position + run - run % 2, 2):
+                values.append(int(value[offset : offset + 2]))
+            position += run - run % 2
+            continue
+        if charset != "B":
+            values.append(START_B if charset is None else CODE_B)
+            charset = "B"
+        values.append(ord(value[position]) - 32)
+        position += 1
+
+    values.append((values[0] + sum(index * symbol for index, symbol in enumerate(values[1:], start=1))) % 103)
+    return values
+
+
+def code128_widths(value: str) -> str:
+    """Alternating bar/space module widths, starting with a bar."""
+    return "".join(CODE128_WIDTHS[symbol] for symbol in code128_values(value)) + CODE128_STOP
+
+
+def render_code128_svg(value: str) -> str:
+    """Inline SVG for ``value`` built as a plain string: one path for all bars."""
+    x = QUIET_ZONE
+    bars = []
+    for index, width in enumerate(code128_widths(value)):
+        width = int(width)
+        if index % 2 == 0:
+            bars.append(f"M{x} 0h{width}v{BAR_HEIGHT}h-{width}z")
+        x += width
+    total_width = x + QUIET_ZONE
+    total_height = BAR_HEIGHT + TEXT_HEIGHT
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{total_width * MODULE_MM:.3f}mm" '
+        f'height="{total_height * MODULE_MM:.3f}mm" viewBox="0 0 {total_width} {total_height}">'
+        f'<rect width="100%" height="100%" fill="white"/>'
+        f'<path d="{"".join(bars)}" fill="black"/>'
+        f'<text x="{total_width / 2:g}" y="{total_height - 4}" font-size="17" font-family="monospace" '
+        f'text-anchor="middle">{escape(value)}</text></svg>'
+    )
+
+
+def _cache_key(symbology, value):
+    digest = hashlib.sha1(value.encode("utf-8")).hexdigest()
+    return f"orders:barcode:v{BARCODE_CACHE_VERSION}:{symbology}:{digest}"
+
+
+@lru_cache(maxsize=BARCODE_LRU_SIZE)
 def code128_svg(value: str) -> str:
-    if barcode is None or SVGWriter is None:
+    """
+    Ticket barcode for a folio. Rendered SVGs are kept in a per-process LRU
+    and in the shared cache, so reprints and other workers skip encoding.
+    """
+    if not value:
         return ""
-    stream = BytesIO()
-    barcode.get("code128", value, writer=SVGWriter()).write(stream)
-    return stream.getvalue().decode("utf-8")
+    key = _cache_key("code128", value)
+    svg = cache.get(key)
+    if svg is None:
+        try:
+            svg = render_code128_svg(value)
+        except ValueError:
+            return ""
+        cache.set(key, svg, BARCODE_CACHE_TIMEOUT)
+    return svg
@@ -0,0 +1,128 @@
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import BoardEvent
+
+BOARD_FIELDS = ("status", "wash_status", "dry_status", "ironing_status")
+BOARD_VERSION_KEY = "orders:board:version"
+EVENT_BATCH_SIZE = 200
+# Waiters re-check the table at least this often, in case the cache is not
+# shared between workers.
+DB_RECHECK_SECONDS = 5.0
+# A missing id younger than this may be a transaction that has not committed
+# yet; events after it are held back until it shows up or the gap settles.
+GAP_SETTLE_SECONDS = 5.0
+# Upper bound for one long-poll or stream: each one holds a Gunicorn thread.
+MAX_WAIT_SECONDS = 10.0
+
+
+def record_board_events(orders):
+    """
+    Appends the current board state of ``orders`` (instances or ``values()``
+    rows with ``id``, ``folio`` and the board fields) with one INSERT.
+    """
+    events = []
+    for order in orders:
+        row = order if isinstance(order, dict) else {name: getattr(order, name) for name in ("id", "folio", *BOARD_FIELDS)}
+        events.append(BoardEvent(order_id=row["id"], folio=row["folio"], **{name: row[name] for name in BOARD_FIELDS}))
+    if events:
+        BoardEvent.objects.bulk_create(events)
+        transaction.on_commit(_bump_version)
+
+
+def _bump_version():
+    cache.add(BOARD_VERSION_KEY, 0, None)
+    try:
+        cache.incr(BOARD_VERSION_KEY)
+    except ValueError:
+        pass
+
+
+def _settled_before():
+    return timezone.now() - timedelta(seconds=GAP_SETTLE_SECONDS)
+
+
+def _contiguous(events, last_id):
+    """
+    ``events`` up to the first recent gap. Ids are taken at INSERT but become
+    visible at COMMIT, so a lower id can appear after a higher one was sent;
+    a gap is skipped only once the event after it is older than
+    ``GAP_SETTLE_SECONDS`` (the missing row was rolled back or pruned).
+    """
+    settled = _settled_before()
+    expected = last_id + 1
+    for index, event in enumerate(events):
+        if event.id != expected and event.created_at > settled:
+            return events[:index]
+        expected = event.id + 1
+    return events
+
+
+def latest_event_id():
+    """Cursor for a board rendered now: the last event not behind a recent gap."""
+    settled = BoardEvent.objects.filter(created_at__lte=_settled_before()).order_by("-id")
+    base = settled.values_list("id", flat=True).first() or 0
+    recent = _contiguous(list(BoardEvent.objects.filter(id__gt=base).order_by("id").only("id", "created_at")), base)
+    return recent[-1].id if recent else base
+
+
+def events_after(last_id, limit=EVENT_BATCH_SIZE):
+    return _contiguous(list(BoardEvent.objects.filter(id__gt=last_id).order_by("id")[:limit]), last_id)
+
+
+def event_payload(event):
+    return {
+        "id": event.id,
+        "order_id": event.order_id,
+        "folio": event.folio,
+        **{name: getattr(event, name) for name in BOARD_FIELDS},
+    }
+
+
+def wait_for_events(last_id, timeout, interval=None):
+    """
+    Events after ``last_id``, waiting up to ``timeout`` seconds (at most
+    ``MAX_WAIT_SECONDS``) for one. While waiting only the cache version is
+    read; the table is queried again when it changes (or every few seconds),
+    so idle screens cost no queries.
+    """
+    interval = interval if interval is not None else getattr(settings, "BOARD_EVENTS_POLL_INTERVAL", 1.0)
+    timeout = min(timeout, MAX_WAIT_SECONDS)
+    version = cache.get(BOARD_VERSION_KEY)
+    events = events_after(last_id)
+    checked_at = started = time.monotonic()
+    while not events and time.monotonic() - started < timeout:
+        time.sleep(interval)
+        current = cache.get(BOARD_VERSION_KEY)
+        if current != version or time.monotonic() - checked_at >= DB_RECHECK_SECONDS:
+            version = current
+            events = events_after(last_id)
+            checked_at = time.monotonic()
+    return events
+
+
+def stream_board_events(last_id, duration, heartbeat=15.0):
+    """
+    Server-sent events for ``duration`` seconds (at most ``MAX_WAIT_SECONDS``).
+    The stream then ends and ``EventSource`` reconnects with ``Last-Event-ID``,
+    so a WSGI thread is never held indefinitely.
+    """
+    duration = min(duration, MAX_WAIT_SECONDS)
+    yield "retry: 2000\n\n"
+    started = time.monotonic()
+    while True:
+        remaining = duration - (time.monotonic() - started)
+        events = wait_for_events(last_id, timeout=max(min(remaining, heartbeat), 0))
+        for event in events:
+            last_id = event.id
+            yield f"id: {event.id}\nevent: order\ndata: {json.dumps(event_payload(event))}\n\n"
+        if not events:
+            yield ": ping\n\n"
+        if time.monotonic() - started >= duration:
+            return
@@ -0,0 +1,229 @@
+from collections import OrderedDict
+from functools import partial
+from threading import Lock, local
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+FOLIO_CACHE_SIZE = 4096
+
+
+def normalize_folio(value):
+    """Canonical folio form: stripped and upper case, as stored since 0006."""
+    return (value or "").strip().upper()
+
+
+class FolioCache:
+    """Small thread-safe LRU mapping canonical folios to order ids."""
+
+    def __init__(self, max_size=FOLIO_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, folio):
+        with self._lock:
+            order_id = self._entries.get(folio)
+            if order_id is not None:
+                self._entries.move_to_end(folio)
+            return order_id
+
+    def put(self, folio, order_id):
+        with self._lock:
+            self._entries[folio] = order_id
+            self._entries.move_to_end(folio)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, folio):
+        with self._lock:
+            self._entries.pop(folio, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+folio_cache = FolioCache()
+
+
+def resolve_folio(value):
+    """
+    Order id for a scanned folio, or ``None``. Misses hit the unique index on
+    ``folio`` with a plain equality; hits skip the database entirely.
+    """
+    from .models import Order
+
+    folio = normalize_folio(value)
+    if not folio:
+        return None
+    order_id = folio_cache.get(folio)
+    if order_id is None:
+        order_id = next(iter(Order.objects.filter(folio=folio).values_list("pk", flat=True)[:1]), None)
+        if order_id is not None:
+            folio_cache.put(folio, order_id)
+    return order_id
+
+
+class _Block:
+    def __init__(self, first, last):
+        self.next = first
+        self.last = last
+
+    @property
+    def remaining(self):
+        return self.last - self.next + 1
+
+    def take(self):
+        number = self.next
+        self.next += 1
+        return number
+
+
+class FolioAllocator:
+    """
+    Hands out per-scope sequence numbers reserved from ``FolioCounter`` in
+    blocks, so concurrent workers never compete for the same folio and only
+    touch the counter row once every ``block_size`` orders.
+
+    Inside a transaction on PostgreSQL the block is reserved with one upsert
+    on the allocator's own connection, in autocommit: the counter row lock is
+    released at once instead of when the order's transaction commits, and the
+    block is shared right away. Numbers of an order that rolls back are gaps.
+
+    Elsewhere (SQLite, where a second connection would wait on the caller's
+    write lock) the block is reserved on the caller's connection. Inside a
+    transaction it yields one number and the rest is shared through
+    ``on_commit``; if the transaction or savepoint rolls back, the counter does
+    too and the callback is dropped, so numbers are never handed out twice.
+    """
+
+    def __init__(self, block_size=20, own_connection=None):
+        self.block_size = block_size
+        # None: only on PostgreSQL.
+        self.own_connection = own_connection
+        self._blocks = {}
+        self._lock = Lock()
+        self._local = local()
+
+    def allocate(self, scope):
+        while True:
+            number = self._take_shared(scope)
+            if number is not None:
+                return number
+            number = self._reserve(scope)
+            if number is not None:
+                return number
+
+    def reset(self):
+        """Drops the shared blocks and closes this thread's own connection."""
+        with self._lock:
+            self._blocks.clear()
+        own = getattr(self._local, "connection", None)
+        if own is not None:
+            own.close()
+
+    def _take_shared(self, scope):
+        with self._lock:
+            blocks = self._blocks.get(scope, [])
+            while blocks and not blocks[0].remaining:
+                blocks.pop(0)
+            return blocks[0].take() if blocks else None
+
+    def _uses_own_connection(self):
+        if not connection.in_atomic_block:
+            return False
+        if self.own_connection is None:
+            return connection.vendor == "postgresql"
+        return self.own_connection
+
+    def _reserve(self, scope):
+        """
+        Reserves the next block. Inside a transaction on the caller's
+        connection returns its first number and shares the rest on commit;
+        otherwise shares it all and returns ``None``.
+        """
+        from .models import FolioCounter
+
+        size = self.block_size
+        own_connection = self._uses_own_connection()
+        if own_connection:
+            last = self._upsert_counter(scope)
+        else:
+            with transaction.atomic():
+                counters = FolioCounter.objects.filter(scope=scope)
+                if not counters.update(last_value=F("last_value") + size):
+                    try:
+                        with transaction.atomic():
+                            FolioCounter.objects.create(scope=scope, last_value=size)
+                    except IntegrityError:
+                        counters.update(last_value=F("last_value") + size)
+                last = counters.values_list("last_value", flat=True).get()
+        block = _Block(last - size + 1, last)
+
+        if own_connection or not connection.in_atomic_block:
+            self._publish(scope, block)
+            return None
+
+        number = block.take()
+        transaction.on_commit(partial(self._publish, scope, block))
+        return number
+
+    def _connection(self):
+        own = getattr(self._local, "connection", None)
+        if own is None:
+            own = self._local.connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        own.close_if_unusable_or_obsolete()
+        return own
+
+    def _upsert_counter(self, scope):
+        """Adds a block to the counter in one autocommitted statement; returns its last number."""
+        from .models import FolioCounter
+
+        own = self._connection()
+        table = own.ops.quote_name(FolioCounter._meta.db_table)
+        scope_column = own.ops.quote_name(FolioCounter._meta.get_field("scope").column)
+        value_column = own.ops.quote_name(FolioCounter._meta.get_field("last_value").column)
+        sql = (
+            f"INSERT INTO {table} ({scope_column}, {value_column}) VALUES (%s, %s) "
+            f"ON CONFLICT ({scope_column}) DO UPDATE SET {value_column} = {table}.{value_column} + excluded.{value_column} "
+            f"RETURNING {value_column}"
+        )
+        with own.cursor() as cursor:
+            cursor.execute(sql, [scope, self.block_size])
+            return cursor.fetchone()[0]
+
+    def _publish(self, scope, block):
+        if not block.remaining:
+            return
+        with self._lock:
+            if scope not in self._blocks:
+                # Scopes change daily; blocks of previous days are unreachable.
+                self._blocks = {scope: []}
+            self._blocks[scope].append(block)
+
+
+_allocator = None
+_allocator_lock = Lock()
+
+
+def get_folio_allocator():
+    global _allocator
+    if _allocator is None:
+        with _allocator_lock:
+            if _allocator is None:
+                _allocator = FolioAllocator(block_size=max(int(getattr(settings, "FOLIO_BLOCK_SIZE", 20)), 1))
+    return _allocator
+
+
+def folio_scope(when=None):
+    prefix = normalize_folio(getattr(settings, "FOLIO_PREFIX", "LP"))
+    return f"{prefix}{timezone.localdate(when):%y%m%d}"
+
+
+def allocate_folio(when=None):
+    """Next folio for the branch prefix and local day, e.g. ``LP261017-0042``."""
+    scope = folio_scope(when)
+    return f"{scope}-{get_folio_allocator().allocate(scope):04d}"
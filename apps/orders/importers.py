@@ -0,0 +1,305 @@
+import csv
+import json
+import time
+from datetime import datetime, time as dt_time
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.catalog.models import Service
+from apps.customers.models import Customer
+from apps.payments.models import Payment
+from apps.reports.services import record_bulk_sales
+
+from .board_events import BOARD_FIELDS, record_board_events
+from .folios import normalize_folio
+from .models import ZERO, Order, OrderItem
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_COLUMNS = (
+    "folio",
+    "customer_phone",
+    "received_at",
+    "status",
+    "notes",
+    "service_code",
+    "quantity",
+    "unit_price",
+    "payment_amount",
+    "payment_method",
+    "paid_at",
+    "payment_reference",
+)
+REJECT_COLUMNS = ("line", "folio", "error")
+
+
+class RowError(Exception):
+    pass
+
+
+def read_rows(stream, fmt):
+    """
+    Yields ``(line_number, row)`` pairs without loading the whole input in
+    memory. Each row describes one item and/or one payment of the order
+    identified by ``folio``.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {key.strip(): (value or "").strip() for key, value in row.items() if key}
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None
+            continue
+        yield line_number, {key: "" if value is None else str(value).strip() for key, value in row.items()}
+
+
+def _chunk_by_folio(rows, chunk_size):
+    """
+    Groups consecutive rows sharing a folio and emits chunks of roughly
+    ``chunk_size`` rows, always cutting on a folio boundary.
+    """
+    chunk = []
+    current_folio = None
+    for line_number, row in rows:
+        folio = (row or {}).get("folio", "")
+        if chunk and len(chunk) >= chunk_size and folio != current_folio:
+            yield chunk
+            chunk = []
+        chunk.append((line_number, row))
+        current_folio = folio
+    if chunk:
+        yield chunk
+
+
+def _parse_decimal(value, label, *, required=False, minimum=ZERO):
+    if not value:
+        if required:
+            raise RowError(f"{label} es obligatorio.")
+        return None
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise RowError(f"{label} invalido.") from None
+    if not amount.is_finite() or amount < minimum:
+        raise RowError(f"{label} invalido.")
+    return amount
+
+
+def _parse_moment(value, label):
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise RowError(f"{label} invalida.")
+        moment = datetime.combine(day, dt_time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class OrderImporter:
+    """
+    Bulk loader for historical orders. Every chunk is validated with one query
+    per lookup table and written with ``bulk_create``; order totals are then
+    computed for the whole chunk with a single set-based UPDATE.
+    """
+
+    def __init__(self, *, chunk_size=500, captured_by=None):
+        self.chunk_size = max(int(chunk_size), 1)
+        self.captured_by = captured_by
+        self.rows = 0
+        self.orders = 0
+        self.items = 0
+        self.payments = 0
+        self.rejects = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.rows / self.elapsed
+
+    def summary(self):
+        return {
+            "rows": self.rows,
+            "orders": self.orders,
+            "items": self.items,
+            "payments": self.payments,
+            "rejected": len(self.rejects),
+            "seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+    def run(self, stream, fmt):
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"Formato no soportado: {fmt}")
+
+        started = time.perf_counter()
+        for chunk in _chunk_by_folio(read_rows(stream, fmt), self.chunk_size):
+            self.rows += len(chunk)
+            self._import_chunk(chunk)
+        self.rejects.sort(key=lambda reject: reject["line"])
+        self.elapsed = time.perf_counter() - started
+        return self
+
+    def _reject(self, line_number, folio, error):
+        self.rejects.append({"line": line_number, "folio": folio, "error": error})
+
+    def _import_chunk(self, chunk):
+        groups = {}
+        for line_number, row in chunk:
+            if row is None:
+                self._reject(line_number, "", "Fila con formato invalido.")
+                continue
+            folio = normalize_folio(row.get("folio", ""))
+            if not folio:
+                self._reject(line_number, "", "folio es obligatorio.")
+                continue
+            groups.setdefault(folio, []).append((line_number, row))
+
+        if not groups:
+            return
+
+        rows = [row for group in groups.values() for _, row in group]
+        customers = {
+            customer.phone: customer
+            for customer in Customer.objects.filter(phone__in={row["customer_phone"] for row in rows if row.get("customer_phone")})
+        }
+        services = {
+            service.code: service
+            for service in Service.objects.filter(code__in={row["service_code"] for row in rows if row.get("service_code")})
+        }
+        existing_folios = set(Order.objects.filter(folio__in=groups.keys()).values_list("folio", flat=True))
+
+        staged = []
+        for folio, group in groups.items():
+            if folio in existing_folios:
+                for line_number, _ in group:
+                    self._reject(line_number, folio, "La orden ya existe.")
+                continue
+            try:
+                staged.append(self._build_order(folio, group, customers, services))
+            except RowError as exc:
+                failed_line = exc.args[1] if len(exc.args) > 1 else None
+                for line_number, _ in group:
+                    message = exc.args[0] if line_number == failed_line else "Orden rechazada por errores en otra fila."
+                    self._reject(line_number, folio, message)
+
+        if not staged:
+            return
+
+        with transaction.atomic():
+            for order, _, _ in staged:
+                order.search_document = order.build_search_document()
+            orders = Order.objects.bulk_create([order for order, _, _ in staged])
+            items = []
+            payments = []
+            for order, order_items, order_payments in staged:
+                for item in order_items:
+                    item.order = order
+                    items.append(item)
+                for payment in order_payments:
+                    payment.order = order
+                    payments.append(payment)
+            OrderItem.objects.bulk_create(items)
+            Payment.objects.bulk_create(payments)
+            imported = Order.objects.filter(pk__in=[order.pk for order in orders])
+            imported.recompute_financials(board_events=False)
+            # bulk_create skips post_save, so the board hears about them here.
+            record_board_events(imported.order_by("pk").values("id", "folio", *BOARD_FIELDS))
+            record_bulk_sales(items=items, payments=payments)
+
+        self.orders += len(orders)
+        self.items += len(items)
+        self.payments += len(payments)
+
+    def _build_order(self, folio, group, customers, services):
+        order = Order(folio=folio, status=Order.Status.RECEIVED)
+        items = []
+        payments = []
+        header_set = False
+
+        for line_number, row in group:
+            try:
+                if not header_set:
+                    phone = row.get("customer_phone", "")
+                    if phone:
+                        order.customer = customers.get(phone)
+                        if order.customer is None:
+                            raise RowError(f"Cliente con telefono {phone} no existe.")
+                    status = row.get("status") or Order.Status.RECEIVED
+                    if status not in Order.Status.values:
+                        raise RowError(f"Estatus invalido: {status}.")
+                    order.status = status
+                    order.received_at = _parse_moment(row.get("received_at"), "received_at") or timezone.now()
+                    if status in (Order.Status.READY, Order.Status.DELIVERED):
+                        # recompute_financials keeps DONE ironing only where ironing items exist.
+                        order.wash_status = Order.AreaStatus.DONE
+                        order.dry_status = Order.AreaStatus.DONE
+                        order.ironing_status = Order.AreaStatus.DONE
+                    if status == Order.Status.DELIVERED:
+                        order.delivered_at = order.received_at
+                    order.notes = row.get("notes", "")
+                    header_set = True
+
+                service_code = row.get("service_code", "")
+                payment_raw = row.get("payment_amount", "")
+                if not service_code and not payment_raw:
+                    raise RowError("La fila no tiene servicio ni pago.")
+
+                if service_code:
+                    service = services.get(service_code)
+                    if service is None:
+                        raise RowError(f"Servicio {service_code} no existe.")
+                    unit_price = _parse_decimal(row.get("unit_price"), "unit_price")
+                    item = OrderItem(
+                        service=service,
+                        description=service.name,
+                        pricing_mode=service.pricing_mode,
+                        quantity=_parse_decimal(row.get("quantity"), "quantity", required=True, minimum=Decimal("0.01")),
+                        unit_price=service.unit_price if unit_price is None else unit_price,
+                        iva_rate=service.default_iva_rate,
+                    )
+                    item.compute_totals()
+                    items.append(item)
+
+                if payment_raw:
+                    method = row.get("payment_method") or Payment.Method.CASH
+                    if method not in Payment.Method.values:
+                        raise RowError(f"Metodo de pago invalido: {method}.")
+                    payments.append(
+                        Payment(
+                            captured_by=self.captured_by,
+                            method=method,
+                            status=Payment.Status.APPLIED,
+                            amount=_parse_decimal(payment_raw, "payment_amount", minimum=Decimal("0.01")),
+                            paid_at=_parse_moment(row.get("paid_at"), "paid_at") or order.received_at,
+                            reference=row.get("payment_reference", ""),
+                        )
+                    )
+            except RowError as exc:
+                raise RowError(exc.args[0], line_number) from None
+
+        return order, items, payments
+
+
+def write_rejects(rejects, stream):
+    writer = csv.DictWriter(stream, fieldnames=REJECT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rejects)
@@ -0,0 +1,45 @@
+import time
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.orders.barcodes import _cache_key, code128_svg, render_code128_svg
+
+
+class Command(BaseCommand):
+    help = "Compara el render de codigos de barras del ticket: python-barcode (SVGWriter), codificador propio y cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--folio", default="LP261017-0042", help="Folio a codificar.")
+        parser.add_argument("--iterations", type=int, default=2000, help="Renders por estrategia.")
+
+    def handle(self, *args, **options):
+        folio = options["folio"]
+        iterations = options["iterations"]
+        if iterations < 1:
+            raise CommandError("--iterations debe ser mayor a cero.")
+
+        strategies = [("codificador propio", render_code128_svg), ("cache", code128_svg)]
+        try:
+            import barcode
+            from barcode.writer import SVGWriter
+        except ImportError:
+            self.stderr.write("python-barcode no esta instalado; se omite la comparacion con SVGWriter.")
+        else:
+
+            def python_barcode_svg(value):
+                stream = BytesIO()
+                barcode.get("code128", value, writer=SVGWriter()).write(stream)
+                return stream.getvalue().decode("utf-8")
+
+            strategies.insert(0, ("python-barcode", python_barcode_svg))
+
+        code128_svg.cache_clear()
+        cache.delete(_cache_key("code128", folio))
+        for label, render in strategies:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                render(folio)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{label}: {elapsed * 1_000_000 / iterations:.1f} us por render ({iterations} renders)")
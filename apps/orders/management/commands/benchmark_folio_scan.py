@@ -0,0 +1,65 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.orders.folios import folio_cache, resolve_folio
+from apps.orders.models import Order
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la busqueda de folios del escaner (iexact, igualdad exacta y cache) sobre ordenes sinteticas. "
+        "Los datos se insertan dentro de una transaccion que se revierte al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=1_000_000, help="Ordenes sinteticas a insertar.")
+        parser.add_argument("--scans", type=int, default=2000, help="Folios escaneados por estrategia.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Ordenes por bulk_create.")
+
+    def handle(self, *args, **options):
+        total = options["orders"]
+        scans = options["scans"]
+        if total < 1 or scans < 1:
+            raise CommandError("--orders y --scans deben ser mayores a cero.")
+
+        try:
+            with transaction.atomic():
+                self._seed(total, options["batch_size"])
+                self._run(total, scans)
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            folio_cache.clear()
+
+    def _seed(self, total, batch_size):
+        started = time.perf_counter()
+        for offset in range(0, total, batch_size):
+            Order.objects.bulk_create(
+                Order(folio=f"BENCH-{number:09d}") for number in range(offset, min(offset + batch_size, total))
+            )
+        self.stdout.write(f"{total} ordenes insertadas en {time.perf_counter() - started:.1f}s")
+
+    def _run(self, total, scans):
+        folios = [f"bench-{random.randrange(total):09d}" for _ in range(scans)]
+        strategies = (
+            ("iexact", lambda folio: Order.objects.filter(folio__iexact=folio).values_list("pk", flat=True).first()),
+            ("exacto", lambda folio: Order.objects.filter(folio=folio.upper()).values_list("pk", flat=True).first()),
+            ("cache frio", resolve_folio),
+            ("cache caliente", resolve_folio),
+        )
+        folio_cache.clear()
+        for label, lookup in strategies:
+            started = time.perf_counter()
+            for folio in folios:
+                if lookup(folio) is None:
+                    raise CommandError(f"Folio no encontrado con la estrategia {label}: {folio}")
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{label}: {elapsed * 1000 / len(folios):.3f} ms por escaneo ({len(folios)} escaneos)")
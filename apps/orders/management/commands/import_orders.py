@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.orders.importers import IMPORT_FORMATS, OrderImporter, write_rejects
+
+
+class Command(BaseCommand):
+    help = "Importa ordenes historicas con sus items y pagos desde CSV o JSONL, por lotes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo CSV o JSONL a importar.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Formato del archivo; por defecto se toma de la extension.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Filas procesadas por lote.")
+        parser.add_argument("--rejects", help="Archivo CSV donde se escriben las filas rechazadas.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"No existe el archivo {path}.")
+
+        fmt = options["format"] or path.suffix.lstrip(".").lower()
+        if fmt not in IMPORT_FORMATS:
+            raise CommandError("No se pudo determinar el formato; usa --format csv|jsonl.")
+
+        importer = OrderImporter(chunk_size=options["chunk_size"])
+        with path.open(newline="", encoding="utf-8-sig") as stream:
+            importer.run(stream, fmt)
+
+        summary = importer.summary()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{summary['orders']} ordenes, {summary['items']} items y {summary['payments']} pagos importados "
+                f"({summary['rows']} filas en {summary['seconds']}s, {summary['rows_per_second']} filas/s)."
+            )
+        )
+
+        if not importer.rejects:
+            return
+
+        if options["rejects"]:
+            with open(options["rejects"], "w", newline="", encoding="utf-8") as stream:
+                write_rejects(importer.rejects, stream)
+            self.stderr.write(f"{summary['rejected']} filas rechazadas, detalle en {options['rejects']}.")
+        else:
+            self.stderr.write(f"{summary['rejected']} filas rechazadas:")
+            for reject in importer.rejects[:50]:
+                self.stderr.write(f"- linea {reject['line']} ({reject['folio'] or 'sin folio'}): {reject['error']}")
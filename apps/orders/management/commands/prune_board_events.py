@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.orders.models import BoardEvent
+
+
+class Command(BaseCommand):
+    help = "Elimina los eventos del tablero de produccion mas antiguos que el periodo indicado."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="Horas de eventos a conservar.")
+
+    def handle(self, *args, **options):
+        if options["hours"] < 1:
+            raise CommandError("--hours debe ser mayor a cero.")
+        cutoff = timezone.now() - timedelta(hours=options["hours"])
+        deleted, _ = BoardEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} eventos del tablero eliminados."))
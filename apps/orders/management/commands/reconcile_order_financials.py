@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.orders.models import Order
+
+CENT = Decimal("0.01")
+
+
+class Command(BaseCommand):
+    help = "Compara los totales incrementales de las ordenes contra un recalculo completo de items y pagos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Recalcula y corrige las ordenes con diferencias.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Ordenes leidas por lote.")
+
+    def handle(self, *args, **options):
+        rows = (
+            Order.objects.with_computed_financials()
+            .order_by("pk")
+            .values(
+                "pk",
+                "folio",
+                "subtotal",
+                "iva_amount",
+                "total",
+                "paid_amount",
+                "balance",
+                "computed_subtotal",
+                "computed_iva_amount",
+                "computed_total",
+                "computed_paid_amount",
+            )
+        )
+
+        checked = 0
+        mismatched = []
+        for row in rows.iterator(chunk_size=options["chunk_size"]):
+            checked += 1
+            expected = {
+                "subtotal": row["computed_subtotal"],
+                "iva_amount": row["computed_iva_amount"],
+                "total": row["computed_total"],
+                "paid_amount": row["computed_paid_amount"],
+                "balance": Decimal(row["computed_total"]) - Decimal(row["computed_paid_amount"]),
+            }
+            diffs = {
+                field: (row[field], value)
+                for field, value in expected.items()
+                if Decimal(row[field]).quantize(CENT) != Decimal(value).quantize(CENT)
+            }
+            if diffs:
+                mismatched.append(row["pk"])
+                detail = ", ".join(f"{field}: {stored} -> {value}" for field, (stored, value) in diffs.items())
+                self.stderr.write(f"- {row['folio']} (id={row['pk']}): {detail}")
+
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS(f"{checked} ordenes revisadas, sin diferencias."))
+            return
+
+        if options["fix"]:
+            Order.objects.filter(pk__in=mismatched).recompute_financials()
+            self.stdout.write(self.style.SUCCESS(f"{len(mismatched)} de {checked} ordenes corregidas."))
+            return
+
+        self.stderr.write(f"{len(mismatched)} de {checked} ordenes con diferencias. Ejecuta con --fix para corregir.")
+        raise SystemExit(1)
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_servicepricehistory_servicepromotion'),
+        ('orders', '0002_order_dry_status_order_ironing_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='discount_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='promotion',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_items', to='catalog.servicepromotion'),
+        ),
+    ]
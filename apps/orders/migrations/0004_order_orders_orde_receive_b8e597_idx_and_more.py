@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_remove_customer_email_alter_customer_phone_and_more'),
+        ('orders', '0003_orderitem_promotion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['received_at'], name='orders_orde_receive_b8e597_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer', 'received_at'], name='orders_orde_custome_fa9583_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at'], name='orders_orde_created_0e92de_idx'),
+        ),
+    ]
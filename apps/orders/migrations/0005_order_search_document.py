@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:43
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Lower, Trim
+
+from apps.common.search import AddPostgresIndex
+
+
+def fill_search_documents(apps, schema_editor):
+    Customer = apps.get_model("customers", "Customer")
+    Order = apps.get_model("orders", "Order")
+    customer_document = Customer.objects.filter(pk=OuterRef("customer_id")).values("search_document")[:1]
+    Order.objects.update(
+        search_document=Trim(Concat(Lower("folio"), Value(" "), Coalesce(Subquery(customer_document), Value(""))))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_orders_orde_receive_b8e597_idx_and_more'),
+        ('customers', '0003_customer_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+        AddPostgresIndex(
+            model_name='order',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_document'], name='orders_search_trgm', opclasses=['gin_trgm_ops']
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Trim, Upper
+
+
+def uppercase_folios(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    pending = Order.objects.exclude(folio=Upper(Trim(F("folio")))).values_list("pk", "folio")
+    for pk, folio in pending.iterator():
+        canonical = folio.strip().upper()
+        # A case-only duplicate keeps its original folio; it stays reachable by id.
+        if Order.objects.filter(folio=canonical).exists():
+            continue
+        Order.objects.filter(pk=pk).update(folio=canonical)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0005_order_search_document"),
+    ]
+
+    operations = [
+        migrations.RunPython(uppercase_folios, migrations.RunPython.noop),
+    ]
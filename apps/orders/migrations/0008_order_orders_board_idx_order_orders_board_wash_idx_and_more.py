@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0003_customer_search_document'),
+        ('orders', '0007_foliocounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ('cancelled', 'delivered')), _negated=True), fields=['promised_at', '-created_at', '-id'], name='orders_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ('cancelled', 'delivered')), _negated=True), fields=['wash_status', 'promised_at', '-created_at', '-id'], name='orders_board_wash_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ('cancelled', 'delivered')), _negated=True), fields=['dry_status', 'promised_at', '-created_at', '-id'], name='orders_board_dry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ('cancelled', 'delivered')), _negated=True), fields=['ironing_status', 'promised_at', '-created_at', '-id'], name='orders_board_ironing_idx'),
+        ),
+    ]
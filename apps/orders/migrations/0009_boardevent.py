@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_order_orders_board_idx_order_orders_board_wash_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('folio', models.CharField(max_length=32)),
+                ('status', models.CharField(choices=[('received', 'Recibida'), ('in_process', 'En proceso'), ('ready', 'Lista'), ('delivered', 'Entregada'), ('cancelled', 'Cancelada')], max_length=20)),
+                ('wash_status', models.CharField(choices=[('pending', 'Pendiente'), ('in_progress', 'En proceso'), ('done', 'Completado'), ('na', 'No aplica')], max_length=20)),
+                ('dry_status', models.CharField(choices=[('pending', 'Pendiente'), ('in_progress', 'En proceso'), ('done', 'Completado'), ('na', 'No aplica')], max_length=20)),
+                ('ironing_status', models.CharField(choices=[('pending', 'Pendiente'), ('in_progress', 'En proceso'), ('done', 'Completado'), ('na', 'No aplica')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='board_events', to='orders.order')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
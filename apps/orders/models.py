@@ -1,17 +1,214 @@
+from contextlib import contextmanager
 from decimal import Decimal
+from threading import local
 
+from django.apps import apps
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import Sum
+from django.db import models, transaction
+from django.db.models import Case, DecimalField, Exists, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from apps.catalog.models import Service
+from apps.catalog.models import Service, ServicePromotion
+from apps.catalog.pricing import effective_price
 from apps.common.models import TimeStampedModel
+from apps.common.search import build_document, document_filter, trigram_index
+from apps.common.tracking import TrackedFieldsMixin
 from apps.customers.models import Customer
 
+from .folios import allocate_folio, folio_cache, normalize_folio
 
-class Order(TimeStampedModel):
+ZERO = Decimal("0.00")
+FINANCIAL_FIELDS = ("subtotal", "iva_amount", "total", "paid_amount", "balance")
+# Order.Status values that leave the production board. Kept as literals so
+# the partial indexes and ``OrderQuerySet.active`` render the same predicate.
+CLOSED_STATUSES = ("cancelled", "delivered")
+ACTIVE_ORDER = ~Q(status__in=CLOSED_STATUSES)
+
+_financials_state = local()
+
+
+def _applied_payments(order_ref):
+    # apps.payments imports this module, so resolve Payment lazily.
+    Payment = apps.get_model("payments", "Payment")
+    return Payment.objects.filter(order=order_ref, status=Payment.Status.APPLIED)
+
+
+def _money_sum(queryset, field):
+    total = queryset.order_by().values("order").annotate(total=Sum(field)).values("total")[:1]
+    return Coalesce(
+        Subquery(total),
+        Value(ZERO),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+class OrderQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(ACTIVE_ORDER)
+
+    def set_area_status(self, field, value):
+        """
+        Sets one area status and re-derives ``status`` in the same UPDATE, the
+        set-based counterpart of ``Order._sync_global_status_from_areas``.
+        """
+        return self.update(**{field: value}, status=derived_order_status(field, value), updated_at=timezone.now())
+
+    def search(self, query):
+        """
+        Orders whose folio or customer (accent-folded name, phone digits)
+        contain every term; ``search_rank`` puts exact folios first.
+        """
+        condition, terms = document_filter(query)
+        if not terms:
+            return self.none()
+        return self.filter(condition).annotate(
+            search_rank=Case(
+                When(folio__iexact=query.strip(), then=Value(0)),
+                When(search_document__startswith=terms[0], then=Value(1)),
+                default=Value(2),
+                output_field=models.IntegerField(),
+            )
+        )
+
+    def with_computed_financials(self):
+        items = OrderItem.objects.filter(order=OuterRef("pk"))
+        payments = _applied_payments(OuterRef("pk"))
+        return self.annotate(
+            computed_subtotal=_money_sum(items, "subtotal"),
+            computed_iva_amount=_money_sum(items, "iva_amount"),
+            computed_total=_money_sum(items, "total"),
+            computed_paid_amount=_money_sum(payments, "amount"),
+        )
+
+    def apply_financial_delta(self, *, subtotal=ZERO, iva_amount=ZERO, total=ZERO, paid_amount=ZERO):
+        return self.update(
+            subtotal=F("subtotal") + subtotal,
+            iva_amount=F("iva_amount") + iva_amount,
+            total=F("total") + total,
+            paid_amount=F("paid_amount") + paid_amount,
+            balance=F("balance") + (total - paid_amount),
+            updated_at=timezone.now(),
+        )
+
+    def recompute_financials(self, board_events=True):
+        """
+        Rewrites totals from items and payments and derives ``ironing_status``
+        from the ironing items. Orders whose ironing status changes get a board
+        event unless ``board_events`` is false (callers recording their own).
+        """
+        from .board_events import BOARD_FIELDS, record_board_events
+
+        items = OrderItem.objects.filter(order=OuterRef("pk"))
+        payments = _applied_payments(OuterRef("pk"))
+        ironing_items = items.filter(service__category=Service.Category.IRONING)
+        gains_ironing = Q(Exists(ironing_items), ironing_status=Order.AreaStatus.NOT_APPLICABLE)
+        loses_ironing = Q(~Exists(ironing_items)) & ~Q(ironing_status=Order.AreaStatus.NOT_APPLICABLE)
+        ironing_changed = list(self.filter(gains_ironing | loses_ironing).values_list("pk", flat=True)) if board_events else []
+
+        updated = self.update(
+            subtotal=_money_sum(items, "subtotal"),
+            iva_amount=_money_sum(items, "iva_amount"),
+            total=_money_sum(items, "total"),
+            paid_amount=_money_sum(payments, "amount"),
+            balance=_money_sum(items, "total") - _money_sum(payments, "amount"),
+            ironing_status=Case(
+                When(gains_ironing, then=Value(Order.AreaStatus.PENDING)),
+                When(~Exists(ironing_items), then=Value(Order.AreaStatus.NOT_APPLICABLE)),
+                default=F("ironing_status"),
+            ),
+            updated_at=timezone.now(),
+        )
+        if ironing_changed:
+            record_board_events(
+                Order.objects.filter(pk__in=ironing_changed).order_by("pk").values("id", "folio", *BOARD_FIELDS)
+            )
+        return updated
+
+
+class _PendingFinancials:
+    def __init__(self):
+        self.orders = {}
+
+    def register(self, order_id, order=None):
+        instances = self.orders.setdefault(order_id, [])
+        if order is not None and all(existing is not order for existing in instances):
+            instances.append(order)
+
+    def flush(self):
+        if not self.orders:
+            return
+        Order.objects.filter(pk__in=self.orders).recompute_financials()
+        rows = Order.objects.filter(pk__in=self.orders).values("pk", "ironing_status", "updated_at", *FINANCIAL_FIELDS)
+        for row in rows:
+            for order in self.orders[row.pop("pk")]:
+                for field, value in row.items():
+                    setattr(order, field, value)
+
+
+def _pending_financials():
+    return getattr(_financials_state, "pending", None)
+
+
+@contextmanager
+def deferred_financials():
+    """
+    Collects the orders touched by item/payment writes inside the block and
+    recomputes their totals once, in bulk, right before the transaction commits.
+    """
+    pending = _pending_financials()
+    if pending is not None:
+        yield pending
+        return
+
+    pending = _PendingFinancials()
+    _financials_state.pending = pending
+    try:
+        with transaction.atomic():
+            yield pending
+            pending.flush()
+    finally:
+        del _financials_state.pending
+
+
+def record_financial_delta(order_id, *, order=None, **deltas):
+    pending = _pending_financials()
+    if pending is not None:
+        pending.register(order_id, order)
+        return
+
+    if not any(deltas.values()):
+        return
+
+    Order.objects.filter(pk=order_id).apply_financial_delta(**deltas)
+    if order is not None:
+        order.subtotal += deltas.get("subtotal", ZERO)
+        order.iva_amount += deltas.get("iva_amount", ZERO)
+        order.total += deltas.get("total", ZERO)
+        order.paid_amount += deltas.get("paid_amount", ZERO)
+        order.balance = order.total - order.paid_amount
+
+
+def resync_financials(order):
+    pending = _pending_financials()
+    if pending is not None:
+        pending.register(order.pk, order)
+        return
+    order.refresh_financials(persist=True)
+
+
+class FolioCounter(models.Model):
+    """Last folio number reserved per branch prefix and local day."""
+
+    scope = models.CharField(max_length=24, unique=True)
+    last_value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.scope}: {self.last_value}"
+
+
+class Order(TrackedFieldsMixin, TimeStampedModel):
     class Status(models.TextChoices):
         RECEIVED = "received", "Recibida"
         IN_PROCESS = "in_process", "En proceso"
@@ -45,21 +242,58 @@ class Order(TimeStampedModel):
     total = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
     paid_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
     balance = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    search_document = models.TextField(blank=True, default="", editable=False)
+
+    tracked_fields = ("status", "folio", "customer", "wash_status", "dry_status", "ironing_status", "received_at")
+    objects = OrderQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["received_at"]),
+            models.Index(fields=["customer", "received_at"]),
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["promised_at", "-created_at", "-id"], condition=ACTIVE_ORDER, name="orders_board_idx"),
+            models.Index(
+                fields=["wash_status", "promised_at", "-created_at", "-id"],
+                condition=ACTIVE_ORDER,
+                name="orders_board_wash_idx",
+            ),
+            models.Index(
+                fields=["dry_status", "promised_at", "-created_at", "-id"],
+                condition=ACTIVE_ORDER,
+                name="orders_board_dry_idx",
+            ),
+            models.Index(
+                fields=["ironing_status", "promised_at", "-created_at", "-id"],
+                condition=ACTIVE_ORDER,
+                name="orders_board_ironing_idx",
+            ),
+            trigram_index("orders_search_trgm"),
+        ]
 
     def __str__(self) -> str:
         return self.folio
 
     def save(self, *args, **kwargs):
         if not self.folio:
-            self.folio = f"ORD-{timezone.now():%Y%m%d%H%M%S%f}"[-32:]
+            self.folio = allocate_folio()
+        self.folio = normalize_folio(self.folio)
+        if kwargs.get("update_fields") is None and (
+            self._state.adding or not self.search_document or {"folio", "customer_id"} & self.changed_fields().keys()
+        ):
+            self.search_document = self.build_search_document()
+        previous_folio = self.changed_fields().get("folio", (None,))[0]
+        if previous_folio:
+            folio_cache.discard(previous_folio)
         self._sync_area_statuses()
         self._sync_global_status_from_areas()
         self._validate_business_rules()
         super().save(*args, **kwargs)
 
+    def build_search_document(self):
+        return build_document(self.folio.lower(), self.customer.search_document if self.customer else "")
+
     def refresh_financials(self, persist: bool = False):
         self._sync_area_statuses()
         self._sync_global_status_from_areas()
@@ -92,14 +326,11 @@ class Order(TimeStampedModel):
             )
 
     def _validate_business_rules(self):
-        if not self.pk:
-            return
-
-        previous = Order.objects.filter(pk=self.pk).only("status", "balance").first()
-        if not previous:
+        if self._state.adding:
             return
 
-        if self.status == self.Status.CANCELLED and previous.status != self.Status.RECEIVED:
+        previous_status = self.changed_fields().get("status", (self.status,))[0]
+        if self.status == self.Status.CANCELLED and previous_status != self.Status.RECEIVED:
             raise ValidationError("Solo se puede cancelar una orden en estado Recibida.")
 
         if self.status == self.Status.DELIVERED and self.balance > Decimal("0.00"):
@@ -134,7 +365,58 @@ class Order(TimeStampedModel):
             self.status = self.Status.RECEIVED
 
 
-class OrderItem(TimeStampedModel):
+class BoardEvent(models.Model):
+    """
+    Production-board state of an order right after it changed. The ``id`` is
+    the change-feed cursor; rows are pruned with ``prune_board_events``.
+    """
+
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="board_events")
+    folio = models.CharField(max_length=32)
+    status = models.CharField(max_length=20, choices=Order.Status.choices)
+    wash_status = models.CharField(max_length=20, choices=Order.AreaStatus.choices)
+    dry_status = models.CharField(max_length=20, choices=Order.AreaStatus.choices)
+    ironing_status = models.CharField(max_length=20, choices=Order.AreaStatus.choices)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.folio} #{self.pk}"
+
+
+def derived_order_status(field, value):
+    """
+    SQL expression for the global status once area ``field`` becomes
+    ``value``; the other areas are read from their columns.
+    """
+    AreaStatus = Order.AreaStatus
+    others = [name for name in ("wash_status", "dry_status", "ironing_status") if name != field]
+    whens = [When(status__in=CLOSED_STATUSES, then=F("status"))]
+
+    if value == AreaStatus.DONE:
+        all_done = Q()
+        for name in others:
+            done = Q(**{name: AreaStatus.DONE})
+            if name == "ironing_status":
+                done |= Q(ironing_status=AreaStatus.NOT_APPLICABLE)
+            all_done &= done
+        whens.append(When(all_done, then=Value(Order.Status.READY)))
+
+    if value == AreaStatus.IN_PROGRESS:
+        default = Order.Status.IN_PROCESS
+    else:
+        any_in_progress = Q()
+        for name in others:
+            any_in_progress |= Q(**{name: AreaStatus.IN_PROGRESS})
+        whens.append(When(any_in_progress, then=Value(Order.Status.IN_PROCESS)))
+        default = Order.Status.RECEIVED
+
+    return Case(*whens, default=Value(default), output_field=models.CharField())
+
+
+class OrderItem(TrackedFieldsMixin, TimeStampedModel):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
     service = models.ForeignKey(Service, on_delete=models.PROTECT, related_name="order_items")
     description = models.CharField(max_length=200, blank=True)
@@ -147,36 +429,109 @@ class OrderItem(TimeStampedModel):
         default=16.00,
         validators=[MinValueValidator(0), MaxValueValidator(100)],
     )
+    promotion = models.ForeignKey(
+        ServicePromotion,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="order_items",
+    )
+    discount_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
 
     subtotal = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
     iva_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
     total = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
 
+    tracked_fields = ("order", "service", "quantity", "subtotal", "iva_amount", "total")
+
     class Meta:
         ordering = ["created_at"]
 
     def __str__(self) -> str:
         return f"{self.order.folio} - {self.service.name}"
 
+    def apply_price(self, unit_price, promotion=None):
+        """
+        Sets the line price; with a promotion the difference against the
+        service list price is kept as the line discount.
+        """
+        self.unit_price = unit_price
+        self.promotion = promotion
+        if promotion is None:
+            self.discount_amount = ZERO
+        else:
+            discount = (Decimal(self.service.unit_price) - Decimal(unit_price)) * Decimal(self.quantity)
+            self.discount_amount = discount.quantize(Decimal("0.01"))
+
+    def compute_totals(self):
+        base = Decimal(self.quantity) * Decimal(self.unit_price)
+        self.subtotal = base.quantize(Decimal("0.01"))
+        self.iva_amount = (self.subtotal * (Decimal(self.iva_rate) / Decimal("100"))).quantize(Decimal("0.01"))
+        self.total = (self.subtotal + self.iva_amount).quantize(Decimal("0.01"))
+
     def save(self, *args, **kwargs):
         if not self.description:
             self.description = self.service.name
         if not self.pricing_mode:
             self.pricing_mode = self.service.pricing_mode
         if not self.unit_price:
-            self.unit_price = self.service.unit_price
+            self.apply_price(*effective_price(self.service))
         if not self.iva_rate:
             self.iva_rate = self.service.default_iva_rate
 
-        base = Decimal(self.quantity) * Decimal(self.unit_price)
-        self.subtotal = base.quantize(Decimal("0.01"))
-        self.iva_amount = (self.subtotal * (Decimal(self.iva_rate) / Decimal("100"))).quantize(Decimal("0.01"))
-        self.total = (self.subtotal + self.iva_amount).quantize(Decimal("0.01"))
+        self.compute_totals()
+        adding = self._state.adding
+        previous = None if adding else self.persisted_values()
 
         super().save(*args, **kwargs)
-        self.order.refresh_financials(persist=True)
+        self._apply_financials(adding, previous)
 
     def delete(self, *args, **kwargs):
+        previous = self.persisted_values()
+        order = self.order
+        result = super().delete(*args, **kwargs)
+        if self.service.category != Service.Category.IRONING:
+            record_financial_delta(
+                order.pk,
+                order=order,
+                subtotal=-previous["subtotal"],
+                iva_amount=-previous["iva_amount"],
+                total=-previous["total"],
+            )
+        else:
+            resync_financials(order)
+        return result
+
+    def _apply_financials(self, adding, previous):
         order = self.order
-        super().delete(*args, **kwargs)
-        order.refresh_financials(persist=True)
+        if adding:
+            needs_area_sync = (
+                self.service.category == Service.Category.IRONING
+                and order.ironing_status == Order.AreaStatus.NOT_APPLICABLE
+            )
+        else:
+            needs_area_sync = previous["service_id"] != self.service_id
+        moved_from = previous["order_id"] if previous and previous["order_id"] != self.order_id else None
+
+        if needs_area_sync:
+            if moved_from is not None:
+                Order.objects.filter(pk=moved_from).recompute_financials()
+            resync_financials(order)
+            return
+
+        if moved_from is not None:
+            record_financial_delta(
+                moved_from,
+                subtotal=-previous["subtotal"],
+                iva_amount=-previous["iva_amount"],
+                total=-previous["total"],
+            )
+            previous = None
+
+        record_financial_delta(
+            self.order_id,
+            order=order,
+            subtotal=self.subtotal - (previous["subtotal"] if previous else ZERO),
+            iva_amount=self.iva_amount - (previous["iva_amount"] if previous else ZERO),
+            total=self.total - (previous["total"] if previous else ZERO),
+        )
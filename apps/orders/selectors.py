@@ -0,0 +1,89 @@
+import base64
+import json
+
+from django.db.models import Count, Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Order
+
+BOARD_PAGE_SIZE = 50
+BOARD_AREAS = {
+    "wash": ("wash_status", "Lavado"),
+    "dry": ("dry_status", "Secado"),
+    "ironing": ("ironing_status", "Planchado"),
+}
+BOARD_STATUSES = [choice for choice in Order.AreaStatus.choices if choice[0] != Order.AreaStatus.NOT_APPLICABLE]
+
+
+def encode_board_cursor(order):
+    promised_at = order.promised_at.isoformat() if order.promised_at else None
+    payload = json.dumps([promised_at, order.created_at.isoformat(), order.pk])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_board_cursor(token):
+    """``(promised_at, created_at, id)`` from a board cursor, or ``None`` if it is not valid."""
+    if not token:
+        return None
+    try:
+        promised_at, created_at, order_id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        created_at = parse_datetime(created_at)
+        promised_at = parse_datetime(promised_at) if promised_at else None
+    except (TypeError, ValueError):
+        return None
+    if created_at is None or not isinstance(order_id, int):
+        return None
+    return promised_at, created_at, order_id
+
+
+def production_board_page(area, status="", cursor=None, page_size=BOARD_PAGE_SIZE):
+    """
+    One page of active orders for ``area`` ordered by promise date (undated
+    last), newest first within a date. Returns ``(orders, next_cursor)``.
+
+    Each page starts from the cursor with an index range on the board's
+    partial indexes, so its cost does not depend on how many orders came
+    before it or on delivered/cancelled history.
+    """
+    status_field = BOARD_AREAS[area][0]
+    base = Order.objects.active().select_related("customer")
+    if status:
+        base = base.filter(**{status_field: status})
+    elif area == "ironing":
+        base = base.exclude(ironing_status=Order.AreaStatus.NOT_APPLICABLE)
+
+    position = decode_board_cursor(cursor)
+    limit = page_size + 1
+    orders = []
+    if position is None or position[0] is not None:
+        dated = base.filter(promised_at__isnull=False)
+        if position is not None:
+            promised_at, created_at, order_id = position
+            dated = dated.filter(promised_at__gte=promised_at).filter(
+                Q(promised_at__gt=promised_at) | Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=order_id)
+            )
+        orders = list(dated.order_by("promised_at", "-created_at", "-id")[:limit])
+
+    if len(orders) < limit:
+        undated = base.filter(promised_at__isnull=True)
+        if position is not None and position[0] is None:
+            _, created_at, order_id = position
+            undated = undated.filter(created_at__lte=created_at).filter(
+                Q(created_at__lt=created_at) | Q(id__lt=order_id)
+            )
+        orders += undated.order_by("-created_at", "-id")[: limit - len(orders)]
+
+    next_cursor = encode_board_cursor(orders[page_size - 1]) if len(orders) > page_size else None
+    return orders[:page_size], next_cursor
+
+
+def production_board_counts():
+    """``{area: {area_status: count}}`` for active orders, in one query."""
+    pairs = [(area, field, value) for area, (field, _) in BOARD_AREAS.items() for value, _ in BOARD_STATUSES]
+    totals = Order.objects.active().aggregate(
+        **{f"{area}_{value}": Count("pk", filter=Q(**{field: value})) for area, field, value in pairs}
+    )
+    counts = {area: {} for area in BOARD_AREAS}
+    for area, _, value in pairs:
+        counts[area][value] = totals[f"{area}_{value}"]
+    return counts
@@ -1,10 +1,33 @@
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 
+from apps.catalog.models import Service
+
 from .models import Order, OrderItem
+from .services import create_order, replace_order_items, resolve_services
+
+
+class PrefetchedServiceField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves the service from the index the parent order serializer loads in a
+    single query, falling back to the regular per-item lookup.
+    """
+
+    def to_internal_value(self, data):
+        index = self.context.get("service_index")
+        if index is not None:
+            try:
+                service = index.get(int(data))
+            except (TypeError, ValueError):
+                service = None
+            if service is not None:
+                return service
+        return super().to_internal_value(data)
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
+    service = PrefetchedServiceField(queryset=Service.objects.all())
     service_name = serializers.CharField(source="service.name", read_only=True)
     service_category = serializers.CharField(source="service.category", read_only=True)
 
@@ -20,13 +43,28 @@ class OrderItemSerializer(serializers.ModelSerializer):
             "quantity",
             "unit_price",
             "iva_rate",
+            "promotion",
+            "discount_amount",
             "subtotal",
             "iva_amount",
             "total",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "service_name", "service_category", "subtotal", "iva_amount", "total", "created_at", "updated_at"]
+        read_only_fields = [
+            "id",
+            "service_name",
+            "service_category",
+            "promotion",
+            "discount_amount",
+            "subtotal",
+            "iva_amount",
+            "total",
+            "created_at",
+            "updated_at",
+        ]
+        # Without a unit price the line takes the service's promotional price.
+        extra_kwargs = {"unit_price": {"required": False}}
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -70,20 +108,23 @@ class OrderSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
-    def _create_item(self, order, item_data):
-        service = item_data["service"]
-        item_data.setdefault("pricing_mode", service.pricing_mode)
-        item_data.setdefault("unit_price", service.unit_price)
-        item_data.setdefault("iva_rate", service.default_iva_rate)
-        return OrderItem.objects.create(order=order, **item_data)
+    def to_internal_value(self, data):
+        items = data.get("items") if hasattr(data, "get") else None
+        if isinstance(items, list):
+            service_ids = set()
+            for item in items:
+                try:
+                    service_ids.add(int(item.get("service")))
+                except (AttributeError, TypeError, ValueError):
+                    continue
+            self.context["service_index"] = resolve_services(service_ids, active_only=False) if service_ids else {}
+        return super().to_internal_value(data)
 
     @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop("items", [])
-        order = Order.objects.create(**validated_data)
-        for item_data in items_data:
-            self._create_item(order, item_data)
-        order.refresh_financials(persist=True)
+        order = create_order(lines=items_data, **validated_data)
+        prefetch_related_objects([order], "items__service")
         return order
 
     @transaction.atomic
@@ -95,11 +136,7 @@ class OrderSerializer(serializers.ModelSerializer):
         instance.save()
 
         if items_data is not None:
-            instance.items.all().delete()
-            for item_data in items_data:
-                self._create_item(instance, item_data)
-
-        instance.refresh_financials(persist=True)
+            replace_order_items(instance, items_data)
         return instance
 
     def validate_items(self, value):
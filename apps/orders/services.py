@@ -0,0 +1,131 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from apps.catalog.models import Service
+from apps.catalog.pricing import get_price_index
+from apps.common.audit import log_bulk_audit_event
+from apps.reports.services import detached_order_items, record_bulk_sales
+
+from .board_events import BOARD_FIELDS, record_board_events
+from .models import ZERO, Order, OrderItem
+
+
+def resolve_services(service_ids, *, active_only=True):
+    queryset = Service.objects.filter(is_active=True) if active_only else Service.objects.all()
+    return queryset.in_bulk({int(service_id) for service_id in service_ids})
+
+
+def build_order_items(order, lines, services=None):
+    """
+    Prices every line in memory. Each line is a dict with ``service`` (instance
+    or id resolved through ``services``), ``quantity`` and optional
+    ``unit_price``, ``iva_rate``, ``pricing_mode`` and ``description``. Lines
+    without a unit price get the best active promotion of their service; all
+    lines are priced from one promotions index, however many there are.
+    """
+    price_index = get_price_index()
+    items = []
+    for idx, line in enumerate(lines, start=1):
+        service = line["service"]
+        if not isinstance(service, Service):
+            service = (services or {}).get(int(service))
+            if service is None:
+                raise ValidationError(f"Item {idx}: servicio invalido.")
+
+        unit_price = line.get("unit_price")
+        iva_rate = line.get("iva_rate")
+        item = OrderItem(
+            order=order,
+            service=service,
+            description=line.get("description") or service.name,
+            pricing_mode=line.get("pricing_mode") or service.pricing_mode,
+            quantity=Decimal(line["quantity"]),
+            iva_rate=service.default_iva_rate if iva_rate is None else iva_rate,
+        )
+        if unit_price is None:
+            item.apply_price(*price_index.price_for(service))
+        else:
+            item.apply_price(unit_price)
+        item.compute_totals()
+        items.append(item)
+    return items
+
+
+def _apply_item_totals(order, items):
+    order.subtotal = sum((item.subtotal for item in items), ZERO)
+    order.iva_amount = sum((item.iva_amount for item in items), ZERO)
+    order.total = sum((item.total for item in items), ZERO)
+    order.balance = order.total - Decimal(order.paid_amount)
+
+    has_ironing = any(item.service.category == Service.Category.IRONING for item in items)
+    if has_ironing and order.ironing_status == Order.AreaStatus.NOT_APPLICABLE:
+        order.ironing_status = Order.AreaStatus.PENDING
+    elif not has_ironing:
+        order.ironing_status = Order.AreaStatus.NOT_APPLICABLE
+
+
+@transaction.atomic
+def create_order(*, lines, **order_fields):
+    """
+    Creates an order and all of its items in a constant number of queries:
+    one lookup for the services, one INSERT for the order with its totals
+    already computed, one bulk INSERT for the items and one upsert for the
+    daily sales rollup.
+    """
+    pending_ids = [line["service"] for line in lines if not isinstance(line["service"], Service)]
+    services = resolve_services(pending_ids) if pending_ids else {}
+
+    order = Order(**order_fields)
+    items = build_order_items(order, lines, services)
+    _apply_item_totals(order, items)
+    order.save()
+    OrderItem.objects.bulk_create(items)
+    record_bulk_sales(items=items)
+    return order
+
+
+@transaction.atomic
+def replace_order_items(order, lines):
+    pending_ids = [line["service"] for line in lines if not isinstance(line["service"], Service)]
+    services = resolve_services(pending_ids) if pending_ids else {}
+
+    items = build_order_items(order, lines, services)
+    with detached_order_items(order):
+        order.items.all().delete()
+    OrderItem.objects.bulk_create(items)
+    record_bulk_sales(items=items)
+    Order.objects.filter(pk=order.pk).recompute_financials()
+    getattr(order, "_prefetched_objects_cache", {}).pop("items", None)
+    order.refresh_from_db(fields=["subtotal", "iva_amount", "total", "paid_amount", "balance", "ironing_status", "updated_at"])
+    return order
+
+
+@transaction.atomic
+def bulk_update_area_status(order_ids, area_field, new_status):
+    """
+    Moves many orders to ``new_status`` in one production area: one locking
+    SELECT, one UPDATE that also derives the global status, one board event
+    INSERT and one audit entry. Orders without ironing are skipped for the ironing area.
+    Returns ``(updated_ids, skipped_ids)``.
+    """
+    order_ids = set(order_ids)
+    rows = dict(Order.objects.select_for_update().filter(pk__in=order_ids).values_list("pk", "ironing_status"))
+    skipped = [pk for pk in order_ids if pk not in rows]
+    updated = list(rows)
+    if area_field == "ironing_status":
+        skipped += [pk for pk, ironing in rows.items() if ironing == Order.AreaStatus.NOT_APPLICABLE]
+        updated = [pk for pk, ironing in rows.items() if ironing != Order.AreaStatus.NOT_APPLICABLE]
+
+    if updated:
+        changed = Order.objects.filter(pk__in=updated)
+        changed.set_area_status(area_field, new_status)
+        record_board_events(changed.order_by("pk").values("id", "folio", *BOARD_FIELDS))
+        log_bulk_audit_event(
+            "order.area_status_bulk_updated",
+            Order,
+            updated,
+            metadata={"field": area_field, "status": new_status},
+        )
+    return updated, skipped
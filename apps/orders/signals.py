@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .board_events import BOARD_FIELDS, record_board_events
+from .folios import folio_cache
+from .models import Order
+
+
+@receiver(post_delete, sender=Order)
+def forget_deleted_folio(sender, instance, **kwargs):
+    folio_cache.discard(instance.folio)
+
+
+@receiver(post_save, sender=Order)
+def record_board_change(sender, instance, created, **kwargs):
+    if created or instance.changed_fields().keys() & set(BOARD_FIELDS):
+        record_board_events([instance])
@@ -0,0 +1,70 @@
+from io import StringIO
+from itertools import groupby
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.orders import barcodes
+from apps.orders.barcodes import code128_svg, code128_widths
+from apps.orders.models import Order
+
+try:
+    import barcode as python_barcode
+except ImportError:  # pragma: no cover
+    python_barcode = None
+
+
+class BarcodeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        cache.clear()
+        code128_svg.cache_clear()
+        self.addCleanup(code128_svg.cache_clear)
+
+    @skipIf(python_barcode is None, "python-barcode no esta instalado.")
+    def test_encoder_matches_python_barcode_modules(self):
+        for value in ("LP261017-0042", "ORD-SRCH-0001", "ABC", "12345678", "ORD-20261017123456789012"):
+            modules = python_barcode.get("code128", value).build()[0]
+            widths = "".join(str(len(list(run))) for _, run in groupby(modules))
+            self.assertEqual(code128_widths(value), widths, value)
+
+    def test_svg_is_cached_in_process_and_shared_cache(self):
+        with mock.patch.object(barcodes, "render_code128_svg", wraps=barcodes.render_code128_svg) as render:
+            svg = code128_svg("LP261017-0042")
+            code128_svg("LP261017-0042")
+            code128_svg.cache_clear()
+            self.assertEqual(code128_svg("LP261017-0042"), svg)
+
+        render.assert_called_once_with("LP261017-0042")
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertIn("LP261017-0042</text>", svg)
+
+    def test_unencodable_folio_renders_without_barcode(self):
+        self.assertEqual(code128_svg("ÑOÑO-1"), "")
+
+    def test_ticket_renders_both_copies_with_one_encoding(self):
+        order = Order.objects.create()
+        user = User.objects.create_user(username="seller_barcode", password="StrongPass123!")
+        user.groups.add(Group.objects.get(name="Vendedora"))
+        self.client.force_login(user)
+
+        with mock.patch.object(barcodes, "render_code128_svg", wraps=barcodes.render_code128_svg) as render:
+            first = self.client.get(f"/desk/orders/{order.pk}/ticket/")
+            second = self.client.get(f"/desk/orders/{order.pk}/ticket/")
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first.content.count(b"<svg"), 2)
+        self.assertEqual(first.content, second.content)
+
+    def test_benchmark_command_reports_each_strategy(self):
+        out = StringIO()
+        call_command("benchmark_barcodes", iterations=5, stdout=out)
+
+        self.assertIn("codificador propio", out.getvalue())
+        self.assertIn("cache", out.getvalue())
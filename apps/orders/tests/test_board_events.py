@@ -0,0 +1,133 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.catalog.models import Service
+from apps.orders.board_events import MAX_WAIT_SECONDS, events_after, latest_event_id, stream_board_events
+from apps.orders.models import BoardEvent, Order
+from apps.orders.services import replace_order_items
+
+
+@override_settings(BOARD_EVENTS_POLL_TIMEOUT=0, BOARD_EVENTS_STREAM_SECONDS=0)
+class BoardEventFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="seller_feed", password="StrongPass123!")
+        self.user.groups.add(Group.objects.get(name="Vendedora"))
+        self.client.force_login(self.user)
+        self.order = Order.objects.create()
+
+    def test_only_board_relevant_saves_are_recorded(self):
+        start = latest_event_id()
+
+        self.order.notes = "Sin suavizante"
+        self.order.save()
+        self.assertEqual(latest_event_id(), start)
+
+        self.order.wash_status = Order.AreaStatus.IN_PROGRESS
+        self.order.save()
+        event = BoardEvent.objects.get(id__gt=start)
+        self.assertEqual((event.wash_status, event.status), (Order.AreaStatus.IN_PROGRESS, Order.Status.IN_PROCESS))
+
+    def test_bulk_ironing_recompute_is_recorded(self):
+        ironing = Service.objects.create(
+            code="EVT-PL",
+            name="Planchado tablero",
+            category=Service.Category.IRONING,
+            pricing_mode=Service.PricingMode.PIEZA,
+            unit_price=Decimal("10.00"),
+        )
+        start = latest_event_id()
+
+        replace_order_items(self.order, [{"service": ironing, "quantity": "3"}])
+        event = BoardEvent.objects.get(id__gt=start)
+        self.assertEqual((event.order_id, event.ironing_status), (self.order.pk, Order.AreaStatus.PENDING))
+
+        start = latest_event_id()
+        replace_order_items(self.order, [])
+        event = BoardEvent.objects.get(id__gt=start)
+        self.assertEqual(event.ironing_status, Order.AreaStatus.NOT_APPLICABLE)
+
+        start = latest_event_id()
+        Order.objects.filter(pk=self.order.pk).recompute_financials()
+        self.assertEqual(latest_event_id(), start)
+
+    def test_long_poll_returns_deltas_after_cursor(self):
+        start = latest_event_id()
+        other = Order.objects.create()
+        self.client.post(
+            "/desk/orders/production/bulk/",
+            {"area": "wash", "new_status": Order.AreaStatus.DONE, "order_ids": [self.order.pk, other.pk]},
+        )
+
+        response = self.client.get("/desk/orders/production/events/", {"after": start})
+
+        payload = response.json()
+        self.assertEqual([event["order_id"] for event in payload["events"]], [other.pk, self.order.pk, other.pk])
+        self.assertEqual(payload["events"][-1]["wash_status"], Order.AreaStatus.DONE)
+        self.assertEqual(payload["last_id"], latest_event_id())
+
+        response = self.client.get("/desk/orders/production/events/", {"after": payload["last_id"]})
+        self.assertEqual(response.json(), {"events": [], "last_id": payload["last_id"]})
+
+    def test_event_stream_resumes_from_last_event_id(self):
+        start = latest_event_id()
+        self.order.dry_status = Order.AreaStatus.IN_PROGRESS
+        self.order.save()
+
+        response = self.client.get(
+            "/desk/orders/production/events/", HTTP_ACCEPT="text/event-stream", HTTP_LAST_EVENT_ID=str(start)
+        )
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join(response.streaming_content).decode()
+        self.assertIn(f"id: {latest_event_id()}\nevent: order\n", body)
+        self.assertIn('"dry_status": "in_progress"', body)
+
+    def test_feed_waits_at_a_recent_gap(self):
+        start = latest_event_id()
+        for status in (Order.AreaStatus.IN_PROGRESS, Order.AreaStatus.DONE, Order.AreaStatus.IN_PROGRESS):
+            self.order.wash_status = status
+            self.order.save()
+        first, in_flight, last = BoardEvent.objects.filter(id__gt=start).order_by("id")
+        # Stands in for an event whose transaction has not committed yet.
+        in_flight.delete()
+
+        self.assertEqual([event.id for event in events_after(start)], [first.id])
+        self.assertEqual(latest_event_id(), first.id)
+
+        BoardEvent.objects.filter(pk=last.pk).update(created_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual([event.id for event in events_after(first.id)], [last.id])
+        self.assertEqual(latest_event_id(), last.id)
+
+    @override_settings(BOARD_EVENTS_POLL_TIMEOUT=600)
+    def test_long_poll_wait_is_bounded(self):
+        with patch("apps.orders.board_events.events_after", return_value=[]), patch(
+            "apps.orders.board_events.time"
+        ) as clock:
+            clock.monotonic.side_effect = [0.0, 0.0, 0.0, MAX_WAIT_SECONDS, MAX_WAIT_SECONDS]
+            response = self.client.get("/desk/orders/production/events/", {"after": 0})
+
+        self.assertEqual(response.json(), {"events": [], "last_id": 0})
+        self.assertEqual(clock.sleep.call_count, 1)
+
+    def test_idle_stream_sends_heartbeat(self):
+        chunks = list(stream_board_events(latest_event_id(), duration=0))
+
+        self.assertEqual(chunks, ["retry: 2000\n\n", ": ping\n\n"])
+
+    def test_prune_command_drops_old_events(self):
+        BoardEvent.objects.update(created_at="2020-01-01T00:00:00Z")
+
+        call_command("prune_board_events", hours=1, stdout=StringIO())
+
+        self.assertFalse(BoardEvent.objects.exists())
@@ -0,0 +1,117 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.catalog.models import Service
+from apps.customers.models import Customer
+from apps.orders.models import Order, OrderItem, deferred_financials
+from apps.payments.models import Payment
+
+
+class IncrementalFinancialsTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(first_name="Rosa", last_name="Delta", phone="5520001000")
+        self.service = Service.objects.create(
+            code="FIN-KG",
+            name="Lavado financiero",
+            category=Service.Category.WASH,
+            pricing_mode=Service.PricingMode.KILO,
+            unit_price=Decimal("50.00"),
+            default_iva_rate=Decimal("16.00"),
+        )
+        self.ironing = Service.objects.create(
+            code="FIN-PL",
+            name="Planchado financiero",
+            category=Service.Category.IRONING,
+            pricing_mode=Service.PricingMode.PIEZA,
+            unit_price=Decimal("10.00"),
+            default_iva_rate=Decimal("16.00"),
+        )
+        self.order = Order.objects.create(customer=self.customer)
+
+    def _add_item(self, quantity="2.00", service=None):
+        service = service or self.service
+        return OrderItem.objects.create(
+            order=self.order,
+            service=service,
+            pricing_mode=service.pricing_mode,
+            quantity=Decimal(quantity),
+            unit_price=service.unit_price,
+            iva_rate=service.default_iva_rate,
+        )
+
+    def test_item_create_applies_single_delta_update(self):
+        # INSERT item, UPDATE order totals, upsert of the daily sales rollup.
+        with self.assertNumQueries(3):
+            self._add_item()
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.subtotal, Decimal("100.00"))
+        self.assertEqual(self.order.iva_amount, Decimal("16.00"))
+        self.assertEqual(self.order.total, Decimal("116.00"))
+        self.assertEqual(self.order.balance, Decimal("116.00"))
+
+    def test_item_update_and_delete_apply_signed_deltas(self):
+        item = self._add_item()
+        item = OrderItem.objects.get(pk=item.pk)
+        item.quantity = Decimal("3.00")
+        item.save()
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal("174.00"))
+
+        item.delete()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal("0.00"))
+        self.assertEqual(self.order.balance, Decimal("0.00"))
+
+    def test_payment_void_and_delete_adjust_paid_amount(self):
+        self._add_item()
+        payment = Payment.objects.create(order=self.order, amount=Decimal("16.00"), method=Payment.Method.CASH)
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.paid_amount, Decimal("16.00"))
+        self.assertEqual(self.order.balance, Decimal("100.00"))
+
+        payment.status = Payment.Status.VOID
+        payment.save(update_fields=["status", "updated_at"])
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.paid_amount, Decimal("0.00"))
+        self.assertEqual(self.order.balance, Decimal("116.00"))
+
+        payment.delete()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.paid_amount, Decimal("0.00"))
+
+    def test_ironing_item_still_syncs_area_status(self):
+        self._add_item(quantity="1.00", service=self.ironing)
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.ironing_status, Order.AreaStatus.PENDING)
+        self.assertEqual(self.order.total, Decimal("11.60"))
+
+    def test_deferred_mode_recomputes_once(self):
+        with deferred_financials():
+            for _ in range(10):
+                self._add_item(quantity="1.00")
+            self._add_item(quantity="1.00", service=self.ironing)
+
+        self.assertEqual(self.order.total, Decimal("591.60"))
+        self.assertEqual(self.order.ironing_status, Order.AreaStatus.PENDING)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal("591.60"))
+        self.assertEqual(self.order.balance, Decimal("591.60"))
+
+    def test_reconcile_command_detects_and_fixes_drift(self):
+        self._add_item()
+        Order.objects.filter(pk=self.order.pk).update(total=Decimal("1.00"), balance=Decimal("1.00"))
+
+        with self.assertRaises(SystemExit):
+            call_command("reconcile_order_financials", stdout=StringIO(), stderr=StringIO())
+
+        call_command("reconcile_order_financials", "--fix", stdout=StringIO(), stderr=StringIO())
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal("116.00"))
+        self.assertEqual(self.order.balance, Decimal("116.00"))
@@ -0,0 +1,137 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.orders.folios import FolioAllocator, get_folio_allocator
+from apps.orders.models import FolioCounter, Order
+
+
+@override_settings(FOLIO_PREFIX="lp")
+class FolioAllocationTests(TestCase):
+    def setUp(self):
+        get_folio_allocator().reset()
+        # An own connection would commit outside the test's transaction.
+        own_connection = patch.object(get_folio_allocator(), "own_connection", False)
+        own_connection.start()
+        self.addCleanup(own_connection.stop)
+        self.scope = f"LP{timezone.localdate():%y%m%d}"
+
+    def test_orders_get_compact_daily_sequence_folios(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = Order.objects.create()
+        second = Order.objects.create()
+
+        self.assertEqual(first.folio, f"{self.scope}-0001")
+        self.assertEqual(second.folio, f"{self.scope}-0002")
+
+    def test_rolled_back_reservation_is_not_handed_out(self):
+        allocator = FolioAllocator(block_size=5, own_connection=False)
+        try:
+            with transaction.atomic():
+                self.assertEqual(allocator.allocate("TEST"), 1)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        # The counter rolled back with the block, so it is reserved again.
+        self.assertEqual(allocator.allocate("TEST"), 1)
+        self.assertEqual(FolioCounter.objects.get(scope="TEST").last_value, 5)
+
+    def test_rolled_back_savepoint_drops_only_its_block(self):
+        allocator = FolioAllocator(block_size=5, own_connection=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.assertEqual(allocator.allocate("TEST"), 1)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.assertEqual(allocator.allocate("TEST"), 1)
+
+        self.assertEqual([allocator.allocate("TEST") for _ in range(4)], [2, 3, 4, 5])
+
+    def test_committed_block_is_shared_with_later_transactions(self):
+        allocator = FolioAllocator(block_size=5, own_connection=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(allocator.allocate("TEST"), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(allocator.allocate("TEST"), 2)
+
+
+class SerializedReservationAllocator(FolioAllocator):
+    """SQLite's shared-cache test database rejects concurrent writers."""
+
+    reserve_lock = Lock()
+
+    def _reserve(self, scope):
+        with self.reserve_lock:
+            return super()._reserve(scope)
+
+
+class FolioAllocationConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        get_folio_allocator().reset()
+        self.addCleanup(get_folio_allocator().reset)
+
+    def _run_threads(self, work, threads=16):
+        def run(_):
+            try:
+                return work()
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return [value for batch in pool.map(run, range(threads)) for value in batch]
+
+    def test_counter_row_is_touched_once_per_block(self):
+        allocator = FolioAllocator(block_size=5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            numbers = [allocator.allocate("TEST") for _ in range(7)]
+
+        self.assertEqual(numbers, [1, 2, 3, 4, 5, 6, 7])
+        counter_queries = [query for query in ctx.captured_queries if "orders_foliocounter" in query["sql"]]
+        self.assertEqual(len([query for query in counter_queries if query["sql"].startswith("UPDATE")]), 2)
+        self.assertEqual(FolioCounter.objects.get(scope="TEST").last_value, 10)
+
+    def test_many_threads_share_blocks_without_duplicates(self):
+        allocator = SerializedReservationAllocator(block_size=7)
+
+        numbers = self._run_threads(lambda: [allocator.allocate("STRESS") for _ in range(50)])
+
+        self.assertEqual(len(set(numbers)), 800)
+        self.assertLessEqual(max(numbers), FolioCounter.objects.get(scope="STRESS").last_value)
+
+    def test_own_connection_reserves_outside_the_callers_transaction(self):
+        allocator = FolioAllocator(block_size=5, own_connection=True)
+        self.addCleanup(allocator.reset)
+        try:
+            with transaction.atomic():
+                numbers = [allocator.allocate("OWN") for _ in range(3)]
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        # One block for the whole transaction, committed on its own: the
+        # rolled back numbers are gaps and the rest stays shared.
+        self.assertEqual(numbers, [1, 2, 3])
+        self.assertEqual(FolioCounter.objects.get(scope="OWN").last_value, 5)
+        self.assertEqual(allocator.allocate("OWN"), 4)
+
+    @skipUnless(connection.vendor == "postgresql", "SQLite serializes writers, so orders cannot be created concurrently.")
+    @override_settings(FOLIO_BLOCK_SIZE=4)
+    def test_concurrent_order_creation_never_collides(self):
+        def create_orders():
+            return [Order.objects.create().folio for _ in range(10)]
+
+        folios = self._run_threads(create_orders, threads=8)
+
+        self.assertEqual(len(set(folios)), 80)
+        self.assertEqual(Order.objects.count(), 80)
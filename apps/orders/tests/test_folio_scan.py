@@ -0,0 +1,67 @@
+from io import StringIO
+
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.customers.models import Customer
+from apps.orders.folios import folio_cache, resolve_folio
+from apps.orders.models import Order
+
+
+class FolioScanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        folio_cache.clear()
+        self.addCleanup(folio_cache.clear)
+        self.order = Order.objects.create(
+            customer=Customer.objects.create(first_name="Rita", phone="5520007000"), folio=" ord-scan-0001 "
+        )
+        self.user = User.objects.create_user(username="seller_scan", password="StrongPass123!")
+        self.user.groups.add(Group.objects.get(name="Vendedora"))
+        self.client.force_login(self.user)
+
+    def _order_queries(self, ctx):
+        return [query["sql"] for query in ctx.captured_queries if '"orders_order"' in query["sql"]]
+
+    def test_folios_are_stored_in_canonical_form(self):
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.folio, "ORD-SCAN-0001")
+
+    def test_scan_uses_exact_lookup_and_caches_the_order_id(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/desk/orders/scan/", {"q": "ord-scan-0001"})
+
+        self.assertRedirects(response, f"/desk/orders/{self.order.pk}/quick/", fetch_redirect_response=False)
+        (sql,) = self._order_queries(ctx)
+        self.assertNotIn("UPPER(", sql.upper())
+        self.assertNotIn(" LIKE ", sql.upper())
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/desk/orders/scan/", {"q": "ORD-SCAN-0001"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._order_queries(ctx), [])
+
+    def test_renamed_and_deleted_orders_leave_the_cache(self):
+        self.assertEqual(resolve_folio("ORD-SCAN-0001"), self.order.pk)
+
+        self.order.folio = "ORD-SCAN-0002"
+        self.order.save()
+        self.assertIsNone(resolve_folio("ORD-SCAN-0001"))
+        self.assertEqual(resolve_folio("ord-scan-0002"), self.order.pk)
+
+        Order.objects.filter(pk=self.order.pk).delete()
+        self.assertIsNone(resolve_folio("ORD-SCAN-0002"))
+
+    def test_benchmark_command_rolls_back_its_orders(self):
+        out = StringIO()
+        call_command("benchmark_folio_scan", orders=50, scans=20, stdout=out)
+
+        self.assertIn("cache caliente", out.getvalue())
+        self.assertFalse(Order.objects.filter(folio__startswith="BENCH-").exists())
@@ -0,0 +1,125 @@
+import csv
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.catalog.models import Service
+from apps.customers.models import Customer
+from apps.orders.importers import OrderImporter
+from apps.orders.models import BoardEvent, Order
+from apps.payments.models import Payment
+
+CSV_INPUT = """folio,customer_phone,received_at,status,service_code,quantity,unit_price,payment_amount,payment_method
+HIST-001,5520003000,2025-01-10 09:30,delivered,IMP-KG,2,,,
+HIST-001,5520003000,,,IMP-PL,3,,,
+HIST-001,5520003000,,,,,,150.80,card
+HIST-002,5520003000,2025-01-11,,IMP-KG,1,40.00,20,cash
+HIST-003,5599999999,2025-01-12,,IMP-KG,1,,,
+HIST-004,,2025-01-12,,IMP-KG,1,,10,bitcoin
+HIST-005,,2025-01-13,,NOPE,1,,,
+"""
+
+
+class ImportOrdersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        cache.clear()
+        Customer.objects.create(first_name="Ana", last_name="Historica", phone="5520003000")
+        Service.objects.create(
+            code="IMP-KG",
+            name="Lavado historico",
+            category=Service.Category.WASH,
+            pricing_mode=Service.PricingMode.KILO,
+            unit_price=Decimal("50.00"),
+            default_iva_rate=Decimal("16.00"),
+        )
+        Service.objects.create(
+            code="IMP-PL",
+            name="Planchado historico",
+            category=Service.Category.IRONING,
+            pricing_mode=Service.PricingMode.PIEZA,
+            unit_price=Decimal("10.00"),
+            default_iva_rate=Decimal("16.00"),
+        )
+
+    def test_csv_import_groups_rows_by_folio_and_rejects_invalid_rows(self):
+        importer = OrderImporter(chunk_size=2).run(StringIO(CSV_INPUT), "csv")
+
+        self.assertEqual(importer.orders, 2)
+        self.assertEqual(importer.items, 3)
+        self.assertEqual(importer.payments, 2)
+        self.assertEqual(sorted(reject["folio"] for reject in importer.rejects), ["HIST-003", "HIST-004", "HIST-005"])
+
+        first = Order.objects.get(folio="HIST-001")
+        self.assertEqual(first.status, Order.Status.DELIVERED)
+        self.assertEqual(first.total, Decimal("150.80"))
+        self.assertEqual(first.balance, Decimal("0.00"))
+        self.assertEqual(first.ironing_status, Order.AreaStatus.DONE)
+        self.assertEqual(first.payments.get().method, Payment.Method.CARD)
+
+        second = Order.objects.get(folio="HIST-002")
+        self.assertEqual(second.total, Decimal("46.40"))
+        self.assertEqual(second.balance, Decimal("26.40"))
+        self.assertEqual(second.ironing_status, Order.AreaStatus.NOT_APPLICABLE)
+        self.assertEqual(
+            dict(BoardEvent.objects.values_list("folio", "ironing_status")),
+            {"HIST-001": Order.AreaStatus.DONE, "HIST-002": Order.AreaStatus.NOT_APPLICABLE},
+        )
+
+        rerun = OrderImporter().run(StringIO(CSV_INPUT), "csv")
+        self.assertEqual(rerun.orders, 0)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_command_reads_jsonl_and_writes_rejects_file(self):
+        rows = [
+            {"folio": "JSON-1", "customer_phone": "5520003000", "service_code": "IMP-KG", "quantity": 1},
+            {"folio": "JSON-1", "payment_amount": "58.00", "payment_method": "transfer"},
+            {"folio": "JSON-2", "service_code": "IMP-KG", "quantity": 0},
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "orders.jsonl")
+            rejects_path = os.path.join(tmpdir, "rejects.csv")
+            with open(source, "w", encoding="utf-8") as handle:
+                handle.write("\n".join(json.dumps(row) for row in rows) + "\nnot-json\n")
+
+            stdout = StringIO()
+            call_command("import_orders", source, "--rejects", rejects_path, stdout=stdout, stderr=StringIO())
+
+            with open(rejects_path, newline="", encoding="utf-8") as handle:
+                rejects = list(csv.DictReader(handle))
+
+        self.assertIn("filas/s", stdout.getvalue())
+        self.assertEqual([reject["line"] for reject in rejects], ["3", "4"])
+        order = Order.objects.get(folio="JSON-1")
+        self.assertEqual(order.balance, Decimal("0.00"))
+
+    def test_endpoint_requires_manager_role(self):
+        seller = User.objects.create_user(username="seller_import", password="StrongPass123!")
+        seller.groups.add(Group.objects.get(name="Vendedora"))
+        manager = User.objects.create_user(username="manager_import", password="StrongPass123!")
+        manager.groups.add(Group.objects.get(name="Encargada"))
+
+        def upload():
+            return SimpleUploadedFile("orders.csv", CSV_INPUT.encode("utf-8"), content_type="text/csv")
+
+        self.client.force_login(seller)
+        response = self.client.post("/api/orders/import/", {"file": upload()})
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(manager)
+        response = self.client.post("/api/orders/import/", {"file": upload()})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["orders"], 2)
+        self.assertEqual(len(response.json()["rejects"]), 3)
+        self.assertEqual(Payment.objects.filter(captured_by=manager).count(), 2)
@@ -0,0 +1,120 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.catalog.models import Service, ServicePromotion
+from apps.catalog.pricing import get_price_index
+from apps.customers.models import Customer
+from apps.orders.folios import allocate_folio
+from apps.orders.models import Order
+from apps.orders.services import create_order
+
+
+class OrderIntakeQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        cache.clear()
+        self.customer = Customer.objects.create(first_name="Lucia", last_name="Lote", phone="5520002000")
+        self.services = [
+            Service.objects.create(
+                code=f"INT-{idx:02d}",
+                name=f"Servicio lote {idx}",
+                category=Service.Category.IRONING if idx == 0 else Service.Category.WASH,
+                pricing_mode=Service.PricingMode.PIEZA,
+                unit_price=Decimal("10.00"),
+                default_iva_rate=Decimal("16.00"),
+            )
+            for idx in range(5)
+        ]
+        self.user = User.objects.create_user(username="seller_intake", password="StrongPass123!")
+        self.user.groups.add(Group.objects.get(name="Vendedora"))
+        get_price_index()
+        allocate_folio()
+
+    def _lines(self, count):
+        return [{"service": self.services[idx % len(self.services)].pk, "quantity": "1.00"} for idx in range(count)]
+
+    def _count_queries(self, func):
+        with CaptureQueriesContext(connection) as ctx:
+            func()
+        return len(ctx.captured_queries)
+
+    def test_service_query_count_does_not_grow_with_items(self):
+        single = self._count_queries(lambda: create_order(customer=self.customer, lines=self._lines(1)))
+        bulk = self._count_queries(lambda: create_order(customer=self.customer, lines=self._lines(50)))
+
+        self.assertEqual(single, bulk)
+        order = Order.objects.latest("id")
+        self.assertEqual(order.items.count(), 50)
+        self.assertEqual(order.total, Decimal("580.00"))
+        self.assertEqual(order.balance, Decimal("580.00"))
+        self.assertEqual(order.ironing_status, Order.AreaStatus.PENDING)
+
+    def test_api_query_count_does_not_grow_with_items(self):
+        self.client.force_login(self.user)
+
+        def post(count):
+            response = self.client.post(
+                "/api/orders/",
+                {
+                    "customer": self.customer.pk,
+                    "items": [
+                        dict(line, pricing_mode=Service.PricingMode.PIEZA, unit_price="10.00")
+                        for line in self._lines(count)
+                    ],
+                },
+                content_type="application/json",
+            )
+            self.assertEqual(response.status_code, 201, response.content)
+
+        single = self._count_queries(lambda: post(1))
+        bulk = self._count_queries(lambda: post(50))
+
+        self.assertEqual(single, bulk)
+        self.assertEqual(Order.objects.latest("id").total, Decimal("580.00"))
+
+    def test_api_lines_without_price_record_best_promotion_with_one_lookup(self):
+        now = timezone.now()
+        for service in self.services[:3]:
+            for value in ("10.00", "20.00"):
+                ServicePromotion.objects.create(
+                    service=service,
+                    name=f"Promo {value}",
+                    discount_value=Decimal(value),
+                    starts_at=now - timedelta(hours=1),
+                    ends_at=now + timedelta(hours=1),
+                )
+        self.client.force_login(self.user)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                "/api/orders/",
+                {
+                    "customer": self.customer.pk,
+                    "items": [dict(line, pricing_mode=Service.PricingMode.PIEZA) for line in self._lines(20)],
+                },
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 201, response.content)
+        promotion_queries = [query for query in ctx.captured_queries if "catalog_servicepromotion" in query["sql"]]
+        self.assertEqual(len(promotion_queries), 1)
+        lines = {line["service"]: line for line in response.json()["items"]}
+        promoted = lines[self.services[0].pk]
+        # 10.00 -20% -10% stacked, against the 10.00 list price.
+        self.assertEqual(promoted["unit_price"], "7.20")
+        self.assertEqual(promoted["discount_amount"], "2.80")
+        self.assertEqual(ServicePromotion.objects.get(pk=promoted["promotion"]).name, "Promo 10.00")
+        self.assertIsNone(lines[self.services[4].pk]["promotion"])
+        self.assertEqual(lines[self.services[4].pk]["discount_amount"], "0.00")
@@ -0,0 +1,168 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.orders.models import Order
+from apps.orders.selectors import production_board_counts, production_board_page
+
+
+class ProductionBoardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+        now = timezone.now()
+        cls.dated = [Order.objects.create(promised_at=now + timedelta(hours=index // 2)) for index in range(5)]
+        cls.undated = [Order.objects.create() for _ in range(3)]
+        Order.objects.create(promised_at=now, status=Order.Status.DELIVERED)
+        Order.objects.filter(pk=cls.dated[0].pk).update(wash_status=Order.AreaStatus.DONE)
+
+    def _walk(self, area, status="", page_size=2):
+        seen, cursor = [], None
+        while True:
+            page, cursor = production_board_page(area, status, cursor, page_size=page_size)
+            seen.extend(order.pk for order in page)
+            if cursor is None:
+                return seen
+
+    def test_pages_follow_promise_order_with_undated_orders_last(self):
+        expected = [
+            *Order.objects.active()
+            .filter(promised_at__isnull=False)
+            .order_by("promised_at", "-created_at", "-id")
+            .values_list("pk", flat=True),
+            *reversed([order.pk for order in self.undated]),
+        ]
+
+        self.assertEqual(self._walk("wash"), expected)
+        self.assertEqual(self._walk("wash", page_size=3), expected)
+
+    def test_status_filter_and_counts_cover_active_orders_only(self):
+        pending = self._walk("wash", Order.AreaStatus.PENDING)
+
+        self.assertEqual(len(pending), 7)
+        self.assertNotIn(self.dated[0].pk, pending)
+        counts = production_board_counts()
+        self.assertEqual(counts["wash"], {"pending": 7, "in_progress": 0, "done": 1})
+        self.assertEqual(sum(counts["ironing"].values()), 0)
+
+    def test_later_pages_seek_from_the_cursor(self):
+        _, cursor = production_board_page("wash", page_size=2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            page, _ = production_board_page("wash", cursor=cursor, page_size=2)
+
+        self.assertEqual(len(page), 2)
+        (sql,) = [query["sql"] for query in ctx.captured_queries]
+        self.assertIn('"orders_order"."promised_at" >=', sql)
+        self.assertIn("LIMIT 3", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    @skipUnless(connection.vendor == "postgresql", "SQLite does not match partial indexes against bound parameters.")
+    def test_filtered_page_uses_partial_area_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        queryset = (
+            Order.objects.active()
+            .filter(wash_status=Order.AreaStatus.PENDING, promised_at__isnull=False)
+            .order_by("promised_at", "-created_at", "-id")[:51]
+        )
+
+        self.assertIn("orders_board_wash_idx", queryset.explain())
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        first, _ = production_board_page("wash", page_size=2)
+
+        page, _ = production_board_page("wash", cursor="no-es-un-cursor", page_size=2)
+
+        self.assertEqual(page, first)
+
+    def test_board_view_shows_counts_and_next_page_link(self):
+        user = User.objects.create_user(username="seller_board", password="StrongPass123!")
+        user.groups.add(Group.objects.get(name="Vendedora"))
+        self.client.force_login(user)
+
+        response = self.client.get("/desk/orders/production/", {"area": "wash"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Lavado (8)")
+        self.assertContains(response, "Completado (1)")
+        self.assertIsNone(response.context["next_cursor"])
+        self.assertEqual(len(response.context["orders"]), 8)
+
+
+class BulkAreaUpdateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="seller_bulk", password="StrongPass123!")
+        self.user.groups.add(Group.objects.get(name="Vendedora"))
+        self.client.force_login(self.user)
+
+    def test_derived_status_matches_single_order_rules(self):
+        AreaStatus = Order.AreaStatus
+        states = [AreaStatus.PENDING, AreaStatus.IN_PROGRESS, AreaStatus.DONE]
+        orders = []
+        for wash in states:
+            for dry in states:
+                for ironing in [*states, AreaStatus.NOT_APPLICABLE]:
+                    orders.append(
+                        Order(folio=f"BULK-{len(orders)}", wash_status=wash, dry_status=dry, ironing_status=ironing)
+                    )
+        orders.append(Order(folio="BULK-DELIVERED", status=Order.Status.DELIVERED))
+        Order.objects.bulk_create(orders)
+
+        for field in ("wash_status", "dry_status", "ironing_status"):
+            for value in states:
+                Order.objects.all().set_area_status(field, value)
+                for order in Order.objects.all():
+                    expected = Order(
+                        status=order.status if order.status == Order.Status.DELIVERED else Order.Status.RECEIVED,
+                        wash_status=order.wash_status,
+                        dry_status=order.dry_status,
+                        ironing_status=order.ironing_status,
+                    )
+                    expected._sync_global_status_from_areas()
+                    self.assertEqual(order.status, expected.status, (field, value, order.wash_status, order.dry_status))
+
+    def _post(self, ids, **data):
+        payload = {"area": "dry", "new_status": Order.AreaStatus.IN_PROGRESS, "order_ids": ids, **data}
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post("/desk/orders/production/bulk/", payload)
+        self.assertEqual(response.status_code, 302)
+        return len(ctx.captured_queries)
+
+    def test_batch_costs_the_same_for_two_or_forty_orders(self):
+        orders = [Order.objects.create() for _ in range(42)]
+        self._post([orders[0].pk, orders[1].pk])
+
+        small = self._post([orders[0].pk, orders[1].pk])
+        large = self._post([order.pk for order in orders[2:]])
+
+        self.assertEqual(small, large)
+        self.assertEqual(Order.objects.filter(status=Order.Status.IN_PROCESS).count(), 42)
+
+    def test_batch_writes_one_audit_entry_and_skips_orders_without_ironing(self):
+        from apps.common.models import AuditLog
+
+        ironing = Order.objects.create()
+        Order.objects.filter(pk=ironing.pk).update(ironing_status=Order.AreaStatus.PENDING)
+        plain = Order.objects.create()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post([ironing.pk, plain.pk], area="ironing", new_status=Order.AreaStatus.DONE)
+
+        ironing.refresh_from_db()
+        plain.refresh_from_db()
+        self.assertEqual(ironing.ironing_status, Order.AreaStatus.DONE)
+        self.assertEqual(plain.ironing_status, Order.AreaStatus.NOT_APPLICABLE)
+        entry = AuditLog.objects.get(action="order.area_status_bulk_updated")
+        self.assertEqual(entry.metadata["ids"], [ironing.pk])
+        self.assertEqual(entry.actor, self.user)
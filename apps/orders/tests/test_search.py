@@ -0,0 +1,56 @@
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.customers.models import Customer
+from apps.orders.models import Order
+
+
+class SearchDocumentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        self.jose = Customer.objects.create(first_name="José", last_name="Núñez", phone="55 2000-8000")
+        self.maria = Customer.objects.create(first_name="María", last_name="Joselyn", phone="5520009000")
+        self.jose_order = Order.objects.create(customer=self.jose, folio="ORD-SRCH-0001")
+        self.maria_order = Order.objects.create(customer=self.maria, folio="ORD-SRCH-0002")
+
+    def test_documents_fold_accents_and_keep_phone_digits(self):
+        self.assertEqual(self.jose.search_document, "jose nunez 5520008000")
+        self.assertEqual(self.jose_order.search_document, "ord-srch-0001 jose nunez 5520008000")
+
+    def test_search_matches_folded_names_phones_and_folios(self):
+        self.assertEqual(list(Order.objects.search("NUNEZ")), [self.jose_order])
+        self.assertEqual(list(Order.objects.search("jose nuñez")), [self.jose_order])
+        self.assertEqual(list(Order.objects.search("(55) 2000 9000")), [self.maria_order])
+        self.assertEqual(list(Customer.objects.search("552000-8000")), [self.jose])
+        self.assertFalse(Order.objects.search("   ").exists())
+
+    def test_exact_folio_and_prefix_matches_rank_first(self):
+        ranked = Order.objects.search("jose").order_by("search_rank", "folio")
+        self.assertEqual([order.folio for order in ranked], ["ORD-SRCH-0001", "ORD-SRCH-0002"])
+
+        ranked = Order.objects.search("ord-srch-0002").order_by("search_rank")
+        self.assertEqual(ranked.first(), self.maria_order)
+
+    def test_customer_changes_refresh_order_documents(self):
+        self.jose.last_name = "Ibáñez"
+        self.jose.save()
+
+        self.assertEqual(list(Order.objects.search("ibanez")), [self.jose_order])
+        self.assertFalse(Order.objects.search("nunez").exists())
+
+    def test_api_and_desk_search_use_documents(self):
+        user = User.objects.create_user(username="seller_search", password="StrongPass123!")
+        user.groups.add(Group.objects.get(name="Vendedora"))
+        self.client.force_login(user)
+
+        orders = self.client.get("/api/orders/", {"search": "Joselyn"}).json()
+        self.assertEqual([row["folio"] for row in orders], ["ORD-SRCH-0002"])
+        customers = self.client.get("/api/customers/", {"search": "jose"}).json()
+        self.assertEqual([row["id"] for row in customers], [self.jose.pk, self.maria.pk])
+
+        response = self.client.get("/desk/orders/search/", {"q": "nunez"})
+        self.assertEqual(list(response.context["orders"]), [self.jose_order])
@@ -1,20 +1,59 @@
-from rest_framework import filters, viewsets
+import io
 
-from apps.accounts.api_permissions import StrictDjangoModelPermissions
+from rest_framework import filters, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from apps.accounts.api_permissions import IsManagerOrAdmin, StrictDjangoModelPermissions
+from apps.common.search import DocumentSearchFilter
+
+from .importers import IMPORT_FORMATS, OrderImporter
 from .models import Order, OrderItem
 from .serializers import OrderItemSerializer, OrderSerializer
 
 
 class OrderViewSet(viewsets.ModelViewSet):
-    queryset = Order.objects.select_related("customer").prefetch_related("items", "payments")
+    queryset = Order.objects.select_related("customer").prefetch_related("items__service", "payments")
     serializer_class = OrderSerializer
     permission_classes = [StrictDjangoModelPermissions]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["folio", "customer__first_name", "customer__last_name", "customer__phone"]
+    filter_backends = [filters.OrderingFilter, DocumentSearchFilter]
     ordering_fields = ["created_at", "received_at", "total", "balance"]
     ordering = ["-created_at"]
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[IsAuthenticated, IsManagerOrAdmin],
+        parser_classes=[MultiPartParser],
+    )
+    def import_orders(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "Debes adjuntar el archivo a importar."}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = (request.data.get("file_format") or upload.name.rsplit(".", 1)[-1]).lower()
+        if fmt not in IMPORT_FORMATS:
+            return Response({"detail": "Formato no soportado; usa csv o jsonl."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            chunk_size = int(request.data.get("chunk_size") or 500)
+        except ValueError:
+            return Response({"detail": "chunk_size invalido."}, status=status.HTTP_400_BAD_REQUEST)
+
+        importer = OrderImporter(chunk_size=chunk_size, captured_by=request.user)
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            importer.run(stream, fmt)
+        except UnicodeDecodeError:
+            return Response({"detail": "El archivo debe estar en UTF-8."}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            stream.detach()
+
+        return Response({**importer.summary(), "rejects": importer.rejects}, status=status.HTTP_201_CREATED)
+
 
 class OrderItemViewSet(viewsets.ModelViewSet):
     queryset = OrderItem.objects.select_related("order", "service")
@@ -4,6 +4,8 @@ from .web_views import (
     DeskCreateOrderView,
     DeskOrderQuickView,
     DeskProductionBoardView,
+    DeskProductionBulkUpdateView,
+    DeskProductionEventsView,
     DeskScanView,
     DeskSearchView,
     OrderTicketView,
@@ -13,6 +15,8 @@ urlpatterns = [
     path("new/", DeskCreateOrderView.as_view(), name="desk-order-new"),
     path("search/", DeskSearchView.as_view(), name="desk-search"),
     path("production/", DeskProductionBoardView.as_view(), name="desk-production"),
+    path("production/bulk/", DeskProductionBulkUpdateView.as_view(), name="desk-production-bulk"),
+    path("production/events/", DeskProductionEventsView.as_view(), name="desk-production-events"),
     path("scan/", DeskScanView.as_view(), name="desk-scan"),
     path("<int:order_id>/quick/", DeskOrderQuickView.as_view(), name="desk-order-quick"),
     path("<int:order_id>/ticket/", OrderTicketView.as_view(), name="order-ticket"),
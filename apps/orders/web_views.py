@@ -4,7 +4,7 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import transaction
-from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.utils.dateparse import parse_datetime
 from django.utils import timezone
@@ -12,12 +12,18 @@ from django.views import View
 from django.views.generic import DetailView, TemplateView
 
 from apps.catalog.models import Service
+from apps.catalog.pricing import get_price_index
 from apps.customers.models import Customer
-from apps.payments.models import CashSession, Payment
+from apps.payments.models import Payment
+from apps.payments.selectors import open_cash_session
 from apps.accounts.permissions import ROLE_ADMIN, ROLE_MANAGER, ROLE_SELLER, RoleRequiredMixin
 
 from .barcodes import code128_svg
-from .models import Order, OrderItem
+from .board_events import event_payload, latest_event_id, stream_board_events, wait_for_events
+from .folios import normalize_folio, resolve_folio
+from .models import Order
+from .selectors import BOARD_AREAS, BOARD_STATUSES, production_board_counts, production_board_page
+from .services import bulk_update_area_status, create_order, resolve_services
 
 
 class DeskSearchView(LoginRequiredMixin, TemplateView):
@@ -30,12 +36,7 @@ class DeskSearchView(LoginRequiredMixin, TemplateView):
         orders = Order.objects.select_related("customer").all()
 
         if query:
-            orders = orders.filter(
-                Q(folio__icontains=query)
-                | Q(customer__phone__icontains=query)
-                | Q(customer__first_name__icontains=query)
-                | Q(customer__last_name__icontains=query)
-            )
+            orders = orders.search(query).order_by("search_rank", "-created_at")
 
         services = Service.objects.filter(is_active=True).order_by("name")
         context["query"] = query
@@ -53,7 +54,6 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
 
     def post(self, request):
         errors = []
-        services = Service.objects.filter(is_active=True).order_by("name")
 
         customer = None
         new_customer_data = None
@@ -107,6 +107,14 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
         item_quantities = request.POST.getlist("item_quantity")
         item_unit_prices = request.POST.getlist("item_unit_price")
 
+        raw_ids = {}
+        for idx, raw_service_id in enumerate(item_service_ids):
+            try:
+                raw_ids[idx] = int(raw_service_id.strip())
+            except ValueError:
+                continue
+        service_index = resolve_services(raw_ids.values()) if raw_ids else {}
+
         parsed_items = []
         for idx, raw_service_id in enumerate(item_service_ids):
             raw_service_id = raw_service_id.strip()
@@ -116,9 +124,8 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
             quantity_raw = (item_quantities[idx] if idx < len(item_quantities) else "").strip()
             unit_price_raw = (item_unit_prices[idx] if idx < len(item_unit_prices) else "").strip()
 
-            try:
-                service = services.get(pk=int(raw_service_id))
-            except (ValueError, Service.DoesNotExist):
+            service = service_index.get(raw_ids.get(idx))
+            if service is None:
                 errors.append(f"Item {idx + 1}: servicio invalido.")
                 continue
 
@@ -130,6 +137,7 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
                 errors.append(f"Item {idx + 1}: cantidad invalida.")
                 continue
 
+            unit_price = None
             if unit_price_raw:
                 try:
                     unit_price = Decimal(unit_price_raw)
@@ -138,8 +146,6 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
                 except Exception:
                     errors.append(f"Item {idx + 1}: precio unitario invalido.")
                     continue
-            else:
-                unit_price = service.unit_price
 
             parsed_items.append(
                 {
@@ -173,9 +179,9 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
         if anticipo_method not in allowed_methods:
             errors.append("Metodo de anticipo invalido.")
 
-        open_cash_session = CashSession.objects.filter(user=request.user, closed_at__isnull=True).order_by("-opened_at").first()
+        cash_session = open_cash_session(request.user)
         requires_payment = payment_option == "full" or anticipo_amount > 0
-        if requires_payment and not open_cash_session:
+        if requires_payment and not cash_session:
             errors.append("Debes abrir caja antes de registrar anticipo o pago total.")
 
         if errors:
@@ -185,29 +191,17 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
             if customer is None and new_customer_data is not None:
                 customer = Customer.objects.create(**new_customer_data)
 
-            order = Order.objects.create(
+            order = create_order(
+                lines=parsed_items,
                 customer=customer,
                 promised_at=promised_at,
                 notes=notes,
                 status=Order.Status.RECEIVED,
             )
 
-            for item in parsed_items:
-                OrderItem.objects.create(
-                    order=order,
-                    service=item["service"],
-                    pricing_mode=item["service"].pricing_mode,
-                    quantity=item["quantity"],
-                    unit_price=item["unit_price"],
-                    iva_rate=item["service"].default_iva_rate,
-                )
-
-            order.refresh_financials(persist=True)
-
             if payment_option == "full":
                 Payment.objects.create(
                     order=order,
-                    cash_session=open_cash_session,
                     captured_by=request.user,
                     method=anticipo_method,
                     status=Payment.Status.APPLIED,
@@ -217,7 +211,6 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
             elif anticipo_amount > 0:
                 Payment.objects.create(
                     order=order,
-                    cash_session=open_cash_session,
                     captured_by=request.user,
                     method=anticipo_method,
                     status=Payment.Status.APPLIED,
@@ -228,16 +221,19 @@ class DeskCreateOrderView(LoginRequiredMixin, View):
         return redirect("order-ticket", order_id=order.id)
 
     def _render(self, errors=None):
+        services = list(Service.objects.filter(is_active=True).order_by("name"))
+        price_index = get_price_index()
+        for service in services:
+            service.effective_price, service.active_promotion = price_index.price_for(service)
+
         return render(
             self.request,
             self.template_name,
             {
-                "services": Service.objects.filter(is_active=True).order_by("name"),
+                "services": services,
                 "customers": Customer.objects.filter(is_active=True).order_by("first_name", "last_name")[:200],
                 "payment_methods": Payment.Method.choices,
-                "open_cash_session": CashSession.objects.filter(
-                    user=self.request.user, closed_at__isnull=True
-                ).order_by("-opened_at").first(),
+                "open_cash_session": open_cash_session(self.request.user),
                 "errors": errors or [],
                 "payment_options": [
                     ("partial", "Anticipo"),
@@ -252,11 +248,11 @@ class DeskScanView(LoginRequiredMixin, View):
     login_url = "/login/"
 
     def get(self, request):
-        query = request.GET.get("q", "").strip().upper()
+        query = normalize_folio(request.GET.get("q", ""))
         if query:
-            order = Order.objects.filter(folio__iexact=query).first()
-            if order:
-                return redirect("desk-order-quick", order_id=order.id)
+            order_id = resolve_folio(query)
+            if order_id:
+                return redirect("desk-order-quick", order_id=order_id)
             messages.error(request, "Folio no encontrado.")
             return render(request, self.template_name, {"query": query, "error": "Folio no encontrado."})
         return render(request, self.template_name, {"query": "", "error": ""})
@@ -289,7 +285,7 @@ class DeskOrderQuickView(LoginRequiredMixin, View):
                 order.save(update_fields=["status", "delivered_at", "updated_at"])
                 messages.success(request, "Orden entregada correctamente.")
         elif action == "pay":
-            open_session = CashSession.objects.filter(user=request.user, closed_at__isnull=True).order_by("-opened_at").first()
+            open_session = open_cash_session(request.user)
             if not open_session:
                 messages.error(request, "Debes abrir caja antes de registrar un cobro.")
             else:
@@ -318,7 +314,6 @@ class DeskOrderQuickView(LoginRequiredMixin, View):
                 if not errors and amount > 0:
                     Payment.objects.create(
                         order=order,
-                        cash_session=open_session,
                         captured_by=request.user,
                         method=method,
                         status=Payment.Status.APPLIED,
@@ -332,7 +327,7 @@ class DeskOrderQuickView(LoginRequiredMixin, View):
                     for error in errors:
                         messages.error(request, error)
         elif action == "pay_full":
-            open_session = CashSession.objects.filter(user=request.user, closed_at__isnull=True).order_by("-opened_at").first()
+            open_session = open_cash_session(request.user)
             if not open_session:
                 messages.error(request, "Debes abrir caja antes de registrar un cobro.")
             else:
@@ -348,7 +343,6 @@ class DeskOrderQuickView(LoginRequiredMixin, View):
                     else:
                         Payment.objects.create(
                             order=order,
-                            cash_session=open_session,
                             captured_by=request.user,
                             method=method,
                             status=Payment.Status.APPLIED,
@@ -368,7 +362,7 @@ class DeskOrderQuickView(LoginRequiredMixin, View):
 
     def _render(self, request, order_id, errors=None, notices=None):
         order = self._get_order(order_id)
-        open_session = CashSession.objects.filter(user=request.user, closed_at__isnull=True).order_by("-opened_at").first()
+        open_session = open_cash_session(request.user)
         return render(
             request,
             self.template_name,
@@ -387,11 +381,7 @@ class DeskProductionBoardView(RoleRequiredMixin, TemplateView):
     login_url = "/login/"
     allowed_roles = (ROLE_ADMIN, ROLE_MANAGER, ROLE_SELLER)
 
-    area_map = {
-        "wash": ("wash_status", "Lavado"),
-        "dry": ("dry_status", "Secado"),
-        "ironing": ("ironing_status", "Planchado"),
-    }
+    area_map = BOARD_AREAS
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -400,28 +390,29 @@ class DeskProductionBoardView(RoleRequiredMixin, TemplateView):
             area = "wash"
 
         status_field, area_label = self.area_map[area]
-        orders = (
-            Order.objects.select_related("customer")
-            .exclude(status__in=[Order.Status.CANCELLED, Order.Status.DELIVERED])
-            .order_by("promised_at", "-created_at")
-        )
-
-        if area == "ironing":
-            orders = orders.exclude(ironing_status=Order.AreaStatus.NOT_APPLICABLE)
-
         status_filter = self.request.GET.get("status", "").strip()
-        valid_statuses = {value for value, _ in Order.AreaStatus.choices}
-        if status_filter in valid_statuses:
-            orders = orders.filter(**{status_field: status_filter})
+        if status_filter not in {value for value, _ in BOARD_STATUSES}:
+            status_filter = ""
 
+        cursor = self.request.GET.get("cursor", "").strip()
+        orders, next_cursor = production_board_page(area, status_filter, cursor)
+        counts = production_board_counts()
         context.update(
             {
                 "area": area,
                 "area_label": area_label,
                 "status_field": status_field,
                 "status_filter": status_filter,
-                "status_choices": [c for c in Order.AreaStatus.choices if c[0] != Order.AreaStatus.NOT_APPLICABLE],
-                "orders": orders[:100],
+                "status_choices": BOARD_STATUSES,
+                "status_counts": [(value, label, counts[area][value]) for value, label in BOARD_STATUSES],
+                "area_counts": [
+                    (key, label, sum(counts[key].values())) for key, (_, label) in self.area_map.items()
+                ],
+                "orders": orders,
+                "last_event_id": latest_event_id(),
+                "board_labels": {"status": dict(Order.Status.choices), "area": dict(Order.AreaStatus.choices)},
+                "is_first_page": not cursor,
+                "next_cursor": next_cursor,
             }
         )
         return context
@@ -458,6 +449,72 @@ class DeskProductionBoardView(RoleRequiredMixin, TemplateView):
         return redirect(redirect_url)
 
 
+class DeskProductionBulkUpdateView(RoleRequiredMixin, View):
+    login_url = "/login/"
+    allowed_roles = (ROLE_ADMIN, ROLE_MANAGER, ROLE_SELLER)
+
+    def post(self, request):
+        area = request.POST.get("area", "wash").strip()
+        status_filter = request.POST.get("status", "").strip()
+        redirect_url = f"/desk/orders/production/?area={area}&status={status_filter}"
+        if area not in BOARD_AREAS:
+            messages.error(request, "Area invalida.")
+            return redirect("/desk/orders/production/")
+
+        new_status = request.POST.get("new_status", "").strip()
+        if new_status not in {value for value, _ in BOARD_STATUSES}:
+            messages.error(request, "Estatus de area invalido.")
+            return redirect(redirect_url)
+
+        try:
+            order_ids = [int(value) for value in request.POST.getlist("order_ids")]
+        except ValueError:
+            order_ids = []
+        if not order_ids:
+            messages.error(request, "Selecciona al menos una orden.")
+            return redirect(redirect_url)
+
+        field_name, area_label = BOARD_AREAS[area]
+        updated, skipped = bulk_update_area_status(order_ids, field_name, new_status)
+        if updated:
+            messages.success(request, f"{len(updated)} ordenes actualizadas en {area_label}.")
+        if skipped:
+            messages.error(request, f"{len(skipped)} ordenes omitidas (no existen o no tienen {area_label.lower()}).")
+        return redirect(redirect_url)
+
+
+class DeskProductionEventsView(RoleRequiredMixin, View):
+    """
+    Change feed for the production board: server-sent events when the client
+    asks for ``text/event-stream``, otherwise a JSON long-poll.
+    """
+
+    login_url = "/login/"
+    allowed_roles = (ROLE_ADMIN, ROLE_MANAGER, ROLE_SELLER)
+
+    def get(self, request):
+        try:
+            last_id = int(request.headers.get("Last-Event-ID") or request.GET.get("after", ""))
+        except ValueError:
+            last_id = latest_event_id()
+
+        if "text/event-stream" in request.headers.get("Accept", ""):
+            duration = float(getattr(settings, "BOARD_EVENTS_STREAM_SECONDS", 10))
+            response = StreamingHttpResponse(stream_board_events(last_id, duration), content_type="text/event-stream")
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"
+            return response
+
+        timeout = float(getattr(settings, "BOARD_EVENTS_POLL_TIMEOUT", 10))
+        events = wait_for_events(last_id, timeout)
+        return JsonResponse(
+            {
+                "events": [event_payload(event) for event in events],
+                "last_id": events[-1].id if events else last_id,
+            }
+        )
+
+
 class OrderTicketView(LoginRequiredMixin, DetailView):
     model = Order
     template_name = "orders/ticket.html"
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import CashMovement, CashSession, Payment
+from .models import CashMovement, CashSession, DailyCloseSnapshot, Payment
 
 
 @admin.register(CashSession)
@@ -22,3 +22,15 @@ class PaymentAdmin(admin.ModelAdmin):
     list_display = ("order", "cash_session", "captured_by", "method", "status", "amount", "paid_at")
     list_filter = ("method", "status")
     search_fields = ("order__folio", "reference")
+
+
+@admin.register(DailyCloseSnapshot)
+class DailyCloseSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("report_date", "income_total", "net_gain", "expected_cash_total", "sessions_count", "created_at")
+    readonly_fields = [field.name for field in DailyCloseSnapshot._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
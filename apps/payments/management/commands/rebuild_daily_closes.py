@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.payments.models import DailyCloseSnapshot
+from apps.payments.services import compute_daily_close, snapshot_daily_close
+
+
+class Command(BaseCommand):
+    help = "Recalcula los cierres diarios guardados desde pagos, movimientos y sesiones de caja."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", required=True, help="Fecha inicial (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="date_to", help="Fecha final (YYYY-MM-DD); por defecto ayer.")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Solo verifica huellas y cifras de los cierres guardados, sin modificarlos.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            date_from = date.fromisoformat(options["date_from"])
+            date_to = (
+                date.fromisoformat(options["date_to"])
+                if options["date_to"]
+                else timezone.localdate() - timedelta(days=1)
+            )
+        except ValueError:
+            raise CommandError("Las fechas deben tener formato YYYY-MM-DD.") from None
+        if date_from > date_to:
+            raise CommandError("--from no puede ser posterior a --to.")
+
+        if options["check"]:
+            self._check(date_from, date_to)
+            return
+
+        stored = dict(
+            DailyCloseSnapshot.objects.filter(report_date__range=(date_from, date_to)).values_list(
+                "report_date", "content_hash"
+            )
+        )
+        created = replaced = skipped = 0
+        day = date_from
+        while day <= date_to:
+            snapshot = snapshot_daily_close(day)
+            if snapshot is None:
+                skipped += 1
+            elif day not in stored:
+                created += 1
+            elif stored[day] != snapshot.content_hash:
+                replaced += 1
+            day += timedelta(days=1)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cierres de {date_from} a {date_to}: {created} nuevos, {replaced} recalculados, "
+                f"{skipped} sin sesiones o con cajas abiertas."
+            )
+        )
+
+    def _check(self, date_from, date_to):
+        problems = []
+        for snapshot in DailyCloseSnapshot.objects.filter(report_date__range=(date_from, date_to)).order_by("report_date"):
+            if not snapshot.is_intact:
+                problems.append(f"{snapshot.report_date}: la huella no coincide con los datos guardados.")
+                continue
+            current = DailyCloseSnapshot.from_daily_close(compute_daily_close(snapshot.report_date))
+            if current.compute_content_hash() != snapshot.content_hash:
+                problems.append(f"{snapshot.report_date}: difiere de los pagos y movimientos actuales.")
+        if problems:
+            for problem in problems:
+                self.stderr.write(problem)
+            raise CommandError(f"{len(problems)} cierres requieren revision.")
+        self.stdout.write(self.style.SUCCESS(f"Cierres de {date_from} a {date_to} verificados."))
@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.payments.models import MOVEMENT_TOTAL_FIELDS, PAYMENT_TOTAL_FIELDS, CashSession
+
+CENT = Decimal("0.01")
+
+
+class Command(BaseCommand):
+    help = "Compara los totales acumulados de las sesiones de caja contra un recalculo completo de pagos y movimientos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Recalcula y corrige las sesiones con diferencias.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Sesiones leidas por lote.")
+
+    def handle(self, *args, **options):
+        columns = {
+            **{field: f"summary_{method}" for method, field in PAYMENT_TOTAL_FIELDS.items()},
+            **{field: f"summary_movement_{movement_type}" for movement_type, field in MOVEMENT_TOTAL_FIELDS.items()},
+        }
+        rows = CashSession.objects.with_summary().order_by("pk").values("pk", *columns, *columns.values())
+
+        checked = 0
+        mismatched = []
+        for row in rows.iterator(chunk_size=options["chunk_size"]):
+            checked += 1
+            diffs = {
+                field: (row[field], row[computed])
+                for field, computed in columns.items()
+                if Decimal(row[field]).quantize(CENT) != Decimal(row[computed]).quantize(CENT)
+            }
+            if diffs:
+                mismatched.append(row["pk"])
+                detail = ", ".join(f"{field}: {stored} -> {value}" for field, (stored, value) in diffs.items())
+                self.stderr.write(f"- sesion {row['pk']}: {detail}")
+
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS(f"{checked} sesiones revisadas, sin diferencias."))
+            return
+
+        if options["fix"]:
+            CashSession.objects.filter(pk__in=mismatched).recompute_totals()
+            self.stdout.write(self.style.SUCCESS(f"{len(mismatched)} de {checked} sesiones corregidas."))
+            return
+
+        self.stderr.write(f"{len(mismatched)} de {checked} sesiones con diferencias. Ejecuta con --fix para corregir.")
+        raise SystemExit(1)
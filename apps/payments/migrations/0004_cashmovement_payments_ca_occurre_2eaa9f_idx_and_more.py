@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_orders_orde_receive_b8e597_idx_and_more'),
+        ('payments', '0003_alter_cashsession_shift'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cashmovement',
+            index=models.Index(fields=['occurred_at'], name='payments_ca_occurre_2eaa9f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cashsession',
+            index=models.Index(fields=['opened_at'], name='payments_ca_opened__998279_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'paid_at'], name='payments_pa_status_bed4b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['captured_by', 'status', 'paid_at'], name='payments_pa_capture_ce4dd7_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0004_cashmovement_payments_ca_occurre_2eaa9f_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCloseSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('report_date', models.DateField(unique=True)),
+                ('cash', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('card', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('transfer', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('other', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('income_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('movement_income_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('movement_expense_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('movement_adjustment_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('generated_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('net_gain', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('expected_cash_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('closing_difference_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sessions_count', models.PositiveIntegerField(default=0)),
+                ('payments_count', models.PositiveIntegerField(default=0)),
+                ('sessions', models.JSONField(blank=True, default=list)),
+                ('employees', models.JSONField(blank=True, default=list)),
+                ('employees_by_shift', models.JSONField(blank=True, default=dict)),
+                ('content_hash', models.CharField(max_length=64)),
+            ],
+            options={
+                'ordering': ['-report_date'],
+            },
+        ),
+    ]
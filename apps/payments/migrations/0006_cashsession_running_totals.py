@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:12
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import DecimalField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+PAYMENT_TOTAL_FIELDS = {method: f"{method}_total" for method in ("cash", "card", "transfer", "other")}
+MOVEMENT_TOTAL_FIELDS = {"income": "movement_income_total", "expense": "expense_total", "adjustment": "adjustment_total"}
+
+
+def backfill_running_totals(apps, schema_editor):
+    CashSession = apps.get_model("payments", "CashSession")
+    Payment = apps.get_model("payments", "Payment")
+    CashMovement = apps.get_model("payments", "CashMovement")
+    money = DecimalField(max_digits=12, decimal_places=2)
+    payments = Payment.objects.filter(cash_session=OuterRef("pk"), status="applied").order_by().values("cash_session")
+    movements = CashMovement.objects.filter(cash_session=OuterRef("pk")).order_by().values("cash_session")
+
+    totals = {}
+    for method, field in PAYMENT_TOTAL_FIELDS.items():
+        total = payments.annotate(total=Sum("amount", filter=Q(method=method))).values("total")
+        totals[field] = Coalesce(Subquery(total, output_field=money), Value(Decimal("0.00")), output_field=money)
+    for movement_type, field in MOVEMENT_TOTAL_FIELDS.items():
+        total = movements.annotate(total=Sum("amount", filter=Q(movement_type=movement_type))).values("total")
+        totals[field] = Coalesce(Subquery(total, output_field=money), Value(Decimal("0.00")), output_field=money)
+    CashSession.objects.update(**totals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_dailyclosesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cashsession',
+            name='adjustment_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='cashsession',
+            name='card_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='cashsession',
+            name='cash_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='cashsession',
+            name='expense_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='cashsession',
+            name='movement_income_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='cashsession',
+            name='other_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='cashsession',
+            name='transfer_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RunPython(backfill_running_totals, migrations.RunPython.noop),
+    ]
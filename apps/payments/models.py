@@ -1,16 +1,113 @@
+import hashlib
+import json
+from collections import defaultdict
 from decimal import Decimal
 
 from django.conf import settings
 from django.core.validators import MinValueValidator
-from django.db import models
-from django.db.models import Q, Sum
+from django.db import models, transaction
+from django.db.models import DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from apps.common.models import TimeStampedModel
-from apps.orders.models import Order
+from apps.common.tracking import TrackedFieldsMixin
+from apps.orders.models import Order, record_financial_delta, resync_financials
 
 
-class CashSession(TimeStampedModel):
+SUMMARY_PAYMENT_METHODS = ("cash", "card", "transfer", "other")
+PAYMENT_TOTAL_FIELDS = {method: f"{method}_total" for method in SUMMARY_PAYMENT_METHODS}
+MOVEMENT_TOTAL_FIELDS = {
+    "income": "movement_income_total",
+    "expense": "expense_total",
+    "adjustment": "adjustment_total",
+}
+RUNNING_TOTAL_FIELDS = (*PAYMENT_TOTAL_FIELDS.values(), *MOVEMENT_TOTAL_FIELDS.values())
+SNAPSHOT_SESSION_MONEY = (
+    "opening_amount",
+    "closing_amount",
+    "expected_cash",
+    "income_total",
+    "generated_total",
+    "net_gain",
+    "difference",
+)
+
+
+def _money_text(value):
+    return None if value is None else f"{Decimal(value):.2f}"
+
+
+def _money_value(value):
+    return None if value is None else Decimal(value)
+
+
+def _computed_totals():
+    """Subqueries recomputing each running-total column of the outer session."""
+    money = DecimalField(max_digits=12, decimal_places=2)
+    payments = (
+        Payment.objects.filter(cash_session=OuterRef("pk"), status=Payment.Status.APPLIED)
+        .order_by()
+        .values("cash_session")
+    )
+    movements = CashMovement.objects.filter(cash_session=OuterRef("pk")).order_by().values("cash_session")
+
+    expressions = {}
+    for method, field in PAYMENT_TOTAL_FIELDS.items():
+        total = payments.annotate(total=Sum("amount", filter=Q(method=method))).values("total")
+        expressions[field] = Coalesce(Subquery(total, output_field=money), Value(Decimal("0.00")), output_field=money)
+    for movement_type, field in MOVEMENT_TOTAL_FIELDS.items():
+        total = movements.annotate(total=Sum("amount", filter=Q(movement_type=movement_type))).values("total")
+        expressions[field] = Coalesce(Subquery(total, output_field=money), Value(Decimal("0.00")), output_field=money)
+    return expressions
+
+
+class CashSessionQuerySet(models.QuerySet):
+    def with_summary(self):
+        """
+        Annotates the summary figures recomputed from payments and movements
+        as correlated subqueries, to check the running totals against them.
+        """
+        expressions = _computed_totals()
+        annotations = {f"summary_{method}": expressions[field] for method, field in PAYMENT_TOTAL_FIELDS.items()}
+        annotations.update(
+            {
+                f"summary_movement_{movement_type}": expressions[field]
+                for movement_type, field in MOVEMENT_TOTAL_FIELDS.items()
+            }
+        )
+        return self.annotate(**annotations)
+
+    def apply_totals_delta(self, **deltas):
+        return self.update(**{field: F(field) + amount for field, amount in deltas.items()}, updated_at=timezone.now())
+
+    def recompute_totals(self):
+        return self.update(**_computed_totals(), updated_at=timezone.now())
+
+
+class SessionEntryQuerySet(models.QuerySet):
+    """
+    Queryset for payments and movements. ``update`` skips ``save``, so when it
+    touches a field feeding the running totals the affected sessions (before
+    and after the update) are recomputed.
+    """
+
+    def update(self, **kwargs):
+        if not set(kwargs) & set(self.model.session_total_inputs):
+            return super().update(**kwargs)
+        with transaction.atomic(savepoint=False):
+            pks = list(self.values_list("pk", flat=True))
+            entries = self.model.objects.filter(pk__in=pks)
+            session_ids = set(entries.values_list("cash_session", flat=True))
+            updated = super().update(**kwargs)
+            session_ids.update(entries.values_list("cash_session", flat=True))
+            session_ids.discard(None)
+            if session_ids:
+                CashSession.objects.filter(pk__in=session_ids).recompute_totals()
+        return updated
+
+
+class CashSession(TrackedFieldsMixin, TimeStampedModel):
     class Shift(models.TextChoices):
         MORNING = "morning", "Mañana"
         EVENING = "evening", "Tarde"
@@ -22,9 +119,21 @@ class CashSession(TimeStampedModel):
     closed_at = models.DateTimeField(null=True, blank=True)
     closing_amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     notes = models.TextField(blank=True)
+    # Running totals kept by Payment and CashMovement writes and deletes; see record_session_delta.
+    cash_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    card_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    transfer_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    other_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    movement_income_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    expense_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    adjustment_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    tracked_fields = ("closed_at", "closing_amount")
+    objects = CashSessionQuerySet.as_manager()
 
     class Meta:
         ordering = ["-opened_at", "-created_at"]
+        indexes = [models.Index(fields=["opened_at"])]
         constraints = [
             models.UniqueConstraint(
                 fields=["user"],
@@ -40,32 +149,44 @@ class CashSession(TimeStampedModel):
     def is_open(self) -> bool:
         return self.closed_at is None
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # Running totals only change through F() updates; a stale instance must not overwrite them.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in RUNNING_TOTAL_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def summary(self):
-        payments_qs = self.payments.filter(status=Payment.Status.APPLIED)
-        totals = {
-            "cash": payments_qs.filter(method=Payment.Method.CASH).aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-            "card": payments_qs.filter(method=Payment.Method.CARD).aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-            "transfer": payments_qs.filter(method=Payment.Method.TRANSFER).aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-            "other": payments_qs.filter(method=Payment.Method.OTHER).aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-        }
-        movement_income = (
-            self.movements.filter(movement_type=CashMovement.MovementType.INCOME).aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
+        """
+        Summary read from the running totals, without querying unless they
+        were deferred (sessions from ``open_cash_session``), then in one query.
+        """
+        deferred = self.get_deferred_fields() & set(RUNNING_TOTAL_FIELDS)
+        if deferred:
+            self.refresh_from_db(fields=sorted(deferred))
+        grouped = {("payment", method): Decimal(getattr(self, field)) for method, field in PAYMENT_TOTAL_FIELDS.items()}
+        grouped.update(
+            {
+                ("movement", movement_type): Decimal(getattr(self, field))
+                for movement_type, field in MOVEMENT_TOTAL_FIELDS.items()
+            }
         )
+        return self._build_summary(self, grouped)
+
+    @staticmethod
+    def _build_summary(session, grouped):
+        totals = {method: grouped[("payment", method)] for method in SUMMARY_PAYMENT_METHODS}
         totals["income_total"] = sum(totals.values(), Decimal("0.00"))
-        totals["movement_income_total"] = movement_income
-        totals["expense_total"] = (
-            self.movements.filter(movement_type=CashMovement.MovementType.EXPENSE).aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
-        )
-        totals["adjustment_total"] = (
-            self.movements.filter(movement_type=CashMovement.MovementType.ADJUSTMENT).aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
-        )
+        totals["movement_income_total"] = grouped[("movement", CashMovement.MovementType.INCOME)]
+        totals["expense_total"] = grouped[("movement", CashMovement.MovementType.EXPENSE)]
+        totals["adjustment_total"] = grouped[("movement", CashMovement.MovementType.ADJUSTMENT)]
         totals["generated_total"] = totals["income_total"] + totals["movement_income_total"]
         totals["net_gain"] = totals["generated_total"] - totals["expense_total"]
         totals["expected_cash"] = (
-            Decimal(self.opening_amount)
+            Decimal(session.opening_amount)
             + totals["cash"]
             + totals["movement_income_total"]
             + totals["adjustment_total"]
@@ -74,7 +195,38 @@ class CashSession(TimeStampedModel):
         return totals
 
 
-class CashMovement(TimeStampedModel):
+def record_session_delta(session_id, *, session=None, **deltas):
+    """
+    Adds ``deltas`` to the running totals of a session with one ``F()``
+    update, mirroring them on ``session`` when the instance is at hand.
+    """
+    deltas = {field: amount for field, amount in deltas.items() if amount}
+    if session_id is None or not deltas:
+        return
+    CashSession.objects.filter(pk=session_id).apply_totals_delta(**deltas)
+    if session is not None and session.pk == session_id:
+        deferred = session.get_deferred_fields()
+        for field, amount in deltas.items():
+            if field not in deferred:
+                setattr(session, field, Decimal(getattr(session, field)) + amount)
+
+
+def move_session_entry(instance, before, after):
+    """
+    Moves a payment or movement between running totals. ``before`` and
+    ``after`` are ``(session_id, field, amount)`` or ``None``.
+    """
+    deltas = defaultdict(lambda: defaultdict(lambda: Decimal("0.00")))
+    if before is not None:
+        deltas[before[0]][before[1]] -= before[2]
+    if after is not None:
+        deltas[after[0]][after[1]] += after[2]
+    session = instance.cash_session if type(instance).cash_session.is_cached(instance) else None
+    for session_id, fields in deltas.items():
+        record_session_delta(session_id, session=session, **fields)
+
+
+class CashMovement(TrackedFieldsMixin, TimeStampedModel):
     class MovementType(models.TextChoices):
         INCOME = "income", "Ingreso"
         EXPENSE = "expense", "Egreso"
@@ -94,14 +246,33 @@ class CashMovement(TimeStampedModel):
         related_name="cash_movements",
     )
 
+    tracked_fields = ("cash_session", "movement_type", "amount")
+    session_total_inputs = ("cash_session", "movement_type", "amount")
+    objects = SessionEntryQuerySet.as_manager()
+
     class Meta:
         ordering = ["-occurred_at", "-created_at"]
+        indexes = [models.Index(fields=["occurred_at"])]
 
     def __str__(self) -> str:
         return f"{self.cash_session} - {self.get_movement_type_display()} - {self.amount}"
 
+    def _session_entry(self, persisted=False):
+        values = {"cash_session_id": self.cash_session_id, "movement_type": self.movement_type, "amount": self.amount}
+        if persisted:
+            values.update({name: old for name, (old, _) in self.changed_fields().items()})
+        field = MOVEMENT_TOTAL_FIELDS.get(values["movement_type"])
+        if values["cash_session_id"] is None or field is None:
+            return None
+        return values["cash_session_id"], field, Decimal(values["amount"])
 
-class Payment(TimeStampedModel):
+    def save(self, *args, **kwargs):
+        before = None if self._state.adding else self._session_entry(persisted=True)
+        super().save(*args, **kwargs)
+        move_session_entry(self, before, self._session_entry())
+
+
+class Payment(TrackedFieldsMixin, TimeStampedModel):
     class Method(models.TextChoices):
         CASH = "cash", "Efectivo"
         CARD = "card", "Tarjeta"
@@ -128,21 +299,163 @@ class Payment(TimeStampedModel):
     reference = models.CharField(max_length=120, blank=True)
     notes = models.TextField(blank=True)
 
+    tracked_fields = ("order", "amount", "method", "status", "reference", "cash_session", "paid_at", "captured_by")
+    session_total_inputs = ("cash_session", "method", "status", "amount")
+    objects = SessionEntryQuerySet.as_manager()
+
     class Meta:
         ordering = ["-paid_at", "-created_at"]
+        indexes = [
+            models.Index(fields=["status", "paid_at"]),
+            models.Index(fields=["captured_by", "status", "paid_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.order.folio} - {self.amount}"
 
+    def _financial_state(self, persisted=False):
+        if persisted:
+            values = self.persisted_values()
+        else:
+            values = {
+                "order_id": self.order_id,
+                "cash_session_id": self.cash_session_id,
+                "method": self.method,
+                "status": self.status,
+                "amount": self.amount,
+            }
+        applied = Decimal(values["amount"]) if values["status"] == self.Status.APPLIED else Decimal("0.00")
+        field = PAYMENT_TOTAL_FIELDS.get(values["method"])
+        entry = None if values["cash_session_id"] is None or field is None else (values["cash_session_id"], field, applied)
+        return {"order_id": values["order_id"], "applied_amount": applied, "session_entry": entry}
+
     def save(self, *args, **kwargs):
         if self.captured_by and not self.cash_session:
-            self.cash_session = (
-                CashSession.objects.filter(user=self.captured_by, closed_at__isnull=True).order_by("-opened_at").first()
-            )
+            from .selectors import open_cash_session
+
+            self.cash_session = open_cash_session(self.captured_by)
+        previous = None if self._state.adding else self._financial_state(persisted=True)
+
         super().save(*args, **kwargs)
-        self.order.refresh_financials(persist=True)
+
+        current = self._financial_state()
+        order = self.order if Payment.order.is_cached(self) else None
+        if previous is not None and previous["order_id"] != self.order_id:
+            record_financial_delta(previous["order_id"], paid_amount=-previous["applied_amount"])
+            record_financial_delta(self.order_id, order=order, paid_amount=current["applied_amount"])
+        else:
+            applied_before = previous["applied_amount"] if previous else Decimal("0.00")
+            record_financial_delta(self.order_id, order=order, paid_amount=current["applied_amount"] - applied_before)
+        move_session_entry(self, previous["session_entry"] if previous else None, current["session_entry"])
 
     def delete(self, *args, **kwargs):
+        previous = self._financial_state(persisted=True)
         order = self.order
-        super().delete(*args, **kwargs)
-        order.refresh_financials(persist=True)
+        result = super().delete(*args, **kwargs)
+        record_financial_delta(order.pk, order=order, paid_amount=-previous["applied_amount"])
+        return result
+
+
+class DailyCloseSnapshot(TimeStampedModel):
+    """
+    Persisted daily close (Z report), written when the last cash session of
+    the day closes. Rows are never updated in place: a rebuild replaces them,
+    and ``content_hash`` exposes edits made outside the application.
+    """
+
+    TOTAL_FIELDS = (
+        *SUMMARY_PAYMENT_METHODS,
+        "income_total",
+        "movement_income_total",
+        "movement_expense_total",
+        "movement_adjustment_total",
+        "generated_total",
+        "net_gain",
+    )
+
+    report_date = models.DateField(unique=True)
+    cash = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    card = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    transfer = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    other = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    income_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    movement_income_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    movement_expense_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    movement_adjustment_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    generated_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    net_gain = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    expected_cash_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    closing_difference_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sessions_count = models.PositiveIntegerField(default=0)
+    payments_count = models.PositiveIntegerField(default=0)
+    sessions = models.JSONField(default=list, blank=True)
+    employees = models.JSONField(default=list, blank=True)
+    employees_by_shift = models.JSONField(default=dict, blank=True)
+    content_hash = models.CharField(max_length=64)
+
+    class Meta:
+        ordering = ["-report_date"]
+
+    def __str__(self) -> str:
+        return f"Cierre {self.report_date:%Y-%m-%d}"
+
+    @classmethod
+    def from_daily_close(cls, close):
+        """Unsaved snapshot for a ``compute_daily_close`` result."""
+        sessions = [
+            {key: _money_text(value) if key in SNAPSHOT_SESSION_MONEY else value for key, value in row.items()}
+            for row in close["sessions_summary"]
+        ]
+        employees = [{**row, "total": _money_text(row["total"])} for row in close["by_employee"]]
+        return cls(
+            report_date=close["report_date"],
+            expected_cash_total=close["expected_cash_total"],
+            closing_difference_total=close["closing_difference_total"],
+            sessions_count=len(sessions),
+            payments_count=sum(row["payments_count"] for row in employees),
+            sessions=sessions,
+            employees=employees,
+            employees_by_shift=close["employees_by_shift"],
+            **{name: close["totals"][name] for name in cls.TOTAL_FIELDS},
+        )
+
+    def as_daily_close(self):
+        """The snapshot in the shape returned by ``compute_daily_close``."""
+        return {
+            "report_date": self.report_date,
+            "totals": {name: _money_value(getattr(self, name)) for name in self.TOTAL_FIELDS},
+            "expected_cash_total": _money_value(self.expected_cash_total),
+            "closing_difference_total": _money_value(self.closing_difference_total),
+            "sessions_summary": [
+                {key: _money_value(value) if key in SNAPSHOT_SESSION_MONEY else value for key, value in row.items()}
+                for row in self.sessions
+            ],
+            "employees_by_shift": self.employees_by_shift,
+            "by_employee": [{**row, "total": _money_value(row["total"])} for row in self.employees],
+            "all_sessions_closed": True,
+        }
+
+    def compute_content_hash(self):
+        payload = {
+            "report_date": self.report_date.isoformat(),
+            "totals": {name: _money_text(getattr(self, name)) for name in self.TOTAL_FIELDS},
+            "expected_cash_total": _money_text(self.expected_cash_total),
+            "closing_difference_total": _money_text(self.closing_difference_total),
+            "sessions_count": self.sessions_count,
+            "payments_count": self.payments_count,
+            "sessions": self.sessions,
+            "employees": self.employees,
+            "employees_by_shift": self.employees_by_shift,
+        }
+        raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def is_intact(self) -> bool:
+        return self.content_hash == self.compute_content_hash()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Los cierres diarios guardados no se modifican; recalcula con rebuild_daily_closes.")
+        self.content_hash = self.compute_content_hash()
+        super().save(*args, **kwargs)
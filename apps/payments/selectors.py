@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.common.caching import uses_local_cache
+
+from .models import RUNNING_TOTAL_FIELDS, CashSession
+
+OPEN_SESSION_CACHE_PREFIX = "payments:open-session:v2"
+OPEN_SESSION_CACHE_TIMEOUT = 10 * 60
+OPEN_SESSION_MEMO_ATTR = "_open_cash_session"
+# Everything but the running totals, which change with every payment and load on demand.
+OPEN_SESSION_FIELDS = tuple(
+    field.attname for field in CashSession._meta.concrete_fields if field.name not in RUNNING_TOTAL_FIELDS
+)
+
+
+def _open_session_key(user_id):
+    return f"{OPEN_SESSION_CACHE_PREFIX}:{user_id}"
+
+
+def open_cash_session(user):
+    """
+    The open cash session of ``user``, or ``None``. Memoized on the user
+    instance for the current request and, with a shared cache, across
+    requests; saving or deleting a session of the user drops both once it
+    commits. A per-process cache is not used: closing a session would only
+    reach the worker that closed it.
+
+    The lookup matches ``uniq_open_cash_session_per_user``, so a cache miss is
+    a probe of that partial unique index.
+    """
+    if user is None or not user.is_authenticated:
+        return None
+    memo = user.__dict__.get(OPEN_SESSION_MEMO_ATTR)
+    if memo is not None:
+        return memo or None
+
+    shared = not uses_local_cache()
+    key = _open_session_key(user.pk)
+    values = cache.get(key) if shared else None
+    if values is None:
+        values = CashSession.objects.filter(user=user, closed_at__isnull=True).values(*OPEN_SESSION_FIELDS).first() or {}
+        if shared:
+            # Only committed rows are shared: a rolled back session must not outlive its transaction.
+            transaction.on_commit(lambda: cache.set(key, values, OPEN_SESSION_CACHE_TIMEOUT))
+
+    session = None
+    if values:
+        session = CashSession.from_db("default", list(values), list(values.values()))
+        session.user = user
+    user.__dict__[OPEN_SESSION_MEMO_ATTR] = session or False
+    return session
+
+
+def forget_open_cash_session(user_id, user=None):
+    """Drops the cached open session of ``user_id`` and the memo on ``user``."""
+    if user is not None:
+        user.__dict__.pop(OPEN_SESSION_MEMO_ATTR, None)
+    key = _open_session_key(user_id)
+    cache.delete(key)
+    # Another request may cache the pre-commit row in the meantime.
+    transaction.on_commit(lambda: cache.delete(key))
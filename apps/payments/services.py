@@ -0,0 +1,198 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, Count, F, IntegerField, Sum, Value
+from django.utils import timezone
+
+from apps.common.caching import shared_timeout
+from apps.common.utils import local_date_range
+
+from .models import SUMMARY_PAYMENT_METHODS, CashMovement, CashSession, DailyCloseSnapshot, Payment
+
+ZERO = Decimal("0.00")
+DAILY_CLOSE_CACHE_PREFIX = "payments:daily-close"
+DAILY_CLOSE_CACHE_TIMEOUT = 5 * 60
+
+
+def _daily_rows(report_date):
+    """
+    Applied payments grouped by method and employee plus movements grouped by
+    type for ``report_date``, combined with UNION ALL into one query.
+    """
+    payments = (
+        Payment.objects.filter(status=Payment.Status.APPLIED, **local_date_range("paid_at", report_date))
+        .order_by()
+        .values("method")
+        .annotate(
+            user_id=F("captured_by_id"),
+            username=F("captured_by__username"),
+            first_name=F("captured_by__first_name"),
+            last_name=F("captured_by__last_name"),
+            source=Value("payment"),
+            total=Sum("amount"),
+            entries=Count("id"),
+        )
+    )
+    movements = (
+        CashMovement.objects.filter(**local_date_range("occurred_at", report_date))
+        .order_by()
+        .values("movement_type")
+        .annotate(
+            user_id=Value(None, output_field=IntegerField()),
+            username=Value(None, output_field=CharField()),
+            first_name=Value(None, output_field=CharField()),
+            last_name=Value(None, output_field=CharField()),
+            source=Value("movement"),
+            total=Sum("amount"),
+            entries=Count("id"),
+        )
+    )
+    return payments.union(movements, all=True)
+
+
+def compute_daily_close(report_date):
+    """
+    Daily close figures for ``report_date`` in two queries: the day's sessions
+    with their running totals, and the grouped payments and movements.
+    The result holds plain values only, so it can be cached or persisted.
+    """
+    payment_totals = defaultdict(lambda: ZERO)
+    movement_totals = defaultdict(lambda: ZERO)
+    employees = {}
+    for row in _daily_rows(report_date):
+        total = row["total"] or ZERO
+        if row["source"] == "movement":
+            movement_totals[row["method"]] += total
+            continue
+        payment_totals[row["method"]] += total
+        employee = employees.setdefault(
+            row["user_id"],
+            {
+                "captured_by_id": row["user_id"],
+                "captured_by__username": row["username"],
+                "captured_by__first_name": row["first_name"],
+                "captured_by__last_name": row["last_name"],
+                "total": ZERO,
+                "payments_count": 0,
+            },
+        )
+        employee["total"] += total
+        employee["payments_count"] += row["entries"]
+
+    totals = {method: payment_totals[method] for method in SUMMARY_PAYMENT_METHODS}
+    totals["income_total"] = sum(totals.values(), ZERO)
+    totals["movement_income_total"] = movement_totals[CashMovement.MovementType.INCOME]
+    totals["movement_expense_total"] = movement_totals[CashMovement.MovementType.EXPENSE]
+    totals["movement_adjustment_total"] = movement_totals[CashMovement.MovementType.ADJUSTMENT]
+    totals["generated_total"] = totals["income_total"] + totals["movement_income_total"]
+    totals["net_gain"] = totals["generated_total"] - totals["movement_expense_total"]
+
+    sessions = (
+        CashSession.objects.select_related("user")
+        .filter(**local_date_range("opened_at", report_date))
+        .order_by("opened_at")
+    )
+    sessions_summary = []
+    employees_by_shift = defaultdict(list)
+    expected_cash_total = ZERO
+    closing_difference_total = ZERO
+    all_closed = True
+    for session in sessions:
+        summary = session.summary()
+        expected_cash_total += summary["expected_cash"]
+        difference = None
+        if session.closing_amount is not None:
+            difference = session.closing_amount - summary["expected_cash"]
+            closing_difference_total += difference
+        all_closed = all_closed and session.closed_at is not None
+        full_name = f"{session.user.first_name} {session.user.last_name}".strip() or session.user.username
+        sessions_summary.append(
+            {
+                "session_id": session.pk,
+                "user": str(session.user),
+                "employee": full_name,
+                "shift": session.get_shift_display(),
+                "opening_amount": session.opening_amount,
+                "closing_amount": session.closing_amount,
+                "expected_cash": summary["expected_cash"],
+                "income_total": summary["income_total"],
+                "generated_total": summary["generated_total"],
+                "net_gain": summary["net_gain"],
+                "difference": difference,
+            }
+        )
+        if full_name not in employees_by_shift[session.get_shift_display()]:
+            employees_by_shift[session.get_shift_display()].append(full_name)
+
+    return {
+        "report_date": report_date,
+        "totals": totals,
+        "expected_cash_total": expected_cash_total,
+        "closing_difference_total": closing_difference_total,
+        "sessions_summary": sessions_summary,
+        "employees_by_shift": dict(employees_by_shift),
+        "by_employee": sorted(employees.values(), key=lambda row: row["total"], reverse=True),
+        "all_sessions_closed": all_closed,
+    }
+
+
+def _daily_close_key(report_date):
+    return f"{DAILY_CLOSE_CACHE_PREFIX}:{report_date.isoformat()}"
+
+
+def get_daily_close(report_date):
+    """
+    Daily close for ``report_date``. Past days with a snapshot are read from it
+    in one query; other days use ``compute_daily_close`` memoized per date,
+    shared by the daily close screen and its print view. Writes touching a
+    date drop its memoized entry.
+    """
+    if report_date < timezone.localdate():
+        snapshot = DailyCloseSnapshot.objects.filter(report_date=report_date).first()
+        if snapshot is not None:
+            return {**snapshot.as_daily_close(), "snapshot": snapshot}
+    key = _daily_close_key(report_date)
+    result = cache.get(key)
+    if result is None:
+        result = compute_daily_close(report_date)
+        # Days without a snapshot can still change, past ones included.
+        cache.set(key, result, shared_timeout(DAILY_CLOSE_CACHE_TIMEOUT))
+    return result
+
+
+def invalidate_daily_close(*moments):
+    """Drops the memoized close of the local dates of ``moments`` (datetimes)."""
+    keys = {_daily_close_key(timezone.localdate(moment)) for moment in moments if moment is not None}
+    if keys:
+        cache.delete_many(keys)
+        # Other processes may recompute from pre-commit data in the meantime.
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def snapshot_daily_close(report_date):
+    """
+    Persists the close of ``report_date`` once every session opened that day
+    is closed. A stored snapshot with different figures (a session opened and
+    closed later that day, or a rebuild) is replaced. Returns the snapshot, or
+    ``None`` while the day has no sessions or an open one.
+    """
+    close = compute_daily_close(report_date)
+    if not close["sessions_summary"] or not close["all_sessions_closed"]:
+        return None
+    snapshot = DailyCloseSnapshot.from_daily_close(close)
+    content_hash = snapshot.compute_content_hash()
+    with transaction.atomic():
+        existing = DailyCloseSnapshot.objects.select_for_update().filter(report_date=report_date).first()
+        if existing is not None:
+            if existing.content_hash == content_hash:
+                return existing
+            existing.delete()
+        try:
+            with transaction.atomic():
+                snapshot.save()
+        except IntegrityError:
+            # A concurrent close of the same day stored it first.
+            return DailyCloseSnapshot.objects.get(report_date=report_date)
+    return snapshot
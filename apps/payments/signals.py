@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import CashMovement, CashSession, Payment, move_session_entry
+from .selectors import forget_open_cash_session
+from .services import invalidate_daily_close, snapshot_daily_close
+
+
+def _session_opened_at(instance, descriptor):
+    if instance.cash_session_id is None:
+        return None
+    if descriptor.is_cached(instance):
+        return instance.cash_session.opened_at
+    return CashSession.objects.filter(pk=instance.cash_session_id).values_list("opened_at", flat=True).first()
+
+
+@receiver(pre_delete, sender=Payment)
+@receiver(pre_delete, sender=CashMovement)
+def load_session_entry_fields(sender, instance, **kwargs):
+    # Deferred tracked fields must be read while the row still exists.
+    instance.changed_fields()
+
+
+# Receivers rather than delete(): cascades (a deleted order) and queryset deletes skip the model method.
+@receiver(post_delete, sender=Payment)
+def remove_payment_session_entry(sender, instance, **kwargs):
+    move_session_entry(instance, instance._financial_state(persisted=True)["session_entry"], None)
+
+
+@receiver(post_delete, sender=CashMovement)
+def remove_movement_session_entry(sender, instance, **kwargs):
+    move_session_entry(instance, instance._session_entry(persisted=True), None)
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_payment_close(sender, instance, **kwargs):
+    invalidate_daily_close(instance.paid_at, _session_opened_at(instance, Payment.cash_session))
+
+
+@receiver(post_save, sender=CashMovement)
+@receiver(post_delete, sender=CashMovement)
+def invalidate_movement_close(sender, instance, **kwargs):
+    invalidate_daily_close(instance.occurred_at, _session_opened_at(instance, CashMovement.cash_session))
+
+
+@receiver(post_save, sender=CashSession)
+@receiver(post_delete, sender=CashSession)
+def invalidate_session_close(sender, instance, **kwargs):
+    invalidate_daily_close(instance.opened_at)
+
+
+@receiver(post_save, sender=CashSession)
+@receiver(post_delete, sender=CashSession)
+def forget_user_open_session(sender, instance, **kwargs):
+    user = instance.user if CashSession.user.is_cached(instance) else None
+    forget_open_cash_session(instance.user_id, user)
+
+
+@receiver(post_save, sender=CashSession)
+def snapshot_closed_day(sender, instance, created, **kwargs):
+    if created or instance.closed_at is None or "closed_at" not in instance.changed_fields():
+        return
+    report_date = timezone.localdate(instance.opened_at)
+    transaction.on_commit(lambda: snapshot_daily_close(report_date))
@@ -0,0 +1,132 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.customers.models import Customer
+from apps.orders.models import Order
+from apps.payments.models import MOVEMENT_TOTAL_FIELDS, PAYMENT_TOTAL_FIELDS, CashMovement, CashSession, Payment
+
+
+class CashSessionRunningTotalsTests(TestCase):
+    def setUp(self):
+        self.cashier = User.objects.create_user(username="cashier_totals", password="StrongPass123!")
+        self.order = Order.objects.create(customer=Customer.objects.create(first_name="Tomas", phone="5520007000"))
+        self.session = CashSession.objects.create(
+            user=self.cashier, shift=CashSession.Shift.MORNING, opening_amount=Decimal("100.00")
+        )
+
+    def _assert_matches_recompute(self, session):
+        session = CashSession.objects.with_summary().get(pk=session.pk)
+        for method, field in PAYMENT_TOTAL_FIELDS.items():
+            self.assertEqual(getattr(session, field), getattr(session, f"summary_{method}"))
+        for movement_type, field in MOVEMENT_TOTAL_FIELDS.items():
+            self.assertEqual(getattr(session, field), getattr(session, f"summary_movement_{movement_type}"))
+        return session.summary()
+
+    def test_payment_writes_keep_running_totals(self):
+        payment = Payment.objects.create(order=self.order, captured_by=self.cashier, amount=Decimal("50.00"))
+        Payment.objects.create(order=self.order, cash_session=self.session, amount=Decimal("30.00"), method="card")
+        self.assertEqual(self.session.card_total, Decimal("30.00"))
+        self.assertEqual(self._assert_matches_recompute(self.session)["cash"], Decimal("50.00"))
+
+        payment = Payment.objects.get(pk=payment.pk)
+        payment.method = Payment.Method.TRANSFER
+        payment.amount = Decimal("45.00")
+        payment.save()
+        summary = self._assert_matches_recompute(self.session)
+        self.assertEqual((summary["cash"], summary["transfer"]), (Decimal("0.00"), Decimal("45.00")))
+
+        payment.status = Payment.Status.VOID
+        payment.save()
+        self.assertEqual(self._assert_matches_recompute(self.session)["transfer"], Decimal("0.00"))
+
+        other = CashSession.objects.create(user=self.cashier, shift=CashSession.Shift.EVENING, closed_at=self.session.opened_at)
+        card = Payment.objects.get(method=Payment.Method.CARD)
+        card.cash_session = other
+        card.save()
+        self.assertEqual(self._assert_matches_recompute(self.session)["card"], Decimal("0.00"))
+        self.assertEqual(self._assert_matches_recompute(other)["card"], Decimal("30.00"))
+
+        card.delete()
+        self.assertEqual(self._assert_matches_recompute(other)["card"], Decimal("0.00"))
+
+    def test_deferred_payment_edit_uses_persisted_values(self):
+        payment = Payment.objects.create(order=self.order, cash_session=self.session, amount=Decimal("50.00"))
+        payment = Payment.objects.only("id", "order", "notes").get(pk=payment.pk)
+        payment.amount = Decimal("20.00")
+        payment.save()
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.paid_amount, Decimal("20.00"))
+        self.assertEqual(self._assert_matches_recompute(self.session)["cash"], Decimal("20.00"))
+
+    def test_movement_writes_keep_running_totals(self):
+        movement = CashMovement.objects.create(
+            cash_session=self.session, movement_type=CashMovement.MovementType.EXPENSE, amount=Decimal("15.00"), concept="Jabon"
+        )
+        CashMovement.objects.create(
+            cash_session=self.session, movement_type=CashMovement.MovementType.INCOME, amount=Decimal("10.00"), concept="Fondo"
+        )
+        self.assertEqual(self._assert_matches_recompute(self.session)["expected_cash"], Decimal("95.00"))
+
+        movement = CashMovement.objects.get(pk=movement.pk)
+        movement.movement_type = CashMovement.MovementType.ADJUSTMENT
+        movement.amount = Decimal("5.00")
+        movement.save()
+        self.assertEqual(self._assert_matches_recompute(self.session)["expected_cash"], Decimal("115.00"))
+
+        movement.delete()
+        self.assertEqual(self._assert_matches_recompute(self.session)["expected_cash"], Decimal("110.00"))
+
+    def test_cascade_and_queryset_deletes_keep_running_totals(self):
+        Payment.objects.create(order=self.order, cash_session=self.session, amount=Decimal("50.00"))
+        other_order = Order.objects.create(customer=self.order.customer)
+        Payment.objects.create(order=other_order, cash_session=self.session, amount=Decimal("30.00"), method="card")
+        CashMovement.objects.create(
+            cash_session=self.session, movement_type=CashMovement.MovementType.EXPENSE, amount=Decimal("15.00"), concept="Jabon"
+        )
+
+        self.order.delete()
+        summary = CashSession.objects.get(pk=self.session.pk).summary()
+        self.assertEqual((summary["cash"], summary["expected_cash"]), (Decimal("0.00"), Decimal("85.00")))
+
+        Payment.objects.filter(order=other_order).delete()
+        CashMovement.objects.filter(cash_session=self.session).delete()
+        summary = self._assert_matches_recompute(self.session)
+        self.assertEqual((summary["card"], summary["expected_cash"]), (Decimal("0.00"), Decimal("100.00")))
+
+    def test_queryset_updates_recompute_running_totals(self):
+        Payment.objects.create(order=self.order, cash_session=self.session, amount=Decimal("50.00"))
+        other = CashSession.objects.create(user=self.cashier, shift=CashSession.Shift.EVENING, closed_at=self.session.opened_at)
+
+        Payment.objects.filter(order=self.order).update(method=Payment.Method.CARD)
+        self.assertEqual(self._assert_matches_recompute(self.session)["card"], Decimal("50.00"))
+
+        Payment.objects.filter(order=self.order).update(cash_session=other)
+        self.assertEqual(self._assert_matches_recompute(self.session)["card"], Decimal("0.00"))
+        self.assertEqual(self._assert_matches_recompute(other)["card"], Decimal("50.00"))
+
+    def test_saving_a_stale_session_keeps_running_totals(self):
+        stale = CashSession.objects.get(pk=self.session.pk)
+        Payment.objects.create(order=self.order, cash_session=self.session, amount=Decimal("20.00"))
+
+        stale.notes = "Revisada"
+        stale.save()
+
+        self.assertEqual(CashSession.objects.get(pk=self.session.pk).cash_total, Decimal("20.00"))
+
+    def test_reconcile_command_reports_and_fixes_drift(self):
+        Payment.objects.create(order=self.order, cash_session=self.session, amount=Decimal("20.00"))
+        CashSession.objects.filter(pk=self.session.pk).update(cash_total=Decimal("0.00"))
+
+        with self.assertRaises(SystemExit):
+            call_command("reconcile_cash_session_totals", stdout=StringIO(), stderr=StringIO())
+        call_command("reconcile_cash_session_totals", "--fix", stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(CashSession.objects.get(pk=self.session.pk).cash_total, Decimal("20.00"))
+        out = StringIO()
+        call_command("reconcile_cash_session_totals", stdout=out)
+        self.assertIn("sin diferencias", out.getvalue())
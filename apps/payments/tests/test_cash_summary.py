@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.customers.models import Customer
+from apps.orders.models import Order
+from apps.payments.models import CashMovement, CashSession, Payment
+
+
+class CashSessionSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user(username="manager_summary", password="StrongPass123!")
+        self.manager.groups.add(Group.objects.get(name="Encargada"))
+        self.manager.user_permissions.add(Permission.objects.get(codename="view_cashsession"))
+        self.order = Order.objects.create(customer=Customer.objects.create(first_name="Sara", phone="5520005000"))
+
+    def _session(self, index):
+        user = User.objects.create_user(username=f"cashier_{index}", password="StrongPass123!")
+        session = CashSession.objects.create(user=user, shift=CashSession.Shift.MORNING, opening_amount=Decimal("100.00"))
+        Payment.objects.create(order=self.order, cash_session=session, amount=Decimal("50.00"), method=Payment.Method.CASH)
+        Payment.objects.create(order=self.order, cash_session=session, amount=Decimal("30.00"), method=Payment.Method.CARD)
+        Payment.objects.create(
+            order=self.order,
+            cash_session=session,
+            amount=Decimal("99.00"),
+            method=Payment.Method.CASH,
+            status=Payment.Status.VOID,
+        )
+        CashMovement.objects.create(
+            cash_session=session, movement_type=CashMovement.MovementType.INCOME, amount=Decimal("10.00"), concept="Fondo"
+        )
+        CashMovement.objects.create(
+            cash_session=session, movement_type=CashMovement.MovementType.EXPENSE, amount=Decimal("15.00"), concept="Jabon"
+        )
+        CashMovement.objects.create(
+            cash_session=session, movement_type=CashMovement.MovementType.ADJUSTMENT, amount=Decimal("5.00"), concept="Ajuste"
+        )
+        return session
+
+    def test_summary_reads_running_totals_without_queries(self):
+        session = CashSession.objects.get(pk=self._session(1).pk)
+
+        with self.assertNumQueries(0):
+            summary = session.summary()
+
+        self.assertEqual(summary["cash"], Decimal("50.00"))
+        self.assertEqual(summary["card"], Decimal("30.00"))
+        self.assertEqual(summary["income_total"], Decimal("80.00"))
+        self.assertEqual(summary["movement_income_total"], Decimal("10.00"))
+        self.assertEqual(summary["expense_total"], Decimal("15.00"))
+        self.assertEqual(summary["adjustment_total"], Decimal("5.00"))
+        self.assertEqual(summary["generated_total"], Decimal("90.00"))
+        self.assertEqual(summary["net_gain"], Decimal("75.00"))
+        self.assertEqual(summary["expected_cash"], Decimal("150.00"))
+
+    def test_session_list_query_count_does_not_grow_with_sessions(self):
+        self.client.force_login(self.manager)
+
+        def count_list_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get("/api/payments/sessions/")
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        for index in range(2):
+            self._session(index)
+        count_list_queries()
+        small = count_list_queries()
+        for index in range(2, 10):
+            self._session(index)
+        large = count_list_queries()
+
+        self.assertEqual(small, large)
+
+    def test_session_list_reads_running_totals(self):
+        for index in range(5):
+            self._session(index)
+        self.client.force_login(self.manager)
+        self.client.get("/api/payments/sessions/")
+
+        # Session load, user, credential policy, two permission lookups, the
+        # session list and the session touch (3 statements); roles are cached.
+        with self.assertNumQueries(9):
+            response = self.client.get("/api/payments/sessions/")
+
+        self.assertEqual(response.status_code, 200)
+        for row in response.json():
+            self.assertEqual(Decimal(str(row["summary"]["expected_cash"])), Decimal("150.00"))
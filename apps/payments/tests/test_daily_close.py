@@ -0,0 +1,103 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.customers.models import Customer
+from apps.orders.models import Order
+from apps.payments.models import CashMovement, CashSession, Payment
+from apps.payments.services import compute_daily_close, get_daily_close
+
+
+class DailyCloseTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+        cls.manager = User.objects.create_user(username="manager_close", password="StrongPass123!")
+        cls.manager.groups.add(Group.objects.get(name="Encargada"))
+        cls.order = Order.objects.create(customer=Customer.objects.create(first_name="Cierre", phone="5520004000"))
+        cls.cashiers = []
+        for index, shift in enumerate([CashSession.Shift.MORNING, CashSession.Shift.EVENING]):
+            user = User.objects.create_user(
+                username=f"cashier_close_{index}", first_name="Caja", last_name=str(index), password="StrongPass123!"
+            )
+            session = CashSession.objects.create(user=user, shift=shift, opening_amount=Decimal("100.00"))
+            Payment.objects.create(order=cls.order, cash_session=session, captured_by=user, amount=Decimal("50.00"))
+            Payment.objects.create(
+                order=cls.order,
+                cash_session=session,
+                captured_by=user,
+                amount=Decimal("30.00"),
+                method=Payment.Method.CARD,
+            )
+            CashMovement.objects.create(
+                cash_session=session, movement_type=CashMovement.MovementType.EXPENSE, amount=Decimal("15.00"), concept="Jabon"
+            )
+            cls.cashiers.append(user)
+        CashMovement.objects.create(
+            cash_session=session, movement_type=CashMovement.MovementType.INCOME, amount=Decimal("10.00"), concept="Fondo"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+    def test_close_is_computed_with_two_grouped_queries(self):
+        with self.assertNumQueries(2):
+            close = compute_daily_close(self.today)
+
+        self.assertEqual(close["totals"]["cash"], Decimal("100.00"))
+        self.assertEqual(close["totals"]["card"], Decimal("60.00"))
+        self.assertEqual(close["totals"]["income_total"], Decimal("160.00"))
+        self.assertEqual(close["totals"]["movement_income_total"], Decimal("10.00"))
+        self.assertEqual(close["totals"]["movement_expense_total"], Decimal("30.00"))
+        self.assertEqual(close["totals"]["net_gain"], Decimal("140.00"))
+        self.assertEqual(close["expected_cash_total"], Decimal("280.00"))
+        self.assertEqual([row["total"] for row in close["by_employee"]], [Decimal("80.00"), Decimal("80.00")])
+        self.assertEqual(close["by_employee"][0]["payments_count"], 2)
+        self.assertEqual(close["employees_by_shift"], {"Mañana": ["Caja 0"], "Tarde": ["Caja 1"]})
+
+    def test_session_figures_match_session_summary(self):
+        close = compute_daily_close(self.today)
+
+        for row in close["sessions_summary"]:
+            summary = CashSession.objects.get(pk=row["session_id"]).summary()
+            self.assertEqual(row["expected_cash"], summary["expected_cash"])
+            self.assertEqual(row["net_gain"], summary["net_gain"])
+
+    def test_screen_and_print_share_one_computation(self):
+        self.client.force_login(self.manager)
+        self.client.get("/desk/cash/daily/")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/desk/cash/daily/print/")
+
+        self.assertEqual(response.status_code, 200)
+        sql = " ".join(query["sql"] for query in ctx.captured_queries)
+        self.assertNotIn("payments_payment", sql)
+        self.assertNotIn("payments_cashmovement", sql)
+
+    def test_writes_drop_the_memoized_day(self):
+        self.assertEqual(get_daily_close(self.today)["totals"]["cash"], Decimal("100.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Payment.objects.create(order=self.order, captured_by=self.cashiers[0], amount=Decimal("5.00"))
+
+        self.assertEqual(get_daily_close(self.today)["totals"]["cash"], Decimal("105.00"))
+        yesterday = get_daily_close(self.today - timedelta(days=1))
+        self.assertEqual(yesterday["totals"]["income_total"], Decimal("0.00"))
+
+    @override_settings(LOCAL_CACHE_MAX_SECONDS=30)
+    def test_memoized_close_is_short_lived_on_local_cache(self):
+        with patch.object(cache, "set", wraps=cache.set) as cache_set:
+            get_daily_close(self.today - timedelta(days=3))
+            get_daily_close(self.today)
+
+        self.assertEqual([call.args[2] for call in cache_set.call_args_list], [30, 30])
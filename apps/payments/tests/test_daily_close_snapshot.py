@@ -0,0 +1,129 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.customers.models import Customer
+from apps.orders.models import Order
+from apps.payments.models import CashMovement, CashSession, DailyCloseSnapshot, Payment
+from apps.payments.services import get_daily_close, snapshot_daily_close
+
+
+class DailyCloseSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+        cls.manager = User.objects.create_user(username="manager_snapshot", password="StrongPass123!")
+        cls.manager.groups.add(Group.objects.get(name="Encargada"))
+        cls.order = Order.objects.create(customer=Customer.objects.create(first_name="Zeta", phone="5520006000"))
+
+    def setUp(self):
+        cache.clear()
+        self.yesterday = timezone.localdate() - timedelta(days=1)
+        self.moment = timezone.now() - timedelta(days=1)
+
+    def _session(self, index, closed=True):
+        user = User.objects.create_user(username=f"cashier_snapshot_{index}", password="StrongPass123!")
+        session = CashSession.objects.create(
+            user=user,
+            shift=CashSession.Shift.MORNING,
+            opened_at=self.moment,
+            opening_amount=Decimal("100.00"),
+            closed_at=self.moment + timedelta(hours=1) if closed else None,
+            closing_amount=Decimal("150.00") if closed else None,
+        )
+        Payment.objects.create(
+            order=self.order, cash_session=session, captured_by=user, amount=Decimal("40.00"), paid_at=self.moment
+        )
+        CashMovement.objects.create(
+            cash_session=session,
+            movement_type=CashMovement.MovementType.INCOME,
+            amount=Decimal("5.00"),
+            concept="Fondo",
+            occurred_at=self.moment,
+        )
+        return session
+
+    def test_closing_the_last_session_of_the_day_stores_the_snapshot(self):
+        self._session(1)
+        cashier = User.objects.create_user(username="cashier_snapshot_desk", password="StrongPass123!")
+        session = CashSession.objects.create(user=cashier, shift=CashSession.Shift.EVENING, opened_at=self.moment)
+        self.client.force_login(cashier)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/desk/cash/", {"action": "close", "closing_amount": "0"})
+
+        snapshot = DailyCloseSnapshot.objects.get(report_date=self.yesterday)
+        self.assertEqual(snapshot.sessions_count, 2)
+        self.assertEqual(snapshot.payments_count, 1)
+        self.assertEqual(snapshot.cash, Decimal("40.00"))
+        self.assertEqual(snapshot.expected_cash_total, Decimal("145.00"))
+        self.assertEqual(snapshot.closing_difference_total, Decimal("5.00"))
+        self.assertEqual([row["session_id"] for row in snapshot.sessions][-1], session.pk)
+        self.assertTrue(snapshot.is_intact)
+
+    def test_day_with_open_sessions_is_not_stored(self):
+        self._session(1)
+        self._session(2, closed=False)
+
+        self.assertIsNone(snapshot_daily_close(self.yesterday))
+        self.assertFalse(DailyCloseSnapshot.objects.exists())
+
+    def test_past_day_renders_from_the_snapshot(self):
+        self._session(1)
+        snapshot_daily_close(self.yesterday)
+        live = get_daily_close(timezone.localdate())
+
+        with self.assertNumQueries(1):
+            close = get_daily_close(self.yesterday)
+        self.assertEqual(close["totals"]["income_total"], Decimal("40.00"))
+        self.assertEqual(close["sessions_summary"][0]["difference"], Decimal("5.00"))
+        self.assertEqual(close["by_employee"][0]["total"], Decimal("40.00"))
+        self.assertEqual(set(close) - {"snapshot"}, set(live))
+
+        self.client.force_login(self.manager)
+        for url in ("/desk/cash/daily/", "/desk/cash/daily/print/"):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url, {"date": self.yesterday.isoformat()})
+            self.assertContains(response, close["snapshot"].content_hash[:12])
+            self.assertContains(response, "$40.00")
+            sql = " ".join(query["sql"] for query in ctx.captured_queries)
+            for table in ("payments_payment", "payments_cashmovement", "payments_cashsession"):
+                self.assertNotIn(table, sql)
+
+    def test_snapshots_are_immutable_and_tampering_is_detected(self):
+        self._session(1)
+        snapshot = snapshot_daily_close(self.yesterday)
+
+        with self.assertRaises(ValueError):
+            snapshot.save()
+
+        DailyCloseSnapshot.objects.filter(pk=snapshot.pk).update(net_gain=Decimal("999.00"))
+        self.assertFalse(DailyCloseSnapshot.objects.get(pk=snapshot.pk).is_intact)
+        with self.assertRaisesMessage(CommandError, "1 cierres requieren revision"):
+            call_command("rebuild_daily_closes", "--from", self.yesterday.isoformat(), "--check", stderr=StringIO())
+
+    def test_rebuild_replaces_snapshots_that_drifted(self):
+        session = self._session(1)
+        original = snapshot_daily_close(self.yesterday)
+        Payment.objects.create(
+            order=self.order, cash_session=session, amount=Decimal("10.00"), method=Payment.Method.CARD, paid_at=self.moment
+        )
+        self.assertEqual(snapshot_daily_close(self.yesterday).card, Decimal("10.00"))
+        DailyCloseSnapshot.objects.all().delete()
+        DailyCloseSnapshot.objects.bulk_create([original])
+
+        call_command("rebuild_daily_closes", "--from", self.yesterday.isoformat(), stdout=StringIO())
+
+        rebuilt = DailyCloseSnapshot.objects.get(report_date=self.yesterday)
+        self.assertEqual(rebuilt.card, Decimal("10.00"))
+        self.assertTrue(rebuilt.is_intact)
+        call_command("rebuild_daily_closes", "--from", self.yesterday.isoformat(), "--check", stdout=StringIO())
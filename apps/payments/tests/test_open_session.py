@@ -0,0 +1,105 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.customers.models import Customer
+from apps.orders.models import Order
+from apps.payments.models import CashSession, Payment
+from apps.payments.selectors import OPEN_SESSION_CACHE_PREFIX, OPEN_SESSION_FIELDS, open_cash_session
+
+
+def open_session_lookups(ctx):
+    return [query["sql"] for query in ctx.captured_queries if '"closed_at" IS NULL' in query["sql"]]
+
+
+class OpenCashSessionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_roles")
+
+    def setUp(self):
+        cache.clear()
+        self.cashier = User.objects.create_user(username="cashier_open", password="StrongPass123!")
+        self.cashier.groups.add(Group.objects.get(name="Vendedora"))
+        self.session = CashSession.objects.create(
+            user=self.cashier, shift=CashSession.Shift.MORNING, opening_amount=Decimal("100.00")
+        )
+        self.order = Order.objects.create(customer=Customer.objects.create(first_name="Olga", phone="5520008000"))
+
+    def test_lookup_is_memoized_per_request(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(open_cash_session(self.cashier), self.session)
+            self.assertIs(open_cash_session(self.cashier), open_cash_session(self.cashier))
+
+        other_request_user = User.objects.get(pk=self.cashier.pk)
+        with self.assertNumQueries(1):
+            session = open_cash_session(other_request_user)
+        self.assertEqual((session.pk, session.shift), (self.session.pk, self.session.shift))
+
+    def test_running_totals_load_on_demand(self):
+        Payment.objects.create(order=self.order, captured_by=self.cashier, amount=Decimal("40.00"))
+        session = open_cash_session(User.objects.get(pk=self.cashier.pk))
+        self.assertEqual(Payment.objects.get().cash_session_id, session.pk)
+        Payment.objects.create(order=self.order, cash_session=session, amount=Decimal("10.00"))
+
+        with self.assertNumQueries(1):
+            summary = session.summary()
+
+        self.assertEqual(summary["cash"], Decimal("50.00"))
+        self.assertEqual(summary["expected_cash"], Decimal("150.00"))
+
+    def test_opening_and_closing_drop_the_memoized_session(self):
+        self.client.force_login(self.cashier)
+        self.assertIsNotNone(open_cash_session(self.cashier))
+
+        self.session.closed_at = timezone.now()
+        self.session.closing_amount = Decimal("100.00")
+        self.session.save()
+        self.assertIsNone(open_cash_session(self.cashier))
+
+        self.client.post("/desk/cash/", {"action": "open", "shift": "evening", "opening_amount": "50"})
+        reopened = open_cash_session(User.objects.get(pk=self.cashier.pk))
+        self.assertEqual(reopened.shift, CashSession.Shift.EVENING)
+
+    def test_shared_cache_serves_later_requests_until_the_session_closes(self):
+        with patch("apps.payments.selectors.uses_local_cache", return_value=False):
+            with self.captureOnCommitCallbacks(execute=True):
+                open_cash_session(self.cashier)
+
+            other_request_user = User.objects.get(pk=self.cashier.pk)
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(open_cash_session(other_request_user), self.session)
+                Payment.objects.create(order=self.order, captured_by=other_request_user, amount=Decimal("10.00"))
+            self.assertEqual(open_session_lookups(ctx), [])
+            self.assertEqual(Payment.objects.get().cash_session_id, self.session.pk)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.session.closed_at = timezone.now()
+                self.session.closing_amount = Decimal("110.00")
+                self.session.save()
+            self.assertIsNone(open_cash_session(User.objects.get(pk=self.cashier.pk)))
+
+    def test_local_cache_is_not_shared_across_requests(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            open_cash_session(self.cashier)
+
+        self.assertIsNone(cache.get(f"{OPEN_SESSION_CACHE_PREFIX}:{self.cashier.pk}"))
+
+    def test_quick_payment_attaches_the_open_session(self):
+        self.client.force_login(self.cashier)
+        self.client.post(f"/desk/orders/{self.order.pk}/quick/", {"action": "pay", "amount": "10", "method": "cash"})
+
+        self.assertEqual(Payment.objects.get(order=self.order).cash_session, self.session)
+        self.assertEqual(CashSession.objects.get(pk=self.session.pk).cash_total, Decimal("10.00"))
+
+    def test_lookup_uses_the_open_session_constraint_index(self):
+        plan = CashSession.objects.filter(user=self.cashier, closed_at__isnull=True).values(*OPEN_SESSION_FIELDS).explain()
+
+        self.assertIn("uniq_open_cash_session_per_user", plan)
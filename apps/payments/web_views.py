@@ -1,9 +1,7 @@
 from decimal import Decimal, InvalidOperation
-from collections import defaultdict
 
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import transaction
-from django.db.models import Count, Q, Sum
 from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.views import View
@@ -11,6 +9,8 @@ from django.views import View
 from apps.orders.models import Order
 
 from .models import CashMovement, CashSession, Payment
+from .selectors import open_cash_session
+from .services import get_daily_close
 
 
 class DeskCashSessionView(LoginRequiredMixin, View):
@@ -95,7 +95,7 @@ class DeskCashSessionView(LoginRequiredMixin, View):
 
     def _create_movement(self, request):
         errors = []
-        session = CashSession.objects.filter(user=request.user, closed_at__isnull=True).order_by("-opened_at").first()
+        session = open_cash_session(request.user)
         if not session:
             errors.append("Debes abrir caja antes de registrar movimientos.")
             return self._render(errors=errors)
@@ -134,7 +134,7 @@ class DeskCashSessionView(LoginRequiredMixin, View):
         return redirect("desk-cash")
 
     def _render(self, errors=None):
-        open_session = CashSession.objects.filter(user=self.request.user, closed_at__isnull=True).order_by("-opened_at").first()
+        open_session = open_cash_session(self.request.user)
         last_sessions = CashSession.objects.filter(user=self.request.user).order_by("-opened_at")[:10]
         selected_session_id = self.request.GET.get("session", "").strip()
 
@@ -260,88 +260,13 @@ class DeskCashDailyCloseView(LoginRequiredMixin, View):
         else:
             report_date = timezone.localdate()
 
-        sessions_today = CashSession.objects.select_related("user").filter(opened_at__date=report_date).order_by("opened_at")
-        payments_today = Payment.objects.select_related("order", "captured_by", "cash_session").filter(
-            status=Payment.Status.APPLIED,
-            paid_at__date=report_date,
-        )
-        movements_today = CashMovement.objects.filter(occurred_at__date=report_date)
-
-        totals = {
-            "cash": payments_today.filter(method="cash").aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-            "card": payments_today.filter(method="card").aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-            "transfer": payments_today.filter(method="transfer").aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-            "other": payments_today.filter(method="other").aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-        }
-        totals["income_total"] = sum(totals.values(), Decimal("0.00"))
-        totals["movement_income_total"] = (
-            movements_today.filter(movement_type=CashMovement.MovementType.INCOME).aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
-        )
-        totals["movement_expense_total"] = (
-            movements_today.filter(movement_type=CashMovement.MovementType.EXPENSE).aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
-        )
-        totals["movement_adjustment_total"] = (
-            movements_today.filter(movement_type=CashMovement.MovementType.ADJUSTMENT).aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
-        )
-        totals["generated_total"] = totals["income_total"] + totals["movement_income_total"]
-        totals["net_gain"] = totals["generated_total"] - totals["movement_expense_total"]
-
-        by_employee = (
-            payments_today.values(
-                "captured_by_id",
-                "captured_by__username",
-                "captured_by__first_name",
-                "captured_by__last_name",
-            )
-            .annotate(total=Sum("amount"), payments_count=Count("id"))
-            .order_by("-total")
-        )
-
         pending_orders = (
             Order.objects.select_related("customer")
             .filter(balance__gt=0)
             .exclude(status__in=[Order.Status.DELIVERED, Order.Status.CANCELLED])
             .order_by("-updated_at")[:50]
         )
-
-        sessions_summary = []
-        employees_by_shift = defaultdict(list)
-        expected_cash_total = Decimal("0.00")
-        closing_difference_total = Decimal("0.00")
-        for session in sessions_today:
-            session_totals = session.summary()
-            expected_cash_total += session_totals["expected_cash"]
-            session_difference = None
-            if session.closing_amount is not None:
-                session_difference = session.closing_amount - session_totals["expected_cash"]
-                closing_difference_total += session_difference
-            sessions_summary.append(
-                {
-                    "session": session,
-                    "expected_cash": session_totals["expected_cash"],
-                    "income_total": session_totals["income_total"],
-                    "generated_total": session_totals["generated_total"],
-                    "net_gain": session_totals["net_gain"],
-                    "difference": session_difference,
-                }
-            )
-            full_name = f"{session.user.first_name} {session.user.last_name}".strip() or session.user.username
-            if full_name not in employees_by_shift[session.get_shift_display()]:
-                employees_by_shift[session.get_shift_display()].append(full_name)
-
-        return {
-            "report_date": report_date,
-            "totals": totals,
-            "expected_cash_total": expected_cash_total,
-            "closing_difference_total": closing_difference_total,
-            "sessions_summary": sessions_summary,
-            "employees_by_shift": dict(employees_by_shift),
-            "by_employee": by_employee,
-            "pending_orders": pending_orders,
-        }
+        return {**get_daily_close(report_date), "pending_orders": pending_orders}
 
 
 class DeskCashDailyPrintView(DeskCashDailyCloseView):
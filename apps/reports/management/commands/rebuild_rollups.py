@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.reports.services import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalcula el resumen diario de ventas desde pagos e items para un rango de fechas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", required=True, help="Fecha inicial (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="date_to", help="Fecha final (YYYY-MM-DD); por defecto hoy.")
+
+    def handle(self, *args, **options):
+        try:
+            date_from = date.fromisoformat(options["date_from"])
+            date_to = date.fromisoformat(options["date_to"]) if options["date_to"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("Las fechas deben tener formato YYYY-MM-DD.") from None
+        if date_from > date_to:
+            raise CommandError("--from no puede ser posterior a --to.")
+
+        rows = rebuild_rollups(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f"Resumen diario recalculado de {date_from} a {date_to}: {rows} filas."))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('catalog', '0005_servicepricehistory_servicepromotion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('kind', models.CharField(choices=[('payment', 'Pago'), ('item', 'Servicio')], max_length=10)),
+                ('bucket', models.CharField(max_length=64)),
+                ('method', models.CharField(blank=True, max_length=20)),
+                ('service_category', models.CharField(blank=True, max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('quantity', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('entries', models.IntegerField(default=0)),
+                ('seller', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.service')),
+            ],
+            options={
+                'ordering': ['-day', 'kind', 'bucket'],
+                'indexes': [models.Index(fields=['kind', 'day'], name='reports_dai_kind_d99e85_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'kind', 'bucket'), name='uniq_daily_sales_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import models
+
+from apps.catalog.models import Service
+
+
+class DailySalesRollup(models.Model):
+    """
+    Pre-aggregated sales per local day. Payment rows are keyed by seller and
+    payment method; item rows are keyed by service, with the category copied
+    at write time so category reports do not need to join the catalog.
+    """
+
+    class Kind(models.TextChoices):
+        PAYMENT = "payment", "Pago"
+        ITEM = "item", "Servicio"
+
+    day = models.DateField()
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    bucket = models.CharField(max_length=64)
+    seller = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    method = models.CharField(max_length=20, blank=True)
+    service = models.ForeignKey(
+        Service,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    service_category = models.CharField(max_length=20, blank=True)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    quantity = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entries = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day", "kind", "bucket"]
+        constraints = [
+            models.UniqueConstraint(fields=["day", "kind", "bucket"], name="uniq_daily_sales_rollup_bucket"),
+        ]
+        indexes = [
+            models.Index(fields=["kind", "day"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.kind} {self.bucket}"
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from apps.catalog.models import Service
+from apps.common.utils import local_date_range
+from apps.orders.models import Order, OrderItem
+from apps.payments.models import Payment
+
+from .models import DailySalesRollup
+
+ZERO = Decimal("0.00")
+
+
+def split_range(date_from, date_to):
+    """
+    Splits ``[date_from, date_to]`` into the closed days served by the rollup
+    and the current day, which is always aggregated from raw rows.
+    """
+    today = timezone.localdate()
+    history_to = min(date_to, today - timedelta(days=1))
+    history = (date_from, history_to) if date_from <= history_to else None
+    live_day = today if date_from <= today <= date_to else None
+    return history, live_day
+
+
+def _payment_buckets(date_from, date_to, group_by):
+    history, live_day = split_range(date_from, date_to)
+    buckets = defaultdict(lambda: {"total": ZERO, "count": 0})
+
+    if history:
+        rows = (
+            DailySalesRollup.objects.filter(kind=DailySalesRollup.Kind.PAYMENT, day__gte=history[0], day__lte=history[1])
+            .values(group_by["rollup"])
+            .annotate(total=Sum("amount"), count=Sum("entries"))
+        )
+        for row in rows:
+            bucket = buckets[row[group_by["rollup"]]]
+            bucket["total"] += row["total"] or ZERO
+            bucket["count"] += row["count"] or 0
+
+    if live_day:
+        rows = (
+            Payment.objects.filter(status=Payment.Status.APPLIED, **local_date_range("paid_at", live_day))
+            .values(group_by["raw"])
+            .annotate(total=Sum("amount"), count=Count("id"))
+        )
+        for row in rows:
+            bucket = buckets[row[group_by["raw"]]]
+            bucket["total"] += row["total"] or ZERO
+            bucket["count"] += row["count"]
+
+    return {key: values for key, values in buckets.items() if values["count"]}
+
+
+def sales_by_method(date_from, date_to):
+    buckets = _payment_buckets(date_from, date_to, {"rollup": "method", "raw": "method"})
+    rows = [{"method": method, **values} for method, values in buckets.items()]
+    return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+
+def sales_total(date_from, date_to):
+    return sum((row["total"] for row in sales_by_method(date_from, date_to)), ZERO)
+
+
+def sales_by_seller(date_from, date_to):
+    buckets = _payment_buckets(date_from, date_to, {"rollup": "seller_id", "raw": "captured_by_id"})
+    users = get_user_model().objects.only("username", "first_name", "last_name").in_bulk(
+        [seller_id for seller_id in buckets if seller_id]
+    )
+
+    rows = []
+    for seller_id, values in buckets.items():
+        user = users.get(seller_id)
+        rows.append(
+            {
+                "captured_by_id": seller_id,
+                "captured_by__username": user.username if user else None,
+                "captured_by__first_name": user.first_name if user else None,
+                "captured_by__last_name": user.last_name if user else None,
+                "total": values["total"],
+                "payments_count": values["count"],
+            }
+        )
+    return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+
+def service_sales(date_from, date_to):
+    """Sales per service for orders received in the range, excluding cancelled orders."""
+    history, live_day = split_range(date_from, date_to)
+    buckets = defaultdict(lambda: {"total": ZERO, "quantity": ZERO, "count": 0, "category": ""})
+
+    if history:
+        rows = (
+            DailySalesRollup.objects.filter(kind=DailySalesRollup.Kind.ITEM, day__gte=history[0], day__lte=history[1])
+            .values("service_id", "service_category")
+            .annotate(total=Sum("amount"), quantity=Sum("quantity"), count=Sum("entries"))
+        )
+        for row in rows:
+            bucket = buckets[row["service_id"]]
+            bucket["category"] = row["service_category"]
+            bucket["total"] += row["total"] or ZERO
+            bucket["quantity"] += row["quantity"] or ZERO
+            bucket["count"] += row["count"] or 0
+
+    if live_day:
+        rows = (
+            OrderItem.objects.exclude(order__status=Order.Status.CANCELLED)
+            .filter(**local_date_range("order__received_at", live_day))
+            .values("service_id", "service__category")
+            .annotate(total=Sum("total"), quantity=Sum("quantity"), count=Count("id"))
+        )
+        for row in rows:
+            bucket = buckets[row["service_id"]]
+            bucket["category"] = row["service__category"]
+            bucket["total"] += row["total"] or ZERO
+            bucket["quantity"] += row["quantity"] or ZERO
+            bucket["count"] += row["count"]
+
+    names = dict(Service.objects.filter(pk__in=[pk for pk in buckets if pk]).values_list("pk", "name"))
+    rows = [
+        {
+            "service_id": service_id,
+            "service__name": names.get(service_id, ""),
+            "service__category": values["category"],
+            "total": values["total"],
+            "quantity": values["quantity"],
+            "count": values["count"],
+        }
+        for service_id, values in buckets.items()
+        if values["count"]
+    ]
+    return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+
+def category_sales(date_from, date_to, services=None):
+    services = service_sales(date_from, date_to) if services is None else services
+    buckets = defaultdict(lambda: {"total": ZERO, "items_count": 0})
+    for row in services:
+        bucket = buckets[row["service__category"]]
+        bucket["total"] += row["total"]
+        bucket["items_count"] += row["count"]
+    return [{"service__category": category, **values} for category, values in sorted(buckets.items())]
@@ -0,0 +1,215 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+from threading import local
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.common.utils import local_day_bounds
+from apps.orders.models import Order, OrderItem
+from apps.payments.models import Payment
+
+from .models import DailySalesRollup
+
+ZERO = Decimal("0.00")
+_UPSERT_FIELDS = ("day", "kind", "bucket", "seller_id", "method", "service_id", "service_category", "amount", "quantity", "entries")
+_detached_orders = local()
+
+
+def order_rollup_day(order):
+    """Day the order's items count towards, or ``None`` if they do not count."""
+    if order.status == Order.Status.CANCELLED:
+        return None
+    return timezone.localdate(order.received_at)
+
+
+def payment_key(payment):
+    if payment.status != Payment.Status.APPLIED:
+        return None
+    return (
+        timezone.localdate(payment.paid_at),
+        DailySalesRollup.Kind.PAYMENT,
+        f"{payment.captured_by_id or 0}:{payment.method}",
+        payment.captured_by_id,
+        payment.method,
+        None,
+        "",
+    )
+
+
+def item_key(day, service_id, category):
+    return (day, DailySalesRollup.Kind.ITEM, str(service_id), None, "", service_id, category)
+
+
+class RollupDelta:
+    """
+    Accumulates signed contributions per rollup row and writes them with a
+    single ``INSERT ... ON CONFLICT DO UPDATE`` that increments the counters.
+    """
+
+    def __init__(self):
+        self._rows = defaultdict(lambda: [ZERO, ZERO, 0])
+
+    def add(self, key, amount, quantity=ZERO, entries=1, sign=1):
+        if key is None:
+            return
+        row = self._rows[key]
+        row[0] += sign * Decimal(amount)
+        row[1] += sign * Decimal(quantity)
+        row[2] += sign * entries
+
+    def add_payment(self, payment, sign=1):
+        self.add(payment_key(payment), payment.amount, sign=sign)
+
+    def add_item(self, day, service_id, category, total, quantity, sign=1):
+        self.add(item_key(day, service_id, category), total, quantity, sign=sign)
+
+    def apply(self):
+        rows = [(key, values) for key, values in self._rows.items() if any(values)]
+        self._rows.clear()
+        if not rows:
+            return 0
+
+        table = connection.ops.quote_name(DailySalesRollup._meta.db_table)
+        fields = {field.attname: field for field in DailySalesRollup._meta.concrete_fields}
+        columns = ", ".join(connection.ops.quote_name(fields[name].column) for name in _UPSERT_FIELDS)
+        placeholders = "(" + ", ".join(["%s"] * len(_UPSERT_FIELDS)) + ")"
+        counters = ", ".join(
+            f"{quoted} = {table}.{quoted} + excluded.{quoted}"
+            for quoted in (connection.ops.quote_name(name) for name in ("amount", "quantity", "entries"))
+        )
+        conflict = ", ".join(connection.ops.quote_name(name) for name in ("day", "kind", "bucket"))
+
+        params = []
+        for key, values in rows:
+            for name, value in zip(_UPSERT_FIELDS, (*key, *values)):
+                params.append(fields[name].get_db_prep_save(value, connection))
+
+        sql = (
+            f"INSERT INTO {table} ({columns}) VALUES {', '.join([placeholders] * len(rows))} "
+            f"ON CONFLICT ({conflict}) DO UPDATE SET {counters}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+        return len(rows)
+
+
+def record_bulk_sales(*, items=(), payments=()):
+    """
+    Adds freshly bulk-created items and payments to the rollup. ``bulk_create``
+    does not send model signals, so bulk writers must call this explicitly.
+    Items need ``order`` and ``service`` loaded.
+    """
+    delta = RollupDelta()
+    for item in items:
+        day = order_rollup_day(item.order)
+        if day is not None:
+            delta.add_item(day, item.service_id, item.service.category, item.total, item.quantity)
+    for payment in payments:
+        delta.add_payment(payment)
+    return delta.apply()
+
+
+def move_order_items(order_id, *, old_day=None, new_day=None):
+    """Moves every item of an order out of ``old_day`` and into ``new_day``."""
+    delta = RollupDelta()
+    rows = (
+        OrderItem.objects.filter(order_id=order_id)
+        .values("service_id", "service__category")
+        .annotate(total=Sum("total"), quantity=Sum("quantity"), entries=Count("id"))
+    )
+    for row in rows:
+        for day, sign in ((old_day, -1), (new_day, 1)):
+            if day is not None:
+                delta.add(
+                    item_key(day, row["service_id"], row["service__category"]),
+                    row["total"],
+                    row["quantity"],
+                    entries=row["entries"],
+                    sign=sign,
+                )
+    return delta.apply()
+
+
+def detach_order(order):
+    """
+    Takes all the items of ``order`` out of the rollup with one grouped query
+    so the per-item delete signals that follow can be skipped.
+    """
+    day = order_rollup_day(order)
+    if day is not None:
+        move_order_items(order.pk, old_day=day)
+    if not hasattr(_detached_orders, "ids"):
+        _detached_orders.ids = set()
+    _detached_orders.ids.add(order.pk)
+
+
+def release_order(order_id):
+    getattr(_detached_orders, "ids", set()).discard(order_id)
+
+
+def is_order_detached(order_id):
+    return order_id in getattr(_detached_orders, "ids", ())
+
+
+@contextmanager
+def detached_order_items(order):
+    detach_order(order)
+    try:
+        yield
+    finally:
+        release_order(order.pk)
+
+
+@transaction.atomic
+def rebuild_rollups(date_from, date_to):
+    """Recomputes the rollup rows of ``[date_from, date_to]`` from raw payments and items."""
+    start, end = local_day_bounds(date_from, date_to)
+    tz = timezone.get_current_timezone()
+
+    DailySalesRollup.objects.filter(day__gte=date_from, day__lte=date_to).delete()
+
+    payment_rows = (
+        Payment.objects.filter(status=Payment.Status.APPLIED, paid_at__gte=start, paid_at__lt=end)
+        .annotate(day=TruncDate("paid_at", tzinfo=tz))
+        .values("day", "captured_by_id", "method")
+        .annotate(amount=Sum("amount"), entries=Count("id"))
+    )
+    item_rows = (
+        OrderItem.objects.exclude(order__status=Order.Status.CANCELLED)
+        .filter(order__received_at__gte=start, order__received_at__lt=end)
+        .annotate(day=TruncDate("order__received_at", tzinfo=tz))
+        .values("day", "service_id", "service__category")
+        .annotate(amount=Sum("total"), quantity=Sum("quantity"), entries=Count("id"))
+    )
+
+    rollups = [
+        DailySalesRollup(
+            day=row["day"],
+            kind=DailySalesRollup.Kind.PAYMENT,
+            bucket=f"{row['captured_by_id'] or 0}:{row['method']}",
+            seller_id=row["captured_by_id"],
+            method=row["method"],
+            amount=row["amount"],
+            entries=row["entries"],
+        )
+        for row in payment_rows
+    ]
+    rollups.extend(
+        DailySalesRollup(
+            day=row["day"],
+            kind=DailySalesRollup.Kind.ITEM,
+            bucket=str(row["service_id"]),
+            service_id=row["service_id"],
+            service_category=row["service__category"],
+            amount=row["amount"],
+            quantity=row["quantity"],
+            entries=row["entries"],
+        )
+        for row in item_rows
+    )
+    DailySalesRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
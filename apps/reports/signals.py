@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.catalog.models import Service
+from apps.orders.models import Order, OrderItem
+from apps.payments.models import Payment
+
+from .services import (
+    RollupDelta,
+    detach_order,
+    is_order_detached,
+    move_order_items,
+    order_rollup_day,
+    payment_key,
+    release_order,
+)
+
+
+def _payment_state(payment):
+    key = payment_key(payment)
+    return (key, payment.amount) if key else None
+
+
+def _item_state(item):
+    return (item.order_id, item.service_id, item.total, item.quantity)
+
+
+STATE_BUILDERS = {
+    Payment: _payment_state,
+    OrderItem: _item_state,
+    Order: order_rollup_day,
+}
+
+
+def _persisted_state(sender, instance):
+    return STATE_BUILDERS[sender](SimpleNamespace(**instance.persisted_values()))
+
+
+@receiver(pre_save, sender=Payment)
+@receiver(pre_save, sender=OrderItem)
+@receiver(pre_save, sender=Order)
+@receiver(pre_delete, sender=Payment)
+@receiver(pre_delete, sender=OrderItem)
+def load_rollup_fields(sender, instance, **kwargs):
+    # Tracked fields that were deferred must be read before the row changes.
+    if not instance._state.adding:
+        instance.changed_fields()
+
+
+def _remove_item(delta, state, *, order=None, service=None):
+    order_id, service_id, total, quantity = state
+    if order is None or order.pk != order_id:
+        order = Order.objects.filter(pk=order_id).only("received_at", "status").first()
+    if order is None:
+        return
+    day = order_rollup_day(order)
+    if day is None:
+        return
+    if service is None or service.pk != service_id:
+        service = Service.objects.only("category").get(pk=service_id)
+    delta.add_item(day, service_id, service.category, total, quantity, sign=-1)
+
+
+@receiver(post_save, sender=Payment)
+def update_payment_rollup(sender, instance, created, **kwargs):
+    current = _payment_state(instance)
+    previous = None if created else _persisted_state(sender, instance)
+    if previous == current:
+        return
+
+    delta = RollupDelta()
+    if previous:
+        key, amount = previous
+        delta.add(key, amount, sign=-1)
+    delta.add_payment(instance)
+    delta.apply()
+
+
+@receiver(post_delete, sender=Payment)
+def remove_payment_rollup(sender, instance, **kwargs):
+    previous = _persisted_state(sender, instance)
+    if previous:
+        key, amount = previous
+        delta = RollupDelta()
+        delta.add(key, amount, sign=-1)
+        delta.apply()
+
+
+@receiver(post_save, sender=OrderItem)
+def update_item_rollup(sender, instance, created, **kwargs):
+    current = _item_state(instance)
+    previous = None if created else _persisted_state(sender, instance)
+    if previous == current:
+        return
+
+    delta = RollupDelta()
+    if previous:
+        _remove_item(delta, previous, order=instance.order, service=instance.service)
+    day = order_rollup_day(instance.order)
+    if day is not None:
+        delta.add_item(day, instance.service_id, instance.service.category, instance.total, instance.quantity)
+    delta.apply()
+
+
+@receiver(post_delete, sender=OrderItem)
+def remove_item_rollup(sender, instance, **kwargs):
+    if is_order_detached(instance.order_id):
+        return
+    previous = _persisted_state(sender, instance)
+    delta = RollupDelta()
+    cache = instance._state.fields_cache
+    _remove_item(delta, previous, order=cache.get("order"), service=cache.get("service"))
+    delta.apply()
+
+
+@receiver(post_save, sender=Order)
+def update_order_rollup(sender, instance, created, **kwargs):
+    if created:
+        return
+    current = order_rollup_day(instance)
+    previous = _persisted_state(sender, instance)
+    if previous == current:
+        return
+    move_order_items(instance.pk, old_day=previous, new_day=current)
+
+
+@receiver(pre_delete, sender=Order)
+def detach_deleted_order(sender, instance, **kwargs):
+    detach_order(instance)
+
+
+@receiver(post_delete, sender=Order)
+def release_deleted_order(sender, instance, **kwargs):
+    release_order(instance.pk)
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.catalog.models import Service
+from apps.customers.models import Customer
+from apps.orders.models import Order, OrderItem
+from apps.orders.services import create_order, replace_order_items
+from apps.payments.models import Payment
+from apps.reports.models import DailySalesRollup
+from apps.reports.selectors import sales_by_method, sales_by_seller, sales_total, service_sales
+from apps.reports.services import rebuild_rollups
+
+
+class DailySalesRollupTests(TestCase):
+    def setUp(self):
+        self.seller = User.objects.create_user(username="seller_rollup", password="StrongPass123!")
+        self.customer = Customer.objects.create(first_name="Rita", last_name="Resumen", phone="5520004000")
+        self.wash = Service.objects.create(
+            code="ROL-KG",
+            name="Lavado resumen",
+            category=Service.Category.WASH,
+            pricing_mode=Service.PricingMode.KILO,
+            unit_price=Decimal("50.00"),
+            default_iva_rate=Decimal("16.00"),
+        )
+        self.ironing = Service.objects.create(
+            code="ROL-PL",
+            name="Planchado resumen",
+            category=Service.Category.IRONING,
+            pricing_mode=Service.PricingMode.PIEZA,
+            unit_price=Decimal("10.00"),
+            default_iva_rate=Decimal("16.00"),
+        )
+        self.yesterday = timezone.now() - timedelta(days=1)
+
+    def _snapshot(self):
+        return sorted(
+            DailySalesRollup.objects.filter(entries__gt=0).values_list("day", "kind", "bucket", "amount", "quantity", "entries")
+        )
+
+    def _add_item(self, order, service, quantity):
+        return OrderItem.objects.create(
+            order=order,
+            service=service,
+            pricing_mode=service.pricing_mode,
+            quantity=Decimal(quantity),
+            unit_price=service.unit_price,
+            iva_rate=service.default_iva_rate,
+        )
+
+    def test_incremental_updates_match_full_rebuild(self):
+        order = Order.objects.create(customer=self.customer, received_at=self.yesterday)
+        item = self._add_item(order, self.wash, "2.00")
+        self._add_item(order, self.ironing, "3.00")
+        payment = Payment.objects.create(order=order, captured_by=self.seller, amount=Decimal("50.00"), paid_at=self.yesterday)
+        Payment.objects.create(order=order, captured_by=self.seller, amount=Decimal("20.00"), method=Payment.Method.CARD)
+
+        item = OrderItem.objects.get(pk=item.pk)
+        item.quantity = Decimal("4.00")
+        item.save()
+        payment.status = Payment.Status.VOID
+        payment.save(update_fields=["status", "updated_at"])
+
+        cancelled = create_order(customer=self.customer, received_at=self.yesterday, lines=[{"service": self.wash, "quantity": "1.00"}])
+        cancelled.status = Order.Status.CANCELLED
+        cancelled.save()
+
+        replaced = create_order(customer=self.customer, lines=[{"service": self.wash, "quantity": "1.00"}])
+        replace_order_items(replaced, [{"service": self.ironing, "quantity": "2.00"}])
+        doomed = create_order(customer=self.customer, lines=[{"service": self.ironing, "quantity": "5.00"}])
+        doomed.delete()
+
+        incremental = self._snapshot()
+        self.assertTrue(incremental)
+        rebuild_rollups(timezone.localdate() - timedelta(days=7), timezone.localdate())
+        self.assertEqual(incremental, self._snapshot())
+
+    def test_history_is_read_from_rollup_and_today_from_raw_rows(self):
+        past = Order.objects.create(customer=self.customer, received_at=self.yesterday)
+        self._add_item(past, self.wash, "1.00")
+        Payment.objects.create(order=past, captured_by=self.seller, amount=Decimal("58.00"), paid_at=self.yesterday)
+        today_order = Order.objects.create(customer=self.customer)
+        self._add_item(today_order, self.ironing, "1.00")
+        Payment.objects.create(order=today_order, captured_by=self.seller, amount=Decimal("11.60"), method=Payment.Method.CARD)
+
+        # Only the rollup knows about the historical payment from here on.
+        Payment.objects.filter(paid_at__lt=timezone.now() - timedelta(hours=12)).update(amount=Decimal("1.00"))
+        date_from = timezone.localdate() - timedelta(days=3)
+        date_to = timezone.localdate()
+
+        self.assertEqual(sales_total(date_from, date_to), Decimal("69.60"))
+        self.assertEqual([row["method"] for row in sales_by_method(date_from, date_to)], ["cash", "card"])
+        seller_row = sales_by_seller(date_from, date_to)[0]
+        self.assertEqual(seller_row["captured_by__username"], "seller_rollup")
+        self.assertEqual(seller_row["payments_count"], 2)
+        services = {row["service__name"]: row for row in service_sales(date_from, date_to)}
+        self.assertEqual(services["Lavado resumen"]["total"], Decimal("58.00"))
+        self.assertEqual(services["Planchado resumen"]["service__category"], Service.Category.IRONING)
+
+    def test_rebuild_command_backfills_range(self):
+        order = Order.objects.create(customer=self.customer, received_at=self.yesterday)
+        self._add_item(order, self.wash, "1.00")
+        DailySalesRollup.objects.all().delete()
+
+        stdout = StringIO()
+        day = timezone.localdate(self.yesterday).isoformat()
+        call_command("rebuild_rollups", "--from", day, "--to", day, stdout=stdout)
+
+        self.assertIn("1 filas", stdout.getvalue())
+        self.assertEqual(DailySalesRollup.objects.get().amount, Decimal("58.00"))
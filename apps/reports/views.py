@@ -5,10 +5,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.accounts.api_permissions import IsManagerOrAdmin
+from apps.common.utils import local_date_range
 from apps.customers.models import Customer
 from apps.inventory.models import Expense, InventoryMovement
-from apps.orders.models import Order, OrderItem
-from apps.payments.models import Payment
+from apps.orders.models import Order
+
+from .selectors import sales_total, service_sales
 
 
 class AdvancedSummaryAPIView(APIView):
@@ -18,35 +20,27 @@ class AdvancedSummaryAPIView(APIView):
         date_from = self._parse_date(request.GET.get("date_from"), timezone.localdate().replace(day=1))
         date_to = self._parse_date(request.GET.get("date_to"), timezone.localdate())
 
-        sales_total = (
-            Payment.objects.filter(status=Payment.Status.APPLIED, paid_at__date__gte=date_from, paid_at__date__lte=date_to)
-            .aggregate(total=Sum("amount"))["total"]
-            or 0
-        )
+        period_sales = sales_total(date_from, date_to)
         expenses_total = (
             Expense.objects.filter(expense_date__gte=date_from, expense_date__lte=date_to).aggregate(total=Sum("amount"))["total"]
             or 0
         )
 
         frequent_customers = list(
-            Customer.objects.filter(orders__received_at__date__gte=date_from, orders__received_at__date__lte=date_to)
+            Customer.objects.filter(**local_date_range("orders__received_at", date_from, date_to))
             .annotate(orders_count=Count("orders"), sales=Sum("orders__total"))
             .order_by("-orders_count")
             .values("id", "first_name", "last_name", "phone", "orders_count", "sales")[:10]
         )
 
-        top_services = list(
-            OrderItem.objects.filter(order__received_at__date__gte=date_from, order__received_at__date__lte=date_to)
-            .exclude(order__status=Order.Status.CANCELLED)
-            .values("service__name")
-            .annotate(total=Sum("total"), count=Count("id"))
-            .order_by("-total")[:10]
-        )
+        top_services = [
+            {"service__name": row["service__name"], "total": row["total"], "count": row["count"]}
+            for row in service_sales(date_from, date_to)[:10]
+        ]
 
         supplies_consumption = list(
             InventoryMovement.objects.filter(
-                occurred_at__date__gte=date_from,
-                occurred_at__date__lte=date_to,
+                **local_date_range("occurred_at", date_from, date_to),
                 movement_type__in=[InventoryMovement.MovementType.CONSUMPTION, InventoryMovement.MovementType.LOSS],
             )
             .values("supply__name")
@@ -65,9 +59,9 @@ class AdvancedSummaryAPIView(APIView):
             {
                 "date_from": str(date_from),
                 "date_to": str(date_to),
-                "sales_total": sales_total,
+                "sales_total": period_sales,
                 "expenses_total": expenses_total,
-                "estimated_profit": sales_total - expenses_total,
+                "estimated_profit": period_sales - expenses_total,
                 "pending_orders": pending_count,
                 "overdue_orders": overdue_count,
                 "frequent_customers": frequent_customers,
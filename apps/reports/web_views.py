@@ -8,10 +8,12 @@ from django.views import View
 
 from apps.accounts.permissions import ROLE_ADMIN, ROLE_MANAGER, RoleRequiredMixin
 from apps.catalog.models import Service
+from apps.common.utils import local_date_range
 from apps.customers.models import Customer
 from apps.inventory.models import Expense, InventoryMovement
 from apps.orders.models import Order, OrderItem
-from apps.payments.models import Payment
+
+from .selectors import category_sales, sales_total, service_sales
 
 
 class SalesByTypeReportView(LoginRequiredMixin, View):
@@ -26,28 +28,16 @@ class SalesByTypeReportView(LoginRequiredMixin, View):
         date_from = self._parse_date(date_from_raw, today.replace(day=1))
         date_to = self._parse_date(date_to_raw, today)
 
-        items_qs = (
-            OrderItem.objects.select_related("service", "order")
-            .exclude(order__status=Order.Status.CANCELLED)
-            .filter(order__received_at__date__gte=date_from, order__received_at__date__lte=date_to)
-        )
+        services = service_sales(date_from, date_to)
+        by_type = category_sales(date_from, date_to, services=services)
 
-        laundry_total = items_qs.exclude(service__category=Service.Category.IRONING).aggregate(total=Sum("total"))["total"] or Decimal(
-            "0.00"
-        )
-        ironing_total = (
-            items_qs.filter(service__category=Service.Category.IRONING).aggregate(total=Sum("total"))["total"]
-            or Decimal("0.00")
-        )
-
-        by_type = (
-            items_qs.values("service__category")
-            .annotate(total=Sum("total"), items_count=Count("id"))
-            .order_by("service__category")
-        )
+        ironing_total = sum((row["total"] for row in by_type if row["service__category"] == Service.Category.IRONING), Decimal("0.00"))
+        laundry_total = sum((row["total"] for row in by_type if row["service__category"] != Service.Category.IRONING), Decimal("0.00"))
 
         mixed_orders_count = (
-            items_qs.values("order_id")
+            OrderItem.objects.exclude(order__status=Order.Status.CANCELLED)
+            .filter(**local_date_range("order__received_at", date_from, date_to))
+            .values("order_id")
             .annotate(
                 laundry_items=Count("id", filter=~Q(service__category=Service.Category.IRONING)),
                 ironing_items=Count("id", filter=Q(service__category=Service.Category.IRONING)),
@@ -56,11 +46,7 @@ class SalesByTypeReportView(LoginRequiredMixin, View):
             .count()
         )
 
-        top_services = (
-            items_qs.values("service__name", "service__category")
-            .annotate(total=Sum("total"), qty=Count("id"))
-            .order_by("-total")[:10]
-        )
+        top_services = services[:10]
 
         return render(
             request,
@@ -96,34 +82,23 @@ class AdvancedReportsView(RoleRequiredMixin, View):
         date_from = self._parse_date(request.GET.get("date_from", ""), today.replace(day=1))
         date_to = self._parse_date(request.GET.get("date_to", ""), today)
 
-        sales_total = (
-            Payment.objects.filter(status=Payment.Status.APPLIED, paid_at__date__gte=date_from, paid_at__date__lte=date_to)
-            .aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
-        )
+        period_sales = sales_total(date_from, date_to)
         expenses_total = (
             Expense.objects.filter(expense_date__gte=date_from, expense_date__lte=date_to).aggregate(total=Sum("amount"))["total"]
             or Decimal("0.00")
         )
 
         frequent_customers = (
-            Customer.objects.filter(orders__received_at__date__gte=date_from, orders__received_at__date__lte=date_to)
+            Customer.objects.filter(**local_date_range("orders__received_at", date_from, date_to))
             .annotate(orders_count=Count("orders"), sales=Sum("orders__total"))
             .order_by("-orders_count")[:15]
         )
 
-        top_services = (
-            OrderItem.objects.filter(order__received_at__date__gte=date_from, order__received_at__date__lte=date_to)
-            .exclude(order__status=Order.Status.CANCELLED)
-            .values("service__name", "service__category")
-            .annotate(total=Sum("total"), count=Count("id"))
-            .order_by("-total")[:15]
-        )
+        top_services = service_sales(date_from, date_to)[:15]
 
         supplies_consumption = (
             InventoryMovement.objects.filter(
-                occurred_at__date__gte=date_from,
-                occurred_at__date__lte=date_to,
+                **local_date_range("occurred_at", date_from, date_to),
                 movement_type__in=[InventoryMovement.MovementType.CONSUMPTION, InventoryMovement.MovementType.LOSS],
             )
             .values("supply__name")
@@ -151,9 +126,9 @@ class AdvancedReportsView(RoleRequiredMixin, View):
             {
                 "date_from": date_from,
                 "date_to": date_to,
-                "sales_total": sales_total,
+                "sales_total": period_sales,
                 "expenses_total": expenses_total,
-                "estimated_profit": sales_total - expenses_total,
+                "estimated_profit": period_sales - expenses_total,
                 "frequent_customers": frequent_customers,
                 "top_services": top_services,
                 "supplies_consumption": supplies_consumption,
@@ -126,6 +126,21 @@ API_THROTTLE_ANON_IP_RATE = os.getenv("API_THROTTLE_ANON_IP_RATE", "60/min")
 API_THROTTLE_USER_RATE = os.getenv("API_THROTTLE_USER_RATE", "240/min")
 API_THROTTLE_SENSITIVE_USER_RATE = os.getenv("API_THROTTLE_SENSITIVE_USER_RATE", "60/min")
 CASH_DIFF_ALERT_THRESHOLD = os.getenv("CASH_DIFF_ALERT_THRESHOLD", "200.00")
+ALERT_FLUSH_SECONDS = float(os.getenv("ALERT_FLUSH_SECONDS", "10"))
+ALERT_FLUSH_COUNT = int(os.getenv("ALERT_FLUSH_COUNT", "500"))
+FOLIO_PREFIX = os.getenv("FOLIO_PREFIX", "LP")
+FOLIO_BLOCK_SIZE = int(os.getenv("FOLIO_BLOCK_SIZE", "20"))
+BOARD_EVENTS_STREAM_SECONDS = float(os.getenv("BOARD_EVENTS_STREAM_SECONDS", "10"))
+BOARD_EVENTS_POLL_TIMEOUT = float(os.getenv("BOARD_EVENTS_POLL_TIMEOUT", "10"))
+BOARD_EVENTS_POLL_INTERVAL = float(os.getenv("BOARD_EVENTS_POLL_INTERVAL", "1"))
+LOCAL_CACHE_MAX_SECONDS = int(os.getenv("LOCAL_CACHE_MAX_SECONDS", "30"))
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
 
 CORS_ALLOWED_ORIGINS = []
 
@@ -21,3 +21,8 @@ if SECRET_KEY == "change-me" or len(SECRET_KEY) < 32:
     raise ImproperlyConfigured(
         "DJANGO_SECRET_KEY invalida para produccion. Define una clave larga y aleatoria en el entorno."
     )
+
+if CACHES["default"]["BACKEND"] == "django.core.cache.backends.locmem.LocMemCache":
+    raise ImproperlyConfigured(
+        "Produccion requiere un cache compartido entre workers (roles y permisos). Define CACHE_BACKEND y CACHE_LOCATION."
+    )